@@ -32,6 +32,7 @@ def options():
     nb_cmd.add_argument("-b", "--maskdir", help="Input directory containing black/white masks.", required=True)
     nb_cmd.add_argument("-o", "--outfile", help="Trained classifier output filename.", required=True)
     nb_cmd.add_argument("-p", "--plots", help="Make output plots.", default=False, action="store_true")
+    nb_cmd.add_argument("-T", "--cpu", help="Number of CPU processes used to read images.", default=1, type=int)
     nb_cmd.set_defaults(func=run_naive_bayes)
 
     # Create the Naive Bayes Multiclass subcommand
@@ -64,7 +65,8 @@ def run_naive_bayes(args):
     if not os.path.exists(args.maskdir):
         raise IOError("Directory does not exist: {0}".format(args.maskdir))
     print("Running the naive Bayes two-class training method...")
-    plantcv.learn.naive_bayes(imgdir=args.imgdir, maskdir=args.maskdir, outfile=args.outfile, mkplots=args.plots)
+    plantcv.learn.naive_bayes(imgdir=args.imgdir, maskdir=args.maskdir, outfile=args.outfile, mkplots=args.plots,
+                              processes=args.cpu)
 ###########################################
 
 
@@ -79,6 +79,18 @@ def options():
     cmdline_grp.add_argument("-o", "--other_args", help='Other arguments to pass to the workflow script.',
                              required=False)
     cmdline_grp.add_argument("-z", "--cleanup", help='Remove temporary working directory', default=False)
+    cmdline_grp.add_argument("-I", "--inprocess",
+                             help='Import the workflow once per worker and run each image in the worker process '
+                                  'instead of starting a new Python process per image.',
+                             default=False, action="store_true")
+    cmdline_grp.add_argument("-S", "--store",
+                             help='Results store directory. Results are appended to a Parquet results store and the '
+                                  'output database file is exported from the store.',
+                             default=None)
+    cmdline_grp.add_argument("-P", "--partition",
+                             help='Comma-separated list of metadata terms used to partition the results store '
+                                  '(e.g. imgtype,camera).',
+                             default=None)
     args = parser.parse_args()
 
     # Create a config
@@ -130,6 +142,10 @@ def options():
         config.coprocess = args.coprocess
         config.cleanup = args.cleanup
         config.append = not args.create
+        config.inprocess = args.inprocess
+        config.results_store = args.store
+        if args.partition:
+            config.results_partition_by = args.partition.split(",")
         config.cluster = "LocalCluster"
         config.cluster_config = {"n_workers": args.cpu, "cores": 1, "memory": "1GB", "disk": "1GB"}
 
@@ -169,6 +185,8 @@ def main():
     # Remove JSON results file if append=False
     if not config.append and os.path.exists(config.json):
         os.remove(config.json)
+    if not config.append and config.results_store is not None and os.path.exists(config.results_store):
+        shutil.rmtree(config.results_store)
 
     # Read image metadata
     ###########################################
@@ -191,8 +209,9 @@ def main():
     # Parallel image processing time
     multi_start_time = time.time()
     print("Processing images... ", file=sys.stderr)
-    cluster_client = plantcv.parallel.create_dask_cluster(cluster=config.cluster, cluster_config=config.cluster_config)
-    plantcv.parallel.multiprocess(jobs=jobs, client=cluster_client)
+    cluster_client = plantcv.parallel.create_dask_cluster(cluster=config.cluster, cluster_config=config.cluster_config,
+                                                          inprocess=config.inprocess)
+    plantcv.parallel.multiprocess(jobs=jobs, client=cluster_client, inprocess=config.inprocess)
     multi_clock_time = time.time() - multi_start_time
     print(f"Processing images took {multi_clock_time} seconds.", file=sys.stderr)
     ###########################################
@@ -202,7 +221,16 @@ def main():
     # Process results start time
     process_results_start_time = time.time()
     print("Processing results... ", file=sys.stderr)
-    plantcv.parallel.process_results(job_dir=config.tmp_dir, json_file=config.json)
+    if config.results_store is not None:
+        # Append to the results store without reading previous results
+        # (results already in the JSON file are imported when the store is created)
+        plantcv.parallel.aggregate_results(job_dir=config.tmp_dir, store_dir=config.results_store,
+                                           partition_by=config.results_partition_by, json_file=config.json)
+        # Exporting the JSON file reads the whole store, so it is only done if requested
+        if config.results_export_json:
+            plantcv.parallel.export_results(store_dir=config.results_store, json_file=config.json)
+    else:
+        plantcv.parallel.process_results(job_dir=config.tmp_dir, json_file=config.json)
     process_results_clock_time = time.time() - process_results_start_time
     print(f"Processing results took {process_results_clock_time} seconds.", file=sys.stderr)
     ###########################################
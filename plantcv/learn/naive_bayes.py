@@ -3,74 +3,65 @@
 import os
 import cv2
 import numpy as np
-from scipy import stats
+from concurrent.futures import ProcessPoolExecutor
 from matplotlib import pyplot as plt
+from plantcv.plantcv import fatal_error
 
 
-def naive_bayes(imgdir, maskdir, outfile, mkplots=False):
+def naive_bayes(imgdir, maskdir, outfile, mkplots=False, processes=1):
     """Naive Bayes training function
 
     Inputs:
-    imgdir  = Path to a directory of original 8-bit RGB images.
-    maskdir = Path to a directory of binary mask images. Mask images must have the same name as their corresponding
-              color images.
-    outfile = Name of the output text file that will store the color channel probability density functions.
-    mkplots = Make PDF plots (True or False).
+    imgdir    = Path to a directory of original 8-bit RGB images.
+    maskdir   = Path to a directory of binary mask images. Mask images must have the same name as their corresponding
+                color images.
+    outfile   = Name of the output text file that will store the color channel probability density functions.
+    mkplots   = Make PDF plots (True or False).
+    processes = Number of processes used to read images (default = 1).
 
     :param imgdir: str
     :param maskdir: str
     :param outfile: str
     :param mkplots: bool
+    :param processes: int
     """
-    # Initialize color channel ndarrays for plant (foreground) and background
-    plant = {"hue": np.array([], dtype=np.uint8), "saturation": np.array([], dtype=np.uint8),
-             "value": np.array([], dtype=np.uint8)}
-    background = {"hue": np.array([], dtype=np.uint8), "saturation": np.array([], dtype=np.uint8),
-                  "value": np.array([], dtype=np.uint8)}
+    channels = ["hue", "saturation", "value"]
+    # Initialize a 256-bin histogram per color channel for plant (foreground) and background
+    plant = np.zeros((len(channels), 256), dtype=np.float64)
+    background = np.zeros((len(channels), 256), dtype=np.float64)
 
-    # Walk through the image directory
-    print("Reading images...")
+    # Walk through the image directory and collect image/mask pairs
+    pairs = []
     for (dirpath, dirnames, filenames) in os.walk(imgdir):
         for filename in filenames:
             # Is this an image type we can work with?
             if filename[-3:] in ['png', 'jpg', 'jpeg']:
                 # Does the mask exist?
                 if os.path.exists(os.path.join(maskdir, filename)):
-                    # Read the image as BGR
-                    img = cv2.imread(os.path.join(dirpath, filename), 1)
-                    # Read the mask as grayscale
-                    mask = cv2.imread(os.path.join(maskdir, filename), 0)
-
-                    # Convert the image to HSV and split into component channels
-                    hsv = cv2.cvtColor(img, cv2.COLOR_BGR2HSV)
-                    hue, saturation, value = cv2.split(hsv)
-
-                    # Store channels in a dictionary
-                    channels = {"hue": hue, "saturation": saturation, "value": value}
-
-                    # Split channels into plant and non-plant signal
-                    for channel in channels:
-                        fg, bg = _split_plant_background_signal(channels[channel], mask)
-
-                        # Randomly sample from the plant class (sample 10% of the pixels)
-                        fg = fg[np.random.randint(0, len(fg) - 1, int(len(fg) / 10))]
-                        # Randomly sample from the background class the same n as the plant class
-                        bg = bg[np.random.randint(0, len(bg) - 1, len(fg))]
-                        plant[channel] = np.append(plant[channel], fg)
-                        background[channel] = np.append(background[channel], bg)
-
-    # Calculate a probability density function for each channel using a Gaussian kernel density estimator
+                    pairs.append((os.path.join(dirpath, filename), os.path.join(maskdir, filename)))
+
+    # Stream the images and add each image's histograms to the running totals
+    print("Reading images...")
+    if processes > 1:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            for fg, bg in executor.map(_image_histograms, pairs, chunksize=max(1, len(pairs) // (processes * 4))):
+                plant += fg
+                background += bg
+    else:
+        for fg, bg in map(_image_histograms, pairs):
+            plant += fg
+            background += bg
+
+    # Calculate a probability density function for each channel by Gaussian smoothing of the histograms
     # Create an output file for the PDFs
     with open(outfile, "w") as out:
         out.write("class\tchannel\t" + "\t".join(map(str, range(0, 256))) + "\n")
-        for channel in plant:
+        for i, channel in enumerate(channels):
             print("Calculating PDF for the " + channel + " channel...")
-            plant_kde = stats.gaussian_kde(plant[channel])
-            bg_kde = stats.gaussian_kde(background[channel])
             # Calculate p from the PDFs for each 8-bit intensity value and save to outfile
-            plant_pdf = plant_kde(range(0, 256))
+            plant_pdf = _histogram_pdf(plant[i], label="plant " + channel)
             out.write("plant\t" + channel + "\t" + "\t".join(map(str, plant_pdf)) + "\n")
-            bg_pdf = bg_kde(range(0, 256))
+            bg_pdf = _histogram_pdf(background[i], label="background " + channel)
             out.write("background\t" + channel + "\t" + "\t".join(map(str, bg_pdf)) + "\n")
             if mkplots:
                 # If mkplots is True, make the PDF charts
@@ -139,11 +130,10 @@ def naive_bayes_multiclass(samples_file, outfile, mkplots=False):
         channels = {"hue": np.hstack(hue), "saturation": np.hstack(saturation), "value": np.hstack(value)}
         # For each channel
         for channel in channels:
-            # Create a kernel density estimator for the channel values (Gaussian kernel)
-            kde = stats.gaussian_kde(channels[channel])
-            # Use the KDE to calculate a probability density function for the channel
+            # Calculate a probability density function for the channel by Gaussian smoothing of its histogram
             # Sample at each of the possible 8-bit values
-            pdfs[channel][cls] = kde(range(0, 256))
+            hist = np.bincount(channels[channel], minlength=256).astype(np.float64)
+            pdfs[channel][cls] = _histogram_pdf(hist, label=cls + " " + channel)
     if mkplots:
         # If mkplots is True, generate a density curve plot per channel for each class
         for channel, cls in pdfs.items():
@@ -160,6 +150,65 @@ def naive_bayes_multiclass(samples_file, outfile, mkplots=False):
             out.write(class_name + "\t" + channel + "\t" + "\t".join(map(str, pdf)) + "\n")
 
 
+def _image_histograms(paths):
+    """Calculate plant and background HSV channel histograms for one training image
+
+    The background histogram is scaled to the number of plant pixels so that each image contributes an equal number
+    of plant and background observations.
+
+    :param paths: tuple
+    :return plant: ndarray
+    :return background: ndarray
+    """
+    img_file, mask_file = paths
+    # Read the image as BGR
+    img = cv2.imread(img_file, 1)
+    # Read the mask as grayscale
+    mask = cv2.imread(mask_file, 0)
+
+    # Convert the image to HSV and split into component channels
+    hsv = cv2.cvtColor(img, cv2.COLOR_BGR2HSV)
+
+    plant = np.zeros((3, 256), dtype=np.float64)
+    background = np.zeros((3, 256), dtype=np.float64)
+    # Split channels into plant and non-plant signal
+    for i, channel in enumerate(cv2.split(hsv)):
+        fg, bg = _split_plant_background_signal(channel, mask)
+        plant[i] = np.bincount(fg, minlength=256)
+        if len(bg) > 0:
+            background[i] = np.bincount(bg, minlength=256) * (len(fg) / len(bg))
+
+    return plant, background
+
+
+def _histogram_pdf(hist, label="default"):
+    """Calculate a probability density function at each 8-bit value from a histogram of 8-bit values
+
+    Equivalent to evaluating a Gaussian kernel density estimate (Scott's rule bandwidth) of the observations
+    summarized by the histogram at 0-255. Like the kernel density estimate, it fails if the observations do not have
+    at least two different values.
+
+    :param hist: ndarray
+    :param label: str
+    :return pdf: ndarray
+    """
+    values = np.arange(256, dtype=np.float64)
+    n = np.sum(hist)
+    # The bandwidth is 0 (or undefined) without at least two observations of two different values
+    if n < 2 or np.count_nonzero(hist) < 2:
+        fatal_error(f"Cannot calculate the PDF of the {label} channel, "
+                    "the training pixels must have at least two different values.")
+    mean = np.sum(hist * values) / n
+    # Unbiased standard deviation of the observations
+    std = np.sqrt(np.sum(hist * (values - mean) ** 2) / (n - 1))
+    # Scott's rule bandwidth
+    bandwidth = std * n ** (-1. / 5)
+    # Sum of Gaussian kernels centered on each histogram bin, weighted by the bin counts
+    diff = (values[:, np.newaxis] - values[np.newaxis, :]) / bandwidth
+    kernels = np.exp(-0.5 * diff ** 2) / (bandwidth * np.sqrt(2 * np.pi))
+    return np.dot(kernels, hist) / n
+
+
 def _split_plant_background_signal(channel, mask):
     """Split a single-channel image by foreground and background using a mask
 
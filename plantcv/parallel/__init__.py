@@ -7,11 +7,13 @@ from plantcv.parallel.parsers import convert_datetime_to_unixtime
 from plantcv.parallel.parsers import check_date_range
 from plantcv.parallel.job_builder import job_builder
 from plantcv.parallel.process_results import process_results
+from plantcv.parallel.process_results import aggregate_results
+from plantcv.parallel.process_results import export_results
 from plantcv.parallel.multiprocess import multiprocess
 from plantcv.parallel.multiprocess import create_dask_cluster
 
 __all__ = ["metadata_parser", "convert_datetime_to_unixtime", "check_date_range", "job_builder", "process_results",
-           "multiprocess", "create_dask_cluster", "WorkflowConfig"]
+           "aggregate_results", "export_results", "multiprocess", "create_dask_cluster", "WorkflowConfig"]
 
 
 class WorkflowConfig:
@@ -22,6 +24,7 @@ class WorkflowConfig:
         self.workflow = ""
         self.img_outdir = "./output_images"
         self.include_all_subdirs = True
+        self.metadata_cache = None
         self.tmp_dir = None
         self.start_date = None
         self.end_date = None
@@ -34,6 +37,10 @@ class WorkflowConfig:
         self.coprocess = None
         self.cleanup = True
         self.append = True
+        self.inprocess = False
+        self.results_store = None
+        self.results_partition_by = []
+        self.results_export_json = False
         self.cluster = "LocalCluster"
         self.cluster_config = {
             "n_workers": 1,
@@ -1,34 +1,133 @@
+import os
+import sys
+import threading
+import traceback
+import importlib.util
 import dask_jobqueue
 from dask.distributed import Client, progress
 from subprocess import call
 
 
+# Workflow modules already imported by this worker process, keyed by script path
+_workflow_modules = {}
+# In-process jobs share the PlantCV params and outputs, sys.argv, and matplotlib figures of the worker process, so only
+# one job runs at a time in each worker process even if the worker has several threads
+_inprocess_lock = threading.Lock()
+
+
 # Process images using multiprocessing
 ###########################################
 def _process_images_multiproc(job):
     call(job)
 
 
+# Import a workflow script as a module (once per worker process)
+###########################################
+def _load_workflow(workflow):
+    """Import a workflow script as a module and cache it for the lifetime of the worker process.
+
+    Inputs:
+    workflow = path to a PlantCV workflow script
+
+    Returns:
+    module   = imported workflow module
+
+    :param workflow: str
+    :return module: module
+    """
+    workflow = os.path.abspath(workflow)
+    # Reload the workflow if the script changed on disk since it was imported
+    mtime = os.path.getmtime(workflow)
+    cached = _workflow_modules.get(workflow)
+    if cached is None or cached[0] != mtime:
+        spec = importlib.util.spec_from_file_location(f"_plantcv_workflow_{len(_workflow_modules)}", workflow)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _workflow_modules[workflow] = (mtime, module)
+    return _workflow_modules[workflow][1]
+
+
+# Process images within the worker process
+###########################################
+def _process_images_inprocess(job, entry_point="main"):
+    """Run a workflow job inside the current worker process instead of a new Python subprocess.
+
+    Jobs run one at a time in each worker process (other threads of the worker wait), because they share global state.
+
+    Inputs:
+    job         = job command list ("python", workflow script, workflow arguments...)
+    entry_point = name of the workflow function to call for each image
+
+    Returns:
+    status      = exit status of the workflow (0 on success)
+
+    :param job: list
+    :param entry_point: str
+    :return status: int
+    """
+    # Import here so that the worker only pays the import cost once
+    import matplotlib.pyplot as plt
+    from plantcv.plantcv import params, outputs
+
+    # Only one job at a time can use the global state of the worker process
+    with _inprocess_lock:
+        # The first element is the interpreter, the second is the workflow script
+        workflow = job[1]
+        argv = sys.argv
+        status = 0
+        try:
+            module = _load_workflow(workflow)
+            # Reset global PlantCV state left over from the previous image
+            params.__init__()
+            outputs.clear()
+            # Workflow scripts parse their arguments from the command line
+            # Job arguments may be path-like objects, the command line only contains strings
+            sys.argv = [str(arg) for arg in job[1:]]
+            getattr(module, entry_point)()
+        except SystemExit as e:
+            # Workflows (and argparse) may call sys.exit
+            if isinstance(e.code, int):
+                status = e.code
+            elif e.code is not None:
+                status = 1
+        except Exception:
+            # A failing image should not stop the worker, report the error like a subprocess would
+            print(f"Error processing {' '.join(map(str, job))}", file=sys.stderr)
+            traceback.print_exc()
+            status = 1
+        finally:
+            sys.argv = argv
+            plt.close("all")
+    return status
+
+
 # Create a dask local or distributed cluster
 ###########################################
-def create_dask_cluster(cluster, cluster_config):
+def create_dask_cluster(cluster, cluster_config, inprocess=False):
     """Create a dask cluster and return the cluster client
     Inputs:
     cluster        = string-based name of cluster class
     cluster_config = dictionary of cluster configuration keywords/parameters
+    inprocess      = if True, jobs run inside the worker processes (see multiprocess), local workers get one thread each
+                     (default: False)
 
     Returns:
     client         = dask cluster client object
 
     :param cluster: str
     :param cluster_config: dict
+    :param inprocess: bool
     :return client: distributed.client.Client
     """
     # There is one decision point
     # If the requested cluster is a LocalCluster we get it from dask.distributed
     if cluster == "LocalCluster":
         # Create a local cluster client with n_workers
-        client = Client(n_workers=cluster_config.get("n_workers"))
+        if inprocess:
+            # In-process jobs run one at a time per worker process, extra worker threads would sit idle
+            client = Client(n_workers=cluster_config.get("n_workers"), threads_per_worker=1)
+        else:
+            client = Client(n_workers=cluster_config.get("n_workers"))
     # Otherwise the cluster is a class from dask_jobqueue (a distributed resource scheduler)
     else:
         # Retrieve the scheduler class from dask-jobqueue
@@ -45,21 +144,29 @@ def create_dask_cluster(cluster, cluster_config):
 
 # Process jobs using a dask cluster
 ###########################################
-def multiprocess(jobs, client):
+def multiprocess(jobs, client, inprocess=False):
     """Process jobs using a dask cluster.
     Inputs:
-    jobs   = list of jobs where each job is a list of workflow scripts and parameters
-    client = dask cluster client object
+    jobs      = list of jobs where each job is a list of workflow scripts and parameters
+    client    = dask cluster client object
+    inprocess = if True, each worker imports the workflow script once and calls its main function for every job,
+                otherwise each job runs in a new Python subprocess (default: False). In-process jobs run one at a time
+                in each worker process, use workers with one thread each (one process per core)
 
     :param jobs: list
     :param client: distributed.client.Client
+    :param inprocess: bool
     """
+    # Choose how each job is executed on the workers
+    job_func = _process_images_multiproc
+    if inprocess:
+        job_func = _process_images_inprocess
     # Keep a list of job futures
     processed = []
     # Submit the jobs to the scheduler
     for job in jobs:
         # Submit individual job
-        processed.append(client.submit(_process_images_multiproc, job))
+        processed.append(client.submit(job_func, job))
     # Watch job progress and print a progress bar
     progress(processed)
     # Each job outputs results to disk so we do not need to gather results here
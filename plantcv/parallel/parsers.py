@@ -1,7 +1,11 @@
 import os
 import re
 import sys
+import csv
+import json
+import sqlite3
 import datetime
+from concurrent.futures import ThreadPoolExecutor
 
 
 # Parse metadata from filenames in a directory
@@ -51,147 +55,140 @@ def metadata_parser(config):
 
     # Check whether there is a snapshot metadata file or not
     if os.path.exists(os.path.join(config.input_dir, "SnapshotInfo.csv")):
-        # Open the SnapshotInfo.csv file
-        csvfile = open(os.path.join(config.input_dir, 'SnapshotInfo.csv'), 'r')
+        # Read the SnapshotInfo.csv file
+        with open(os.path.join(config.input_dir, 'SnapshotInfo.csv'), 'r', newline='') as csvfile:
+            rows = list(csv.reader(csvfile))
 
-        # Read the first header line
-        header = csvfile.readline()
-        header = header.rstrip('\n')
-
-        # Remove whitespace from the field names
-        header = header.replace(" ", "")
-
-        # Table column order
-        cols = header.split(',')
+        # Table column order, remove whitespace from the field names
         colnames = {}
-        for i, col in enumerate(cols):
-            colnames[col] = i
-
-        # Read through the CSV file
-        for row in csvfile:
-            row = row.rstrip('\n')
-            data = row.split(',')
-            img_list_str = data[colnames['tiles']]
-            if img_list_str[:-1] == ';':
-                img_list_str = img_list_str[:-1]
-            img_list = img_list_str.split(';')
-            for img in img_list:
-                if len(img) != 0:
-                    dirpath = os.path.join(config.input_dir, 'snapshot' + data[colnames['id']])
-                    filename = img + '.' + config.imgformat
-                    if not os.path.exists(os.path.join(dirpath, filename)):
-                        print(f"Something is wrong, file {dirpath}/{filename} does not exist", file=sys.stderr)
-                        continue
-                        # raise IOError("Something is wrong, file {0}/{1} does not exist".format(dirpath, filename))
-                    # Metadata from image file name
-                    metadata = _parse_filename(filename=img, delimiter=config.delimiter, regex=regex)
-                    # Not all images in a directory may have the same metadata structure only keep those that do
-                    if len(metadata) == meta_count:
-                        # Image metadata
-                        img_path = os.path.join(dirpath, filename)
-                        img_meta = {'path': img_path}
-                        img_pass = 1
-                        coimg_store = 0
-                        # For each of the type of metadata PlantCV keeps track of
-                        for term in config.metadata_terms:
-                            # If the same metadata is found in the image filename, store the value
-                            if term in metadata_index:
-                                meta_value = metadata[metadata_index[term]]
-                                # If the metadata type has a user-provided restriction
-                                if term in config.metadata_filters:
-                                    # If the input value does not match the image value, fail the image
-                                    img_pass = _metdata_filter(img_metadata=meta_value,
-                                                               filters=config.metadata_filters[term],
-                                                               img_pass=img_pass)
-                                img_meta[term] = meta_value
-                            # If the same metadata is found in the CSV file, store the value
-                            elif term in colnames:
-                                meta_value = data[colnames[term]]
-                                # If the metadata type has a user-provided restriction
-                                if term in config.metadata_filters:
-                                    # If the input value does not match the image value, fail the image
-                                    img_pass = _metdata_filter(img_metadata=meta_value,
-                                                               filters=config.metadata_filters[term],
-                                                               img_pass=img_pass)
-                                img_meta[term] = meta_value
-                            # Or use the default value
-                            else:
-                                img_meta[term] = config.metadata_terms[term]["value"]
+        for i, col in enumerate(rows[0] if len(rows) > 0 else []):
+            colnames[col.replace(" ", "")] = i
+
+        # Image timestamps are shared by all images in a snapshot, check each timestamp once
+        date_checks = {}
+
+        for data in rows[1:]:
+            img_list = [img for img in data[colnames['tiles']].split(';') if len(img) != 0]
+            if len(img_list) == 0:
+                continue
+            dirpath = os.path.join(config.input_dir, 'snapshot' + data[colnames['id']])
+            # List the snapshot directory once instead of checking each image file
+            try:
+                dir_files = set(os.listdir(dirpath))
+            except OSError:
+                dir_files = set()
+            # Metadata from image file names
+            tiles = [(img, _parse_filename(filename=img, delimiter=config.delimiter, regex=regex)) for img in img_list]
+
+            # Index the images to coprocess by their (camera, frame) metadata
+            coimgs = {}
+            if config.coprocess is not None:
+                for coimg, meta_parts in tiles:
+                    if len(meta_parts) == meta_count and meta_parts[metadata_index['imgtype']] == config.coprocess:
+                        # The last matching image in the snapshot is used
+                        coimgs[_coprocess_key(meta_parts, metadata_index)] = coimg + '.' + config.imgformat
+
+            for img, metadata in tiles:
+                filename = img + '.' + config.imgformat
+                if filename not in dir_files:
+                    print(f"Something is wrong, file {dirpath}/{filename} does not exist", file=sys.stderr)
+                    continue
+                # Not all images in a directory may have the same metadata structure only keep those that do
+                if len(metadata) == meta_count:
+                    # Image metadata
+                    img_path = os.path.join(dirpath, filename)
+                    img_meta = {'path': img_path}
+                    img_pass = 1
+                    coimg_store = 0
+                    # For each of the type of metadata PlantCV keeps track of
+                    for term in config.metadata_terms:
+                        # If the same metadata is found in the image filename, store the value
+                        if term in metadata_index:
+                            meta_value = metadata[metadata_index[term]]
+                            # If the metadata type has a user-provided restriction
+                            if term in config.metadata_filters:
+                                # If the input value does not match the image value, fail the image
+                                img_pass = _metdata_filter(img_metadata=meta_value,
+                                                           filters=config.metadata_filters[term],
+                                                           img_pass=img_pass)
+                            img_meta[term] = meta_value
+                        # If the same metadata is found in the CSV file, store the value
+                        elif term in colnames:
+                            meta_value = data[colnames[term]]
+                            # If the metadata type has a user-provided restriction
+                            if term in config.metadata_filters:
+                                # If the input value does not match the image value, fail the image
+                                img_pass = _metdata_filter(img_metadata=meta_value,
+                                                           filters=config.metadata_filters[term],
+                                                           img_pass=img_pass)
+                            img_meta[term] = meta_value
+                        # Or use the default value
+                        else:
+                            img_meta[term] = config.metadata_terms[term]["value"]
+
+                    if img_meta['timestamp'] is not None:
+                        if img_meta['timestamp'] not in date_checks:
+                            date_checks[img_meta['timestamp']] = check_date_range(start_date_unixtime,
+                                                                                  end_date_unixtime,
+                                                                                  img_meta['timestamp'],
+                                                                                  config.timestampformat)
+                        if date_checks[img_meta['timestamp']] is False:
+                            img_pass = 0
 
-                        if img_meta['timestamp'] is not None:
-                            in_date_range = check_date_range(start_date_unixtime, end_date_unixtime,
-                                                             img_meta['timestamp'], config.timestampformat)
-                            if in_date_range is False:
-                                img_pass = 0
+                    if config.coprocess is not None:
+                        if img_meta['imgtype'] == config.coprocess:
+                            coimg_store = 1
 
+                    # If the image meets the user's criteria, store the metadata
+                    if img_pass == 1:
+                        # Link image to coprocessed image
                         if config.coprocess is not None:
-                            if img_meta['imgtype'] == config.coprocess:
-                                coimg_store = 1
-
-                        # If the image meets the user's criteria, store the metadata
-                        if img_pass == 1:
-                            # Link image to coprocessed image
-                            coimg_pass = 0
-                            if config.coprocess is not None:
-                                for coimg in img_list:
-                                    if len(coimg) != 0:
-                                        meta_parts = _parse_filename(filename=coimg, delimiter=config.delimiter,
-                                                                     regex=regex)
-                                        if len(meta_parts) > 0:
-                                            coimgtype = meta_parts[metadata_index['imgtype']]
-                                            if coimgtype == config.coprocess:
-                                                if 'camera' in config.filename_metadata:
-                                                    cocamera = meta_parts[metadata_index['camera']]
-                                                    if 'frame' in config.filename_metadata:
-                                                        coframe = meta_parts[metadata_index['frame']]
-                                                        if cocamera == img_meta['camera'] and coframe == img_meta['frame']:
-                                                            img_meta['coimg'] = coimg + '.' + config.imgformat
-                                                            coimg_pass = 1
-                                                    else:
-                                                        if cocamera == img_meta['camera']:
-                                                            img_meta['coimg'] = coimg + '.' + config.imgformat
-                                                            coimg_pass = 1
-                                                else:
-                                                    img_meta['coimg'] = coimg + '.' + config.imgformat
-                                                    coimg_pass = 1
-                                if coimg_pass == 0:
-                                    print(f"Could not find an image to coprocess with {img_path}")
-                            meta[filename] = img_meta
-                        elif coimg_store == 1:
-                            meta[filename] = img_meta
+                            coimg = coimgs.get(_coprocess_key(metadata, metadata_index))
+                            if coimg is not None:
+                                img_meta['coimg'] = coimg
+                            else:
+                                print(f"Could not find an image to coprocess with {img_path}")
+                        meta[filename] = img_meta
+                    elif coimg_store == 1:
+                        meta[filename] = img_meta
     else:
         # Compile regular expression to remove image file extensions
         pattern = re.escape('.') + config.imgformat + '$'
         ext = re.compile(pattern, re.IGNORECASE)
 
-        # Prepare lists of paths and filenames of images by walking through the input directory and get only files
-        # Initialize the dictionary with two keys: "dirpath" and "filename"
-        paths_files = dict({'dirpath':[],'filename':[]})
-        if config.include_all_subdirs is True:
-            for (dirpath, dirnames, filenames) in os.walk(config.input_dir):
-                for filename in filenames:
-                    # Is it a file?
-                    if os.path.isfile(os.path.join(dirpath, filename)):
-                        paths_files['dirpath'].append(dirpath)
-                        paths_files['filename'].append(filename)
-        else:
-            paths_files['filename'] = [f for f in os.listdir(config.input_dir) if os.path.isfile(os.path.join(config.input_dir,f))]
-            paths_files['dirpath']  = [config.input_dir for i in paths_files['filename']]
+        # Metadata previously parsed from unchanged image files is read from the metadata cache, if configured
+        cache = None
+        if config.metadata_cache is not None:
+            cache = _MetadataCache(db_file=config.metadata_cache, signature=[config.input_dir, config.imgformat,
+                                                                             config.delimiter, config.filename_metadata,
+                                                                             config.timestampformat])
 
         # Walk through all files and find images that match input criteria
-        for (dirpath, filename) in zip(paths_files['dirpath'], paths_files['filename']):
+        for (dirpath, filename, size, mtime) in _scan_dir(dirpath=config.input_dir,
+                                                          include_all_subdirs=config.include_all_subdirs):
             # Is filename and image?
             is_img = ext.search(filename)
             # If filename is an image, parse the metadata
             if is_img is not None:
-                # Remove the file extension
-                prefix = ext.sub('', filename)
-                metadata = _parse_filename(filename=prefix, delimiter=config.delimiter, regex=regex)
+                img_path = os.path.join(dirpath, filename)
+                cached = None if cache is None else cache.get(path=img_path, size=size, mtime=mtime)
+                if cached is None:
+                    # Remove the file extension
+                    prefix = ext.sub('', filename)
+                    metadata = _parse_filename(filename=prefix, delimiter=config.delimiter, regex=regex)
+                    # Convert the image timestamp to Unix time once
+                    unix_time = None
+                    if len(metadata) == meta_count and "timestamp" in metadata_index:
+                        unix_time = convert_datetime_to_unixtime(timestamp_str=metadata[metadata_index["timestamp"]],
+                                                                 date_format=config.timestampformat)
+                    if cache is not None:
+                        cache.add(path=img_path, size=size, mtime=mtime, metadata=metadata, unix_time=unix_time)
+                else:
+                    metadata, unix_time = cached
 
                 # Not all images in a directory may have the same metadata structure only keep those that do
                 if len(metadata) == meta_count:
                     # Image metadata
-                    img_path = os.path.join(dirpath, filename)
                     img_meta = {'path': img_path}
                     img_pass = 1
                     # For each of the type of metadata PlantCV keeps track of
@@ -209,7 +206,10 @@ def metadata_parser(config):
                         else:
                             img_meta[term] = config.metadata_terms[term]["value"]
 
-                    if img_meta['timestamp'] is not None:
+                    if unix_time is not None:
+                        if unix_time < start_date_unixtime or unix_time > end_date_unixtime:
+                            img_pass = 0
+                    elif img_meta['timestamp'] is not None:
                         in_date_range = check_date_range(start_date_unixtime, end_date_unixtime,
                                                          img_meta['timestamp'], config.timestampformat)
                         if in_date_range is False:
@@ -219,6 +219,9 @@ def metadata_parser(config):
                     if img_pass == 1:
                         meta[filename] = img_meta
 
+        if cache is not None:
+            cache.close()
+
     return meta
 ###########################################
 
@@ -276,6 +279,136 @@ def convert_datetime_to_unixtime(timestamp_str, date_format):
     return unix_time
 
 
+# Coprocess image key
+###########################################
+def _coprocess_key(metadata, metadata_index):
+    """Key used to pair an image with the image it is coprocessed with.
+
+    Images are paired by camera and frame if they are in the filename metadata (frame is only used with camera).
+
+    Args:
+        metadata:       List of filename metadata values
+        metadata_index: Dictionary of metadata terms and their index position in the filename metadata
+
+    :param metadata: list
+    :param metadata_index: dict
+    :return key: tuple
+    """
+    camera = None
+    frame = None
+    if 'camera' in metadata_index:
+        camera = metadata[metadata_index['camera']]
+        if 'frame' in metadata_index:
+            frame = metadata[metadata_index['frame']]
+    return camera, frame
+###########################################
+
+
+# Scan a directory tree for files
+###########################################
+def _scan_dir(dirpath, include_all_subdirs=True):
+    """List the files in a directory (tree), scanning subdirectories in parallel threads.
+
+    Files are listed in the same order as os.walk (top-down).
+
+    Args:
+        dirpath:             Input directory
+        include_all_subdirs: If True, include files in all subdirectories
+
+    :param dirpath: str
+    :param include_all_subdirs: bool
+    :return files: list
+    """
+    files = []
+    with ThreadPoolExecutor() as executor:
+        def scan(path):
+            """List the files and scan the subdirectories of a directory."""
+            dir_files = []
+            subdirs = []
+            try:
+                with os.scandir(path) as entries:
+                    for entry in entries:
+                        # Is it a file?
+                        if entry.is_file():
+                            stat = entry.stat()
+                            dir_files.append((path, entry.name, stat.st_size, stat.st_mtime))
+                        elif include_all_subdirs and entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+            except OSError:
+                # Unreadable directories are skipped, like os.walk
+                pass
+            # Subdirectories are scanned while the results of this directory are used
+            return dir_files, [executor.submit(scan, subdir) for subdir in subdirs]
+
+        stack = [executor.submit(scan, dirpath)]
+        while len(stack) > 0:
+            dir_files, subdirs = stack.pop().result()
+            files.extend(dir_files)
+            stack.extend(reversed(subdirs))
+    return files
+###########################################
+
+
+# Persistent cache of image metadata parsed from filenames
+###########################################
+class _MetadataCache:
+    """SQLite cache of filename metadata keyed by image path, file size and modification time."""
+
+    def __init__(self, db_file, signature):
+        """Open (or create) a metadata cache.
+
+        Args:
+            db_file:   SQLite database file
+            signature: Parser settings, metadata cached with different settings is not used
+
+        :param db_file: str
+        :param signature: list
+        """
+        self.conn = sqlite3.connect(db_file)
+        self.conn.execute("CREATE TABLE IF NOT EXISTS metadata (path TEXT, signature TEXT, size INTEGER, mtime REAL, "
+                          "metadata TEXT, unixtime INTEGER, PRIMARY KEY (path, signature))")
+        self.signature = json.dumps(signature)
+        # Read all cached entries at once, a query per image is much slower
+        self.entries = {row[0]: row[1:] for row in self.conn.execute(
+            "SELECT path, size, mtime, metadata, unixtime FROM metadata WHERE signature = ?", (self.signature,))}
+        self.seen = set()
+        self.new = []
+
+    def get(self, path, size, mtime):
+        """Get cached metadata for an image if the file has not changed.
+
+        :param path: str
+        :param size: int
+        :param mtime: float
+        :return cached: tuple
+        """
+        self.seen.add(path)
+        entry = self.entries.get(path)
+        if entry is not None and entry[0] == size and entry[1] == mtime:
+            return json.loads(entry[2]), entry[3]
+        return None
+
+    def add(self, path, size, mtime, metadata, unix_time):
+        """Add parsed metadata for an image.
+
+        :param path: str
+        :param size: int
+        :param mtime: float
+        :param metadata: list
+        :param unix_time: int
+        """
+        self.new.append((path, self.signature, size, mtime, json.dumps(metadata), unix_time))
+
+    def close(self):
+        """Save new entries, remove entries of images that no longer exist, and close the database."""
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO metadata VALUES (?, ?, ?, ?, ?, ?)", self.new)
+            self.conn.executemany("DELETE FROM metadata WHERE path = ? AND signature = ?",
+                                  [(path, self.signature) for path in self.entries if path not in self.seen])
+        self.conn.close()
+###########################################
+
+
 # Filename metadata parser
 ###########################################
 def _parse_filename(filename, delimiter, regex):
@@ -1,8 +1,20 @@
 import os
+import time
+import uuid
 import mimetypes
 import json
+from urllib.parse import quote, unquote
 from plantcv.plantcv import fatal_error
 
+# Name of the file that stores the variable definitions in a results store directory
+# Files starting with an underscore are ignored by Parquet dataset readers
+_STORE_VARIABLES = "_variables.json"
+# Partition directory name used for missing metadata values (same as the Hive/Arrow default)
+_NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+# Observation columns stored for each (entity, sample, variable) row
+_OBSERVATION_COLUMNS = ["entity", "sample", "variable", "trait", "method", "scale", "datatype", "value", "value_json",
+                        "label_json"]
+
 
 # Process results. Parse individual image output files.
 ###########################################
@@ -17,13 +29,7 @@ def process_results(job_dir, json_file):
     :param json_file: obj
     """
     if os.path.exists(json_file):
-        with open(json_file, 'r') as datafile:
-            try:
-                data = json.load(datafile)
-                if "variables" not in data or "entities" not in data:
-                    fatal_error("Invalid JSON file")
-            except:
-                fatal_error("Invalid JSON file")
+        data = _read_json_results(json_file=json_file)
     else:
         # Data dictionary
         data = {"variables": {}, "entities": []}
@@ -49,3 +55,268 @@ def process_results(job_dir, json_file):
     # Write out json file with info from all images
     with open(json_file, 'w') as datafile:
         json.dump(data, datafile)
+
+
+def aggregate_results(job_dir, store_dir, partition_by=None, batch_size=1000, json_file=None):
+    """Append results from individual files to a columnar (Parquet) results store.
+
+    Each batch of results is written to new Parquet files in the store directory, so results are appended without
+    reading or rewriting previous results and memory use is limited by the batch size. The store has one row per
+    entity (image), sample and variable. Stores can be read with pandas.read_parquet or pyarrow.dataset and exported
+    to the PlantCV JSON format with export_results.
+
+    If the store does not exist yet and json_file exists, the results in json_file are imported into the store first,
+    so that exporting the store to json_file keeps the results of earlier runs.
+
+    Args:
+        job_dir:              Intermediate file output directory.
+        store_dir:            Results store directory (created if it does not exist).
+        partition_by:         List of metadata variables used to partition the store into subdirectories.
+        batch_size:           Number of results files written per Parquet file.
+        json_file:            Existing JSON results file imported into a new store (optional).
+
+    :param job_dir: str
+    :param store_dir: str
+    :param partition_by: list
+    :param batch_size: int
+    :param json_file: str
+    """
+    partition_by = partition_by or []
+    new_store = not os.path.exists(os.path.join(store_dir, _STORE_VARIABLES))
+    os.makedirs(store_dir, exist_ok=True)
+    store = _read_store_variables(store_dir=store_dir)
+    if store["partition_by"] is None:
+        store["partition_by"] = partition_by
+    elif store["partition_by"] != partition_by:
+        fatal_error(f"The results store {store_dir} is partitioned by {store['partition_by']}, not {partition_by}")
+
+    # Import the results of earlier runs that were saved to the JSON file without a store
+    if new_store and json_file is not None and os.path.exists(json_file):
+        data = _read_json_results(json_file=json_file)
+        store["variables"].update(data["variables"])
+        for start in range(0, len(data["entities"]), batch_size):
+            entities = data["entities"][start:start + batch_size]
+            for obs in entities:
+                _update_variables(store=store, obs=obs)
+            _write_batch(store_dir=store_dir, entities=entities, partition_by=partition_by)
+
+    batch = []
+    for (dirpath, dirnames, filenames) in os.walk(job_dir):
+        for filename in filenames:
+            # Make sure file is a text or json file
+            if 'text/plain' in mimetypes.guess_type(filename) or 'application/json' in mimetypes.guess_type(filename):
+                with open(os.path.join(dirpath, filename)) as results:
+                    try:
+                        obs = json.load(results)
+                    except json.JSONDecodeError:
+                        fatal_error("Invalid JSON file")
+                _update_variables(store=store, obs=obs)
+                batch.append(obs)
+                if len(batch) >= batch_size:
+                    _write_batch(store_dir=store_dir, entities=batch, partition_by=partition_by)
+                    batch = []
+    if len(batch) > 0:
+        _write_batch(store_dir=store_dir, entities=batch, partition_by=partition_by)
+
+    # Write the variable definitions last so a failed run does not record variables that are not in the store
+    with open(os.path.join(store_dir, _STORE_VARIABLES), "w") as fp:
+        json.dump(store, fp)
+
+
+def export_results(store_dir, json_file):
+    """Export a columnar results store to a PlantCV JSON results file.
+
+    Entities are written to the JSON file one at a time while reading the store one Parquet file at a time.
+
+    Args:
+        store_dir:            Results store directory created by aggregate_results.
+        json_file:            Output JSON file.
+
+    :param store_dir: str
+    :param json_file: str
+    """
+    # Imported here so that pyarrow is only needed to use a results store
+    import pyarrow.parquet as pq
+
+    if not os.path.exists(os.path.join(store_dir, _STORE_VARIABLES)):
+        fatal_error(f"{store_dir} is not a PlantCV results store")
+    store = _read_store_variables(store_dir=store_dir)
+    with open(json_file, "w") as datafile:
+        datafile.write('{"variables": ' + json.dumps(store["variables"]) + ', "entities": [')
+        sep = ""
+        for path, partition in _store_files(store_dir=store_dir):
+            table = pq.read_table(path)
+            meta_vars = [var for var in table.column_names if var not in _OBSERVATION_COLUMNS]
+            for entity in _table_entities(table=table.to_pylist(), meta_vars=meta_vars, partition=partition,
+                                          metadata=store["metadata"]):
+                datafile.write(sep + json.dumps(entity))
+                sep = ", "
+        datafile.write("]}")
+
+
+def _read_json_results(json_file):
+    """Read a PlantCV JSON results file.
+
+    :param json_file: str
+    :return data: dict
+    """
+    with open(json_file, 'r') as datafile:
+        try:
+            data = json.load(datafile)
+            if "variables" not in data or "entities" not in data:
+                fatal_error("Invalid JSON file")
+        except:
+            fatal_error("Invalid JSON file")
+    return data
+
+
+def _read_store_variables(store_dir):
+    """Read the variable definitions of a results store.
+
+    :param store_dir: str
+    :return store: dict
+    """
+    path = os.path.join(store_dir, _STORE_VARIABLES)
+    if os.path.exists(path):
+        with open(path, "r") as fp:
+            return json.load(fp)
+    return {"variables": {}, "metadata": {}, "partition_by": None}
+
+
+def _update_variables(store, obs):
+    """Keep track of the metadata and observation variables stored.
+
+    :param store: dict
+    :param obs: dict
+    """
+    for var in obs["metadata"]:
+        store["variables"][var] = {"category": "metadata", "datatype": "<class 'str'>"}
+        store["metadata"][var] = {"label": obs["metadata"][var]["label"],
+                                  "datatype": obs["metadata"][var]["datatype"]}
+    for sample in obs["observations"]:
+        for othervars in obs["observations"][sample]:
+            store["variables"][othervars] = {"category": "observations",
+                                             "datatype": obs["observations"][sample][othervars]["datatype"]}
+
+
+def _entity_rows(entity_id, obs):
+    """Flatten the observations of a results file into one row per sample and variable.
+
+    :param entity_id: str
+    :param obs: dict
+    :return rows: list
+    """
+    rows = []
+    for sample, variables in obs["observations"].items():
+        for var, data in variables.items():
+            value = data["value"]
+            numeric = isinstance(value, (int, float)) and not isinstance(value, bool)
+            rows.append({"entity": entity_id, "sample": sample, "variable": var, "trait": data.get("trait"),
+                         "method": data.get("method"), "scale": data.get("scale"), "datatype": data.get("datatype"),
+                         "value": float(value) if numeric else None, "value_json": json.dumps(value),
+                         "label_json": json.dumps(data.get("label"))})
+        if len(variables) == 0:
+            rows.append({"entity": entity_id, "sample": sample, "variable": None})
+    if len(rows) == 0:
+        # Keep entities without observations
+        rows.append({"entity": entity_id, "sample": None, "variable": None})
+    return rows
+
+
+def _write_batch(store_dir, entities, partition_by):
+    """Write a batch of results to new Parquet files in a results store.
+
+    :param store_dir: str
+    :param entities: list
+    :param partition_by: list
+    """
+    # Imported here so that pyarrow is only needed to use a results store
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    # Group rows by partition, keeping the rows of each entity together
+    partitions = {}
+    meta_vars = []
+    for obs in entities:
+        entity_id = uuid.uuid4().hex
+        meta = {var: _metadata_value(obs["metadata"][var]["value"]) for var in obs["metadata"]}
+        for var in meta:
+            if var not in meta_vars:
+                meta_vars.append(var)
+        key = tuple(meta.get(var) for var in partition_by)
+        rows = partitions.setdefault(key, [])
+        for row in _entity_rows(entity_id=entity_id, obs=obs):
+            row.update({var: value for var, value in meta.items() if var not in partition_by})
+            rows.append(row)
+
+    # Files are named by creation time so that exports list entities in the order they were appended
+    basename = f"part-{time.time_ns():020d}-{uuid.uuid4().hex[:8]}.parquet"
+    schema = pa.schema([(var, pa.string()) for var in meta_vars if var not in partition_by] +
+                       [(col, pa.float64() if col == "value" else pa.string()) for col in _OBSERVATION_COLUMNS])
+    for key, rows in partitions.items():
+        subdir = os.path.join(store_dir, *[f"{var}={_NULL_PARTITION if value is None else quote(value, safe='')}"
+                                           for var, value in zip(partition_by, key)])
+        os.makedirs(subdir, exist_ok=True)
+        table = pa.Table.from_pylist(rows, schema=schema)
+        pq.write_table(table, os.path.join(subdir, basename))
+
+
+def _metadata_value(value):
+    """Store metadata values as strings.
+
+    :param value: str
+    :return value: str
+    """
+    return None if value is None else str(value)
+
+
+def _store_files(store_dir):
+    """List the Parquet files in a results store in the order they were written.
+
+    :param store_dir: str
+    :return files: list
+    """
+    files = []
+    for (dirpath, dirnames, filenames) in os.walk(store_dir):
+        partition = {}
+        for part in os.path.relpath(dirpath, store_dir).split(os.sep):
+            if "=" in part:
+                var, value = part.split("=", 1)
+                partition[var] = None if value == _NULL_PARTITION else unquote(value)
+        for filename in filenames:
+            if filename.endswith(".parquet") and not filename.startswith(("_", ".")):
+                files.append((filename, os.path.join(dirpath, filename), partition))
+    return [(path, partition) for _, path, partition in sorted(files)]
+
+
+def _table_entities(table, meta_vars, partition, metadata):
+    """Rebuild PlantCV results entities from the rows of a results store file.
+
+    :param table: list
+    :param meta_vars: list
+    :param partition: dict
+    :param metadata: dict
+    :return entity: dict
+    """
+    entity = None
+    entity_id = None
+    for row in table:
+        if row["entity"] != entity_id:
+            if entity is not None:
+                yield entity
+            entity_id = row["entity"]
+            values = dict(partition)
+            values.update({var: row[var] for var in meta_vars})
+            entity = {"metadata": {}, "observations": {}}
+            for var in metadata:
+                if var in values:
+                    entity["metadata"][var] = {"label": metadata[var]["label"],
+                                               "datatype": metadata[var]["datatype"], "value": values[var]}
+        if row["sample"] is not None:
+            sample = entity["observations"].setdefault(row["sample"], {})
+            if row["variable"] is not None:
+                sample[row["variable"]] = {"trait": row["trait"], "method": row["method"], "scale": row["scale"],
+                                           "datatype": row["datatype"], "value": json.loads(row["value_json"]),
+                                           "label": json.loads(row["label_json"])}
+    if entity is not None:
+        yield entity
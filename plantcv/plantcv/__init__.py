@@ -1,4 +1,3 @@
-import matplotlib
 from plantcv.plantcv.fatal_error import fatal_error
 from plantcv.plantcv.classes import Params
 from plantcv.plantcv.classes import Outputs
@@ -8,83 +7,91 @@ from plantcv.plantcv.classes import Spectral_data
 params = Params()
 outputs = Outputs()
 
-from plantcv.plantcv.deprecation_warning import deprecation_warning
-from plantcv.plantcv.print_image import print_image
-from plantcv.plantcv.plot_image import plot_image
-from plantcv.plantcv.color_palette import color_palette
-from plantcv.plantcv.rgb2gray import rgb2gray
-from plantcv.plantcv.rgb2gray_hsv import rgb2gray_hsv
-from plantcv.plantcv.rgb2gray_lab import rgb2gray_lab
-from plantcv.plantcv.rgb2gray_cmyk import rgb2gray_cmyk
-from plantcv.plantcv.gaussian_blur import gaussian_blur
-from plantcv.plantcv import transform
-from plantcv.plantcv import hyperspectral
-from plantcv.plantcv import spectral_index
-from plantcv.plantcv.apply_mask import apply_mask
-from plantcv.plantcv.readimage import readimage
-from plantcv.plantcv.readbayer import readbayer
-from plantcv.plantcv.laplace_filter import laplace_filter
-from plantcv.plantcv.sobel_filter import sobel_filter
-from plantcv.plantcv.scharr_filter import scharr_filter
-from plantcv.plantcv.hist_equalization import hist_equalization
-from plantcv.plantcv.image_add import image_add
-from plantcv.plantcv.image_fusion import image_fusion
-from plantcv.plantcv.image_subtract import image_subtract
-from plantcv.plantcv.erode import erode
-from plantcv.plantcv.dilate import dilate
-from plantcv.plantcv.watershed import watershed_segmentation
-from plantcv.plantcv.rectangle_mask import rectangle_mask
-from plantcv.plantcv.median_blur import median_blur
-from plantcv.plantcv.fill import fill
-from plantcv.plantcv.invert import invert
-from plantcv.plantcv.logical_and import logical_and
-from plantcv.plantcv.logical_or import logical_or
-from plantcv.plantcv.logical_xor import logical_xor
-from plantcv.plantcv.find_objects import find_objects
-from plantcv.plantcv.roi_objects import roi_objects
-from plantcv.plantcv.object_composition import object_composition
-from plantcv.plantcv.within_frame import within_frame
-from plantcv.plantcv.analyze_object import analyze_object
-from plantcv.plantcv.analyze_bound_horizontal import analyze_bound_horizontal
-from plantcv.plantcv.analyze_bound_vertical import analyze_bound_vertical
-from plantcv.plantcv.analyze_color import analyze_color
-from plantcv.plantcv.analyze_nir_intensity import analyze_nir_intensity
-from plantcv.plantcv.print_results import print_results
-from plantcv.plantcv.flip import flip
-from plantcv.plantcv.crop_position_mask import crop_position_mask
-from plantcv.plantcv.get_nir import get_nir
-from plantcv.plantcv.report_size_marker_area import report_size_marker_area
-from plantcv.plantcv.white_balance import white_balance
-from plantcv.plantcv.acute_vertex import acute_vertex
-from plantcv.plantcv.scale_features import scale_features
-from plantcv.plantcv.landmark_reference_pt_dist import landmark_reference_pt_dist
-from plantcv.plantcv.x_axis_pseudolandmarks import x_axis_pseudolandmarks
-from plantcv.plantcv.y_axis_pseudolandmarks import y_axis_pseudolandmarks
-from plantcv.plantcv.cluster_contours import cluster_contours
-from plantcv.plantcv.cluster_contour_splitimg import cluster_contour_splitimg
-from plantcv.plantcv.rotate import rotate
-from plantcv.plantcv.shift_img import shift_img
-from plantcv.plantcv.output_mask_ori_img import output_mask
-from plantcv.plantcv.auto_crop import auto_crop
-from plantcv.plantcv.background_subtraction import background_subtraction
-from plantcv.plantcv.naive_bayes_classifier import naive_bayes_classifier
-from plantcv.plantcv.acute import acute
-from plantcv.plantcv.distance_transform import distance_transform
-from plantcv.plantcv.canny_edge_detect import canny_edge_detect
-from plantcv.plantcv.opening import opening
-from plantcv.plantcv.closing import closing
-from plantcv.plantcv import roi
-from plantcv.plantcv import threshold
-from plantcv.plantcv.cluster_contour_mask import cluster_contour_mask
-from plantcv.plantcv.analyze_thermal_values import analyze_thermal_values
-from plantcv.plantcv import visualize
-from plantcv.plantcv import morphology
-from plantcv.plantcv.fill_holes import fill_holes
-from plantcv.plantcv.get_kernel import get_kernel
-from plantcv.plantcv.crop import crop
-from plantcv.plantcv.stdev_filter import stdev_filter
-from plantcv.plantcv.spatial_clustering import spatial_clustering
-from plantcv.plantcv import photosynthesis
+from plantcv.plantcv._lazy_loader import _lazy_load
+
+# Public functions and subpackages are imported on first access so that importing plantcv only loads the
+# dependencies (matplotlib, plotnine, pandas, scikit-image, etc.) needed by the functions a workflow uses
+# Public name: (submodule, attribute), where attribute is None for subpackages
+_lazy_load(__name__, {
+    "deprecation_warning": ("deprecation_warning", "deprecation_warning"),
+    "print_image": ("print_image", "print_image"),
+    "flush_images": ("flush_images", "flush_images"),
+    "plot_image": ("plot_image", "plot_image"),
+    "color_palette": ("color_palette", "color_palette"),
+    "rgb2gray": ("rgb2gray", "rgb2gray"),
+    "rgb2gray_hsv": ("rgb2gray_hsv", "rgb2gray_hsv"),
+    "rgb2gray_lab": ("rgb2gray_lab", "rgb2gray_lab"),
+    "rgb2gray_cmyk": ("rgb2gray_cmyk", "rgb2gray_cmyk"),
+    "gaussian_blur": ("gaussian_blur", "gaussian_blur"),
+    "transform": ("transform", None),
+    "hyperspectral": ("hyperspectral", None),
+    "spectral_index": ("spectral_index", None),
+    "apply_mask": ("apply_mask", "apply_mask"),
+    "readimage": ("readimage", "readimage"),
+    "readbayer": ("readbayer", "readbayer"),
+    "laplace_filter": ("laplace_filter", "laplace_filter"),
+    "sobel_filter": ("sobel_filter", "sobel_filter"),
+    "scharr_filter": ("scharr_filter", "scharr_filter"),
+    "hist_equalization": ("hist_equalization", "hist_equalization"),
+    "image_add": ("image_add", "image_add"),
+    "image_fusion": ("image_fusion", "image_fusion"),
+    "image_subtract": ("image_subtract", "image_subtract"),
+    "erode": ("erode", "erode"),
+    "dilate": ("dilate", "dilate"),
+    "watershed_segmentation": ("watershed", "watershed_segmentation"),
+    "rectangle_mask": ("rectangle_mask", "rectangle_mask"),
+    "median_blur": ("median_blur", "median_blur"),
+    "fill": ("fill", "fill"),
+    "invert": ("invert", "invert"),
+    "logical_and": ("logical_and", "logical_and"),
+    "logical_or": ("logical_or", "logical_or"),
+    "logical_xor": ("logical_xor", "logical_xor"),
+    "find_objects": ("find_objects", "find_objects"),
+    "roi_objects": ("roi_objects", "roi_objects"),
+    "object_composition": ("object_composition", "object_composition"),
+    "within_frame": ("within_frame", "within_frame"),
+    "analyze_object": ("analyze_object", "analyze_object"),
+    "analyze_bound_horizontal": ("analyze_bound_horizontal", "analyze_bound_horizontal"),
+    "analyze_bound_vertical": ("analyze_bound_vertical", "analyze_bound_vertical"),
+    "analyze_color": ("analyze_color", "analyze_color"),
+    "analyze_nir_intensity": ("analyze_nir_intensity", "analyze_nir_intensity"),
+    "print_results": ("print_results", "print_results"),
+    "flip": ("flip", "flip"),
+    "crop_position_mask": ("crop_position_mask", "crop_position_mask"),
+    "get_nir": ("get_nir", "get_nir"),
+    "report_size_marker_area": ("report_size_marker_area", "report_size_marker_area"),
+    "white_balance": ("white_balance", "white_balance"),
+    "acute_vertex": ("acute_vertex", "acute_vertex"),
+    "scale_features": ("scale_features", "scale_features"),
+    "landmark_reference_pt_dist": ("landmark_reference_pt_dist", "landmark_reference_pt_dist"),
+    "x_axis_pseudolandmarks": ("x_axis_pseudolandmarks", "x_axis_pseudolandmarks"),
+    "y_axis_pseudolandmarks": ("y_axis_pseudolandmarks", "y_axis_pseudolandmarks"),
+    "cluster_contours": ("cluster_contours", "cluster_contours"),
+    "cluster_contour_splitimg": ("cluster_contour_splitimg", "cluster_contour_splitimg"),
+    "rotate": ("rotate", "rotate"),
+    "shift_img": ("shift_img", "shift_img"),
+    "output_mask": ("output_mask_ori_img", "output_mask"),
+    "auto_crop": ("auto_crop", "auto_crop"),
+    "background_subtraction": ("background_subtraction", "background_subtraction"),
+    "naive_bayes_classifier": ("naive_bayes_classifier", "naive_bayes_classifier"),
+    "acute": ("acute", "acute"),
+    "distance_transform": ("distance_transform", "distance_transform"),
+    "canny_edge_detect": ("canny_edge_detect", "canny_edge_detect"),
+    "opening": ("opening", "opening"),
+    "closing": ("closing", "closing"),
+    "roi": ("roi", None),
+    "threshold": ("threshold", None),
+    "cluster_contour_mask": ("cluster_contour_mask", "cluster_contour_mask"),
+    "analyze_thermal_values": ("analyze_thermal_values", "analyze_thermal_values"),
+    "visualize": ("visualize", None),
+    "morphology": ("morphology", None),
+    "fill_holes": ("fill_holes", "fill_holes"),
+    "get_kernel": ("get_kernel", "get_kernel"),
+    "crop": ("crop", "crop"),
+    "stdev_filter": ("stdev_filter", "stdev_filter"),
+    "spatial_clustering": ("spatial_clustering", "spatial_clustering"),
+    "photosynthesis": ("photosynthesis", None),
+})
 # add new functions to end of lists
 
 # Auto versioning
@@ -103,4 +110,4 @@ __all__ = ["fatal_error", "Params", "Outputs", "Spectral_data", "deprecation_war
            "cluster_contours", "cluster_contour_splitimg", "rotate", "shift_img", "output_mask", "auto_crop",
            "background_subtraction", "naive_bayes_classifier", "acute", "distance_transform", "canny_edge_detect", "opening",
            "closing", "roi", "threshold", "cluster_contour_mask", "analyze_thermal_values", "visualize", "morphology",
-           "fill_holes", "get_kernel", "crop", "stdev_filter", "spatial_clustering", "photosynthesis"]
+           "fill_holes", "get_kernel", "crop", "stdev_filter", "spatial_clustering", "photosynthesis", "flush_images"]
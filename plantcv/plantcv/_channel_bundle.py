@@ -0,0 +1,124 @@
+# Colorspace conversions of an image, shared by the functions that use the same image
+
+import threading
+import weakref
+import cv2
+import numpy as np
+
+
+class _ChannelBundle:
+    """Colorspace conversions of a BGR image, each converted the first time it is used.
+
+    The conversions of a shared bundle are read-only because other functions use them as well, functions that return
+    a channel return a copy.
+    """
+
+    def __init__(self, img, conversions=None):
+        self.img = img
+        self.shared = conversions is not None
+        self._conversions = {} if conversions is None else conversions
+
+    def _convert(self, name, converter):
+        if name not in self._conversions:
+            converted = converter(self.img)
+            converted.flags.writeable = not self.shared
+            self._conversions[name] = converted
+        return self._conversions[name]
+
+    @property
+    def hsv(self):
+        """HSV image (hue, saturation, value)."""
+        return self._convert("hsv", lambda img: cv2.cvtColor(img, cv2.COLOR_BGR2HSV))
+
+    @property
+    def lab(self):
+        """LAB image (lightness, green-magenta, blue-yellow)."""
+        return self._convert("lab", lambda img: cv2.cvtColor(img, cv2.COLOR_BGR2LAB))
+
+    @property
+    def gray(self):
+        """Grayscale image."""
+        return self._convert("gray", lambda img: cv2.cvtColor(img, cv2.COLOR_BGR2GRAY))
+
+    @property
+    def cmyk(self):
+        """CMYK image (cyan, magenta, yellow, black)."""
+        return self._convert("cmyk", _bgr2cmyk)
+
+
+def _bgr2cmyk(img):
+    """Convert a BGR image to an 8-bit CMYK image.
+
+    Inputs:
+    img  = RGB image data
+
+    Returns:
+    cmyk = CMYK image data
+
+    :param img: numpy.ndarray
+    :return cmyk: numpy.ndarray
+    """
+    # Create float
+    bgr = img.astype(float) / 255.
+
+    # K channel
+    k = 1 - np.max(bgr, axis=2)
+
+    # C Channel
+    c = (1 - bgr[..., 2] - k) / (1 - k)
+
+    # M Channel
+    m = (1 - bgr[..., 1] - k) / (1 - k)
+
+    # Y Channel
+    y = (1 - bgr[..., 0] - k) / (1 - k)
+
+    return (np.dstack((c, m, y, k)) * 255).astype(np.uint8)
+
+
+# The most recently used read-only image: a weak reference to it and its conversions
+_cache = {"ref": None, "conversions": None}
+_cache_lock = threading.RLock()
+
+
+def _clear_cache(ref):
+    """Free the cached conversions when the cached image is deleted."""
+    with _cache_lock:
+        if _cache["ref"] is ref:
+            _cache["ref"] = None
+            _cache["conversions"] = None
+
+
+def _read_only(img):
+    """Return True if the values of an array (and of the arrays it is a view of) cannot be changed."""
+    while isinstance(img, np.ndarray):
+        if img.flags.writeable:
+            return False
+        img = img.base
+    return True
+
+
+def _channel_bundle(img):
+    """Get the colorspace conversions of an image, reusing the conversions of the last image if it is the same image.
+
+    Only read-only images (e.g. read with readimage(read_only=True)) share their conversions, since the values of other
+    images can change between calls. The conversions are kept until the image is deleted or another read-only image
+    is used.
+
+    Inputs:
+    img    = RGB image data
+
+    Returns:
+    bundle = Colorspace conversions of the image
+
+    :param img: numpy.ndarray
+    :return bundle: plantcv.plantcv._channel_bundle._ChannelBundle
+    """
+    if not isinstance(img, np.ndarray) or not _read_only(img):
+        return _ChannelBundle(img=img)
+    with _cache_lock:
+        ref = _cache["ref"]
+        if ref is None or ref() is not img:
+            _cache["ref"] = weakref.ref(img, _clear_cache)
+            _cache["conversions"] = {}
+        return _ChannelBundle(img=img, conversions=_cache["conversions"])
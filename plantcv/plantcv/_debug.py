@@ -1,8 +1,7 @@
 # Debugging module
 
+import os
 from plantcv.plantcv import params
-from plantcv.plantcv import print_image
-from plantcv.plantcv import plot_image
 
 
 def _debug(visual, filename=None, **kwargs):
@@ -18,9 +17,17 @@ def _debug(visual, filename=None, **kwargs):
     # Auto-increment the device counter
     params.device += 1
 
+    # print_image and plot_image are imported when needed so that matplotlib is not loaded when debug is off
     if params.debug == "print":
         # If debug is print, save the image to a file
+        from plantcv.plantcv import print_image
+        # Debug images are named *.png, save them in the params.debug_format file format instead
+        if filename is not None and params.debug_format.lower() != "png":
+            root, ext = os.path.splitext(filename)
+            if ext.lower() == ".png":
+                filename = root + "." + params.debug_format.lower()
         print_image(img=visual, filename=filename)
     elif params.debug == "plot":
         # If debug is plot, print to the plotting device
+        from plantcv.plantcv import plot_image
         plot_image(img=visual, **kwargs)
@@ -0,0 +1,60 @@
+# Helper functions for sliding window (kernel) filters
+
+import numpy as np
+
+# Border modes of scipy.ndimage filters and the equivalent numpy.pad modes
+_PAD_MODES = {"reflect": "symmetric", "constant": "constant", "nearest": "edge", "mirror": "reflect", "wrap": "wrap"}
+
+
+def _pad(img, ksize, borders):
+    """Pad an image on all axes so that a ksize kernel is centered the same way as in scipy.ndimage filters.
+
+    Inputs:
+    img     = Image data
+    ksize   = Kernel size
+    borders = How the array borders are handled, either 'reflect', 'constant', 'nearest', 'mirror', or 'wrap'
+
+    Returns:
+    padded  = Padded image
+
+    :param img: numpy.ndarray
+    :param ksize: int
+    :param borders: str
+    :return padded: numpy.ndarray
+    """
+    from plantcv.plantcv import fatal_error
+    if borders not in _PAD_MODES:
+        fatal_error(f"Border mode {borders} is not supported. Use 'reflect', 'constant', 'nearest', 'mirror', or 'wrap'")
+    return np.pad(img, [(ksize // 2, (ksize - 1) // 2)] * img.ndim, mode=_PAD_MODES[borders])
+
+
+def _box_sum(arr, shape):
+    """Sum the values in every window of an array using an integral image (summed-area table).
+
+    Integer arrays are summed with int64 values, so the sums are exact. Only windows that fit inside the array are
+    returned, like a 'valid' convolution.
+
+    Inputs:
+    arr    = Input array
+    shape  = Window size along each axis
+
+    Returns:
+    sums   = Window sums, shape is arr.shape - shape + 1
+
+    :param arr: numpy.ndarray
+    :param shape: tuple
+    :return sums: numpy.ndarray
+    """
+    dtype = np.int64 if np.issubdtype(arr.dtype, np.integer) or arr.dtype == bool else np.float64
+    sums = arr.astype(dtype)
+    for axis, size in enumerate(shape):
+        # Cumulative sum with a leading zero, the window sums are differences of cumulative sums
+        csum = np.cumsum(sums, axis=axis, dtype=dtype)
+        zeros = np.zeros(csum.shape[:axis] + (1,) + csum.shape[axis + 1:], dtype=dtype)
+        csum = np.concatenate((zeros, csum), axis=axis)
+        upper = [slice(None)] * arr.ndim
+        lower = [slice(None)] * arr.ndim
+        upper[axis] = slice(size, None)
+        lower[axis] = slice(None, csum.shape[axis] - size)
+        sums = csum[tuple(upper)] - csum[tuple(lower)]
+    return sums
@@ -0,0 +1,100 @@
+# Background writer for debug images
+
+import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import cv2
+from plantcv.plantcv import fatal_error
+
+
+class _ImageWriter:
+    """Write images to files with a pool of background threads.
+
+    At most queue_size images wait to be written at a time, submitting another image blocks until a write finishes,
+    so a workflow that makes images faster than they are written does not keep all of them in memory. Errors raised
+    while writing are stored and raised by flush.
+    """
+
+    def __init__(self):
+        """Initialize a writer without threads, the thread pool is made when the first image is submitted."""
+        self._executor = None
+        self._threads = 0
+        self._queue_size = 0
+        self._slots = None
+        self._pending = []
+        self._errors = []
+        self._lock = threading.Lock()
+        atexit.register(self.flush)
+
+    def submit(self, img, filename, threads, queue_size, write_params=None):
+        """Queue an image to be written to a file.
+
+        The image is written as is, copy it first if it can be changed before it is written.
+
+        Keyword arguments/parameters:
+        img          = Image (numpy array) to write
+        filename     = Name of the file to write the image to
+        threads      = Number of writer threads
+        queue_size   = Maximum number of images waiting to be written
+        write_params = Parameters passed to cv2.imwrite (default: None)
+
+        :param img: numpy.ndarray
+        :param filename: str
+        :param threads: int
+        :param queue_size: int
+        :param write_params: list
+        """
+        # Start a new thread pool if the writer settings changed
+        if self._executor is None or threads != self._threads or queue_size != self._queue_size:
+            self.shutdown()
+            self._executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="plantcv_image_writer")
+            self._threads = threads
+            self._queue_size = queue_size
+            self._slots = threading.BoundedSemaphore(max(queue_size, 1))
+        # Wait for a free spot in the queue
+        self._slots.acquire()
+        future = self._executor.submit(self._write, self._slots, img, filename, write_params or [])
+        with self._lock:
+            self._pending = [f for f in self._pending if not f.done()]
+            self._pending.append(future)
+
+    def _write(self, slots, img, filename, write_params):
+        """Write an image and free its spot in the queue."""
+        try:
+            # cv2.imwrite returns False for most failures (e.g. the directory does not exist) instead of raising
+            if not cv2.imwrite(filename, img, write_params):
+                with self._lock:
+                    self._errors.append((filename, "the file could not be written"))
+        except Exception as err:
+            with self._lock:
+                self._errors.append((filename, err))
+        finally:
+            slots.release()
+
+    def flush(self):
+        """Wait for all queued images to be written.
+
+        Raises the first error (if any) that happened while writing the queued images.
+        """
+        with self._lock:
+            pending = self._pending
+            self._pending = []
+        for future in pending:
+            future.result()
+        with self._lock:
+            errors = self._errors
+            self._errors = []
+        if errors:
+            filename, err = errors[0]
+            fatal_error("Error writing file " + filename + ": " + str(err))
+
+    def shutdown(self):
+        """Write all queued images and stop the writer threads."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self.flush()
+
+
+# The writer used by print_image
+_writer = _ImageWriter()
@@ -0,0 +1,76 @@
+# Figures that are made the first time they are used
+
+from plotnine import ggplot
+
+
+class LazyFigure(ggplot):
+    """A plotnine figure that stores the data needed to make it, and is only made the first time it is used.
+
+    The figure is made when it is printed, plotted, saved, or any other ggplot attribute is used, after which the
+    object is a regular plotnine ggplot object. Adding components (e.g. labels) to a figure that is not made yet
+    returns a new figure that is also made when it is first used.
+    """
+
+    def __init__(self, builder, **kwargs):
+        """Initialize a figure that has not been made.
+
+        Keyword arguments/parameters:
+        builder = Function that returns the ggplot figure
+        kwargs  = Keyword arguments passed to the builder function
+
+        :param builder: function
+        :param kwargs: dict
+        """
+        # ggplot.__init__ is not called, the figure attributes are set when the figure is made
+        self.__dict__["_builder"] = builder
+        self.__dict__["_kwargs"] = kwargs
+
+    def _build_figure(self):
+        """Make the figure and turn this object into it.
+
+        Returns:
+        figure = This object, now a plotnine ggplot object
+
+        :return figure: plotnine.ggplot.ggplot
+        """
+        builder = self.__dict__.pop("_builder")
+        kwargs = self.__dict__.pop("_kwargs")
+        figure = builder(**kwargs)
+        self.__dict__.update(figure.__dict__)
+        self.__class__ = type(figure)
+        return self
+
+    def __getattr__(self, name):
+        # Only called for attributes that are not set, which are the ggplot attributes of a figure that is not made yet
+        if name.startswith("__") or "_builder" not in self.__dict__:
+            raise AttributeError(name)
+        return getattr(self._build_figure(), name)
+
+    def __deepcopy__(self, memo):
+        # plotnine copies a figure before drawing or saving it, make the figure first so that it is only made once
+        if "_builder" in self.__dict__:
+            self._build_figure()
+        return ggplot.__deepcopy__(self, memo)
+
+    def __add__(self, other):
+        return LazyFigure(_add_to_figure, figure=self, other=other)
+
+
+def _add_to_figure(figure, other):
+    """Make a figure and add a component (e.g. labels) to it.
+
+    Inputs:
+    figure = LazyFigure object
+    other  = Component to add to the figure
+
+    Returns:
+    figure = plotnine ggplot object
+
+    :param figure: plantcv.plantcv._lazy_figure.LazyFigure
+    :param other: object
+    :return figure: plotnine.ggplot.ggplot
+    """
+    # The figure may already have been made
+    if isinstance(figure, LazyFigure):
+        figure._build_figure()
+    return figure + other
@@ -0,0 +1,67 @@
+# Lazy loading of package attributes (PEP 562)
+
+import sys
+import types
+import importlib
+
+
+class _LazyModule(types.ModuleType):
+    """Package module type that imports its public attributes on first access."""
+
+    def __getattr__(self, name):
+        """Import the submodule that defines a public attribute the first time it is requested.
+
+        Inputs:
+        name  = attribute name
+
+        Returns:
+        value = function, class, or subpackage bound to the attribute name
+
+        :param name: str
+        :return value: object
+        """
+        lazy_attrs = self.__dict__.get("_lazy_attrs", {})
+        if name not in lazy_attrs:
+            raise AttributeError(f"module {self.__name__!r} has no attribute {name!r}")
+        submodule, attr = lazy_attrs[name]
+        module = importlib.import_module(f"{self.__name__}.{submodule}")
+        value = module if attr is None else getattr(module, attr)
+        # Cache the value in the module namespace so __getattr__ is only called once per attribute
+        self.__dict__[name] = value
+        return value
+
+    def __setattr__(self, name, value):
+        """Keep public functions bound to the package when a submodule with the same name is imported.
+
+        The import system binds a submodule to its parent package (e.g. plantcv.plantcv.rgb2gray) after the submodule
+        is imported, which would otherwise replace a lazily loaded function with the module of the same name.
+
+        :param name: str
+        :param value: object
+        """
+        lazy_attrs = self.__dict__.get("_lazy_attrs", {})
+        if isinstance(value, types.ModuleType) and name in lazy_attrs:
+            submodule, attr = lazy_attrs[name]
+            if attr is not None and value.__name__ == f"{self.__name__}.{submodule}":
+                value = getattr(value, attr)
+        super().__setattr__(name, value)
+
+    def __dir__(self):
+        """List loaded and lazily loadable attributes."""
+        return sorted(set(self.__dict__) | set(self.__dict__.get("_lazy_attrs", {})))
+
+
+def _lazy_load(module_name, lazy_attrs):
+    """Defer importing the public attributes of a package until they are first accessed.
+
+    Inputs:
+    module_name = name of the package being initialized (__name__)
+    lazy_attrs  = dictionary of public attribute names and (submodule, attribute) tuples, where submodule is relative
+                  to the package and attribute is None if the public attribute is the submodule itself
+
+    :param module_name: str
+    :param lazy_attrs: dict
+    """
+    module = sys.modules[module_name]
+    module.__dict__["_lazy_attrs"] = lazy_attrs
+    module.__class__ = _LazyModule
@@ -5,6 +5,62 @@ import math
 import cv2
 
 
+def _pt_dist(pts_a, pts_b):
+    """Euclidean distances between two arrays of (x, y) contour points (N x 2)."""
+    return np.sqrt(np.square(pts_a[..., 0] - pts_b[..., 0]) + np.square(pts_a[..., 1] - pts_b[..., 1]))
+
+
+def _window_points(pts, win, step, block=64):
+    """Find the end point of the angle window of every contour point.
+
+    Starting two points away from each vertex and walking along the contour in the direction of step (1 = forward,
+    -1 = reverse), the end point is the point furthest from the vertex (the first one if there are ties) before the
+    walk reaches a point that is more than win away from the vertex. If no point qualifies the end point is the
+    neighbor of the vertex. All vertices walk together, block points at a time.
+
+    Inputs:
+    pts    = Contour points (N x 2)
+    win    = Maximum distance between a vertex and the end point of its window
+    step   = Walking direction along the contour, 1 or -1
+    block  = Number of points walked per iteration
+
+    Returns:
+    ends   = Index of the window end point of each contour point
+
+    :param pts: numpy.ndarray
+    :param win: int
+    :param step: int
+    :param block: int
+    :return ends: numpy.ndarray
+    """
+    n = len(pts)
+    vertices = np.arange(n)
+    # The neighbor of the vertex is the end point unless a point further away is found
+    ends = (vertices + step) % n
+    end_dist = np.zeros(n)
+    # Vertices that have not reached a point outside the window yet
+    active = vertices
+    for first in range(2, n, block):
+        walked = np.arange(first, min(first + block, n))
+        idx = (active[:, None] + step * walked[None, :]) % n
+        dist = _pt_dist(pts[idx], pts[active][:, None])
+        outside = dist > win
+        stopped = np.any(outside, axis=1)
+        # Points from the first point outside the window on are not used
+        stop = np.where(stopped, np.argmax(outside, axis=1), len(walked))
+        dist[np.arange(len(walked))[None, :] >= stop[:, None]] = -1
+        # Furthest point of the block (first if there are ties), used if it is further than the end point so far
+        furthest = np.argmax(dist, axis=1)
+        furthest_dist = dist[np.arange(len(active)), furthest]
+        further = furthest_dist > end_dist[active]
+        end_dist[active[further]] = furthest_dist[further]
+        ends[active[further]] = idx[further, furthest[further]]
+        active = active[~stopped]
+        if len(active) == 0:
+            break
+    return ends
+
+
 def acute(obj, mask, win, thresh):
     """acute: identify landmark positions within a contour for morphometric analysis
 
@@ -35,83 +91,29 @@ def acute(obj, mask, win, thresh):
     :param thresh: int
     :return homolog_pts:
     """
-    chain = []                                         # Create empty chain to store angle scores
-    for k in list(range(len(obj))):                    # Coordinate-by-coordinate 3-point assignments
-        vert = obj[k]
-        dist_1 = 0
-        for r in range(len(obj)):                      # Reverse can to obtain point A
-            rev = k - r
-            pos = obj[rev]
-            dist_2 = np.sqrt(np.square(pos[0][0]-vert[0][0])+np.square(pos[0][1]-vert[0][1]))
-            if r >= 2:
-                if (dist_2 > dist_1) & (dist_2 <= win):  # Further from vertex than current pt A while within window?
-                    dist_1 = dist_2
-                    ptA = pos                              # Load best fit within window as point A
-                elif dist_2 > win:
-                    break
-            else:
-                ptA = pos
-        dist_1 = 0
-        for f in range(len(obj)):                      # Forward scan to obtain point B
-            fwd = k + f
-            if fwd >= len(obj):
-                fwd -= len(obj)
-            pos = obj[fwd]
-            dist_2 = np.sqrt(np.square(pos[0][0]-vert[0][0])+np.square(pos[0][1]-vert[0][1]))
-            if f >= 2:
-                if (dist_2 > dist_1) & (dist_2 <= win):  # Further from vertex than current pt B while within window?
-                    dist_1 = dist_2
-                    ptB = pos                              # Load best fit within window as point B
-                elif dist_2 > win:
-                    break
-            else:
-                ptB = pos
-
-        # Angle in radians derived from Law of Cosines, converted to degrees
-        P12 = np.sqrt((vert[0][0]-ptA[0][0])*(vert[0][0]-ptA[0][0])+(vert[0][1]-ptA[0][1])*(vert[0][1]-ptA[0][1]))
-        P13 = np.sqrt((vert[0][0]-ptB[0][0])*(vert[0][0]-ptB[0][0])+(vert[0][1]-ptB[0][1])*(vert[0][1]-ptB[0][1]))
-        P23 = np.sqrt((ptA[0][0]-ptB[0][0])*(ptA[0][0]-ptB[0][0])+(ptA[0][1]-ptB[0][1])*(ptA[0][1]-ptB[0][1]))
+    pts = obj.reshape(-1, 2)
+    # 3-point assignments of all coordinates: point A (reverse scan) and point B (forward scan) of each vertex
+    pt_a = pts[_window_points(pts, win, -1)]
+    pt_b = pts[_window_points(pts, win, 1)]
+
+    # Angle in radians derived from Law of Cosines, converted to degrees
+    P12 = _pt_dist(pts, pt_a)
+    P13 = _pt_dist(pts, pt_b)
+    P23 = _pt_dist(pt_a, pt_b)
+    with np.errstate(divide="ignore", invalid="ignore"):
         dot = (P12*P12 + P13*P13 - P23*P23)/(2*P12*P13)
+    # math.acos (instead of np.arccos) keeps the angle scores identical to a point-by-point calculation
+    chain = [math.degrees(math.acos(d)) for d in dot.tolist()]
 
-        # Used a random number generator to test if either of these cases were possible but neither is possible
-        # if dot > 1:              # If float exceeds 1 prevent arcos error and force to equal 1
-        #     dot = 1
-        # elif dot < -1:           # If float exceeds -1 prevent arcos error and force to equal -1
-        #     dot = -1
-        ang = math.degrees(math.acos(dot))
-        chain.append(ang)
-
-    index = []                      # Index chain to find clusters below angle threshold
-
-    for c in range(len(chain)):     # Identify links in chain with acute angles
-        if float(chain[c]) <= thresh:
-            index.append(c)         # Append positions of acute links to index
-
-    acute_pos = obj[index]            # Extract all island points blindly
-
-    float(len(acute_pos)) / float(len(obj))  # Proportion of informative positions
+    # Index chain to find clusters below angle threshold
+    index = np.flatnonzero(np.array(chain) <= thresh)
 
     if len(index) != 0:
 
-        isle = []
-        island = []
-
-        for c in range(len(index)):           # Scan for iterative links within index
-            if not island:
-                island.append(index[c])       # Initiate new link island
-            elif island[-1]+1 == index[c]:
-                island.append(index[c])       # Append successful iteration to island
-            elif island[-1]+1 != index[c]:
-                ptA = obj[index[c]]
-                ptB = obj[island[-1]+1]
-                dist = np.sqrt(np.square(ptA[0][0]-ptB[0][0])+np.square(ptA[0][1]-ptB[0][1]))
-                if win/2 > dist:
-                    island.append(index[c])
-                else:
-                    isle.append(island)
-                    island = [index[c]]
-
-        isle.append(island)
+        # Links that continue an island: the next contour point, or a point within half a window of the next point
+        gap_dist = _pt_dist(pts[index[1:]], pts[index[:-1] + 1])
+        linked = (np.diff(index) == 1) | (win/2 > gap_dist)
+        isle = [island.tolist() for island in np.split(index, np.flatnonzero(~linked) + 1)]
 
         if len(isle) > 1:
             if (isle[0][0] == 0) & (isle[-1][-1] == (len(chain)-1)):
@@ -153,12 +155,9 @@ def acute(obj, mask, win, thresh):
 
             # Identify pixel coordinate to use as pseudolandmark for island
             if len(isle[x]) == 1:           # If landmark is a single point (store position)
-                # print 'route A'
                 pt = isle[x][0]
                 max_dist.append([isle[x][0], '-', chain[isle[x][0]]])
-                # print pt
             elif len(isle[x]) == 2:         # If landmark is a pair of points (store more acute position)
-                # print 'route B'
                 ptA = chain[isle[x][0]]
                 ptB = chain[isle[x][1]]
                 if ptA < ptB:
@@ -167,23 +166,16 @@ def acute(obj, mask, win, thresh):
                 elif ptA > ptB:
                     pt = isle[x][1]             # Store point B if more acute
                     max_dist.append([isle[x][1], '-', chain[isle[x][1]]])
-                # print pt
             else:                           # If landmark is multiple points (distance scan for position)
-                # print 'route C'
-                SS = obj[[isle[x]]][0]          # Store isle "x" start site
-                TS = obj[[isle[x]]][-1]         # Store isle "x" termination site
-                dist_1 = 0
-                for d in range(len(isle[x])):   # Scan from SS to TS within isle "x"
-                    site = obj[[isle[x][d]]]
-                    SSd = np.sqrt(np.square(SS[0][0]-site[0][0][0])+np.square(SS[0][1]-site[0][0][1]))
-                    TSd = np.sqrt(np.square(TS[0][0]-site[0][0][0])+np.square(TS[0][1]-site[0][0][1]))
-                    # Current mean distance of 'd' to 'SS' & 'TS'
-                    dist_2 = np.mean([np.abs(SSd), np.abs(TSd)])
-                    max_dist.append([isle[x][d], dist_2, chain[isle[x][d]]])
-                    if dist_2 > dist_1:                           # Current mean distance better fit that previous best?
-                        pt = isle[x][d]
-                        dist_1 = dist_2                           # Current mean becomes new best mean
-                # print pt
+                sites = pts[isle[x]]
+                # Mean distance of each site to the isle "x" start site (SS) and termination site (TS)
+                SSd = _pt_dist(sites[0], sites)
+                TSd = _pt_dist(sites[-1], sites)
+                dist_2 = (np.abs(SSd) + np.abs(TSd)) / 2
+                max_dist.extend([isle[x][d], dist_2[d], chain[isle[x][d]]] for d in range(len(isle[x])))
+                # The site with the largest mean distance (first if there are ties) is the landmark
+                if np.max(dist_2) > 0:
+                    pt = isle[x][int(np.argmax(dist_2))]
             maxpts.append(pt)           # Empty 'pts' prior to next mean distance scan
             SSpts.append(isle[x][0])
             TSpts.append(isle[x][-1])
@@ -39,55 +39,44 @@ def acute_vertex(img, obj, win, thresh, sep, label="default"):
     :return img2: ndarray
     """
     params.device += 1
-    chain = []
     if not np.any(obj):
         acute = ['NA', 'NA']
         return acute
-    for i in range(len(obj) - win):
-        x, y = obj[i].ravel()
-        pre_x, pre_y = obj[i - win].ravel()
-        post_x, post_y = obj[i + win].ravel()
-
-        # Angle in radians derived from Law of Cosines, converted to degrees
-        P12 = np.sqrt((x - pre_x) * (x - pre_x) + (y - pre_y) * (y - pre_y))
-        P13 = np.sqrt((x - post_x) * (x - post_x) + (y - post_y) *
-                      (y - post_y))
-        P23 = np.sqrt((pre_x - post_x) * (pre_x - post_x) + (pre_y - post_y) *
-                      (pre_y - post_y))
-        den = 0.001
-        if (2 * P12 * P13) > 0.001:
-            den = (2 * P12 * P13)
-        dot = (P12 * P12 + P13 * P13 - P23 * P23) / den
-
-        dot = -1 if dot < -1 else dot  # If float exceeds -1 prevent arcos error and force to equal -1
-        ang = math.degrees(math.acos(dot))
-        chain.append(ang)
+    # Vertex, pre, and post point of every contour point that has a post point
+    pts = obj.reshape(-1, 2)
+    vertex = np.arange(max(len(pts) - win, 0))
+    x, y = pts[vertex, 0], pts[vertex, 1]
+    pre_x, pre_y = pts[vertex - win, 0], pts[vertex - win, 1]
+    post_x, post_y = pts[vertex + win, 0], pts[vertex + win, 1]
+
+    # Angle in radians derived from Law of Cosines, converted to degrees
+    P12 = np.sqrt((x - pre_x) * (x - pre_x) + (y - pre_y) * (y - pre_y))
+    P13 = np.sqrt((x - post_x) * (x - post_x) + (y - post_y) *
+                  (y - post_y))
+    P23 = np.sqrt((pre_x - post_x) * (pre_x - post_x) + (pre_y - post_y) *
+                  (pre_y - post_y))
+    den = np.where((2 * P12 * P13) > 0.001, 2 * P12 * P13, 0.001)
+    dot = (P12 * P12 + P13 * P13 - P23 * P23) / den
+
+    dot[dot < -1] = -1  # If float exceeds -1 prevent arcos error and force to equal -1
+    # math.acos (instead of np.arccos) keeps the angles identical to a point-by-point calculation
+    chain = np.array([math.degrees(math.acos(d)) for d in dot.tolist()])
 
     # Select points in contour that have an angle more acute than thresh
-    index = []
-    for c in range(len(chain)):
-        if float(chain[c]) <= thresh:
-            index.append(c)
+    index = np.flatnonzero(chain <= thresh)
     # There oftentimes several points around tips with acute angles
     # Here we try to pick the most acute angle given a set of contiguous point
     # Sep is the number of points to evaluate the number of vertices
+    # A group of points ends where the next point is sep or more points away, points after the last group end are
+    # not evaluated
+    ends = np.flatnonzero(np.diff(index) >= sep)
     out = []
-    tester = []
-    for i in range(len(index) - 1):
-        # print str(index[i])
-        if index[i + 1] - index[i] < sep:
-            tester.append(index[i])
-        if index[i + 1] - index[i] >= sep:
-            tester.append(index[i])
-            angles = ([chain[d] for d in tester])
-            keeper = angles.index(min(angles))
-            t = tester[keeper]
-            # print str(t)
-            out.append(t)
-            tester = []
+    for start, stop in zip(np.concatenate(([0], ends[:-1] + 1)), ends + 1):
+        tester = index[start:stop]
+        out.append(int(tester[np.argmin(chain[tester])]))
 
     # Store the points in the variable acute
-    acute = obj[[out]]
+    acute = obj[out]
     acute_points = []
     for pt in acute:
         acute_points.append(pt[0].tolist())
@@ -1,5 +1,4 @@
 import os
-import cv2
 import numpy as np
 import pandas as pd
 from scipy import stats
@@ -9,7 +8,8 @@ from plantcv.plantcv import deprecation_warning
 from plantcv.plantcv import params
 from plantcv.plantcv._debug import _debug
 from plantcv.plantcv import outputs
-from plantcv.plantcv.visualize import histogram
+from plantcv.plantcv._channel_bundle import _channel_bundle
+from plantcv.plantcv._lazy_figure import LazyFigure
 
 
 def analyze_color(rgb_img, mask, hist_plot_type=None, colorspaces="all", label="default"):
@@ -31,8 +31,6 @@ def analyze_color(rgb_img, mask, hist_plot_type=None, colorspaces="all", label="
     :param label: str
     :return analysis_images: list
     """
-    # Save user debug setting
-    debug = params.debug
     if hist_plot_type is not None:
         deprecation_warning("'hist_plot_type' will be deprecated in a future version of PlantCV. "
                             "Please use 'colorspaces' instead.")
@@ -41,22 +39,6 @@ def analyze_color(rgb_img, mask, hist_plot_type=None, colorspaces="all", label="
     if len(np.shape(rgb_img)) < 3:
         fatal_error("rgb_img must be an RGB image")
 
-    # Mask the input image
-    masked = cv2.bitwise_and(rgb_img, rgb_img, mask=mask)
-    # Extract the blue, green, and red channels
-    b, g, r = cv2.split(masked)
-    # Convert the BGR image to LAB
-    lab = cv2.cvtColor(masked, cv2.COLOR_BGR2LAB)
-    # Extract the lightness, green-magenta, and blue-yellow channels
-    l, m, y = cv2.split(lab)
-    # Convert the BGR image to HSV
-    hsv = cv2.cvtColor(masked, cv2.COLOR_BGR2HSV)
-    # Extract the hue, saturation, and value channels
-    h, s, v = cv2.split(hsv)
-
-    # Color channel dictionary
-    channels = {"b": b, "g": g, "r": r, "l": l, "m": m, "y": y, "h": h, "s": s, "v": v}
-
     # Histogram plot types
     hist_types = {"all": ("b", "g", "r", "l", "m", "y", "h", "s", "v"),
                   "rgb": ("b", "g", "r"),
@@ -64,111 +46,50 @@ def analyze_color(rgb_img, mask, hist_plot_type=None, colorspaces="all", label="
                   "hsv": ("h", "s", "v")}
 
     if colorspaces.lower() not in hist_types:
-        fatal_error(f"Colorspace '{colorspaces}' is not supported, must be be one of the following: " 
+        fatal_error(f"Colorspace '{colorspaces}' is not supported, must be be one of the following: "
                     f"{', '.join(map(str, hist_types.keys()))}")
 
-    # Calculate histogram
-    params.debug = None
-    histograms = {
-        "b": {"label": "blue", "graph_color": "blue",
-              "hist": histogram(channels["b"], mask, 256, 0, 255,
-                                hist_data=True)[1]['proportion of pixels (%)'].tolist()},
-        "g": {"label": "green", "graph_color": "forestgreen",
-              "hist": histogram(channels["g"], mask, 256, 0, 255,
-                                hist_data=True)[1]['proportion of pixels (%)'].tolist()},
-        "r": {"label": "red", "graph_color": "red",
-              "hist": histogram(channels["r"], mask, 256, 0, 255,
-                                hist_data=True)[1]['proportion of pixels (%)'].tolist()},
-        "l": {"label": "lightness", "graph_color": "dimgray",
-              "hist": histogram(channels["l"], mask, 256, 0, 255,
-                                hist_data=True)[1]['proportion of pixels (%)'].tolist()},
-        "m": {"label": "green-magenta", "graph_color": "magenta",
-              "hist": histogram(channels["m"], mask, 256, 0, 255,
-                                hist_data=True)[1]['proportion of pixels (%)'].tolist()},
-        "y": {"label": "blue-yellow", "graph_color": "yellow",
-              "hist": histogram(channels["y"], mask, 256, 0, 255,
-                                hist_data=True)[1]['proportion of pixels (%)'].tolist()},
-        "h": {"label": "hue", "graph_color": "blueviolet",
-              "hist": histogram(channels["h"], mask, 256, 0, 255,
-                                hist_data=True)[1]['proportion of pixels (%)'].tolist()},
-        "s": {"label": "saturation", "graph_color": "cyan",
-              "hist": histogram(channels["s"], mask, 256, 0, 255,
-                                hist_data=True)[1]['proportion of pixels (%)'].tolist()},
-        "v": {"label": "value", "graph_color": "orange",
-              "hist": histogram(channels["v"], mask, 256, 0, 255,
-                                hist_data=True)[1]['proportion of pixels (%)'].tolist()}
-    }
-
-    # Restore user debug setting
-    params.debug = debug
-
-    # Create list of bin labels for 8-bit data
-    binval = np.arange(0, 256)
-
-    # Create a dataframe of bin labels and histogram data
-    dataset = pd.DataFrame({'bins': binval, 'blue': histograms["b"]["hist"],
-                            'green': histograms["g"]["hist"], 'red': histograms["r"]["hist"],
-                            'lightness': histograms["l"]["hist"], 'green-magenta': histograms["m"]["hist"],
-                            'blue-yellow': histograms["y"]["hist"], 'hue': histograms["h"]["hist"],
-                            'saturation': histograms["s"]["hist"], 'value': histograms["v"]["hist"]})
-    # Make the histogram figure using plotnine
-    if colorspaces.upper() == 'RGB':
-        df_rgb = pd.melt(dataset, id_vars=['bins'], value_vars=['blue', 'green', 'red'],
-                         var_name='color Channel', value_name='proportion of pixels (%)')
-        hist_fig = (ggplot(df_rgb, aes(x='bins', y='proportion of pixels (%)', color='color Channel'))
-                    + geom_line()
-                    + scale_x_continuous(breaks=list(range(0, 256, 25)))
-                    + scale_color_manual(['blue', 'green', 'red'])
-                    )
-
-    elif colorspaces.upper() == 'LAB':
-        df_lab = pd.melt(dataset, id_vars=['bins'],
-                         value_vars=['lightness', 'green-magenta', 'blue-yellow'],
-                         var_name='color Channel', value_name='proportion of pixels (%)')
-        hist_fig = (ggplot(df_lab, aes(x='bins', y='proportion of pixels (%)', color='color Channel'))
-                    + geom_line()
-                    + scale_x_continuous(breaks=list(range(0, 256, 25)))
-                    + scale_color_manual(['yellow', 'magenta', 'dimgray'])
-                    )
-
-    elif colorspaces.upper() == 'HSV':
-        df_hsv = pd.melt(dataset, id_vars=['bins'],
-                         value_vars=['hue', 'saturation', 'value'],
-                         var_name='color Channel', value_name='proportion of pixels (%)')
-        hist_fig = (ggplot(df_hsv, aes(x='bins', y='proportion of pixels (%)', color='color Channel'))
-                    + geom_line()
-                    + scale_x_continuous(breaks=list(range(0, 256, 25)))
-                    + scale_color_manual(['blueviolet', 'cyan', 'orange'])
-                    )
-
-    elif colorspaces.upper() == 'ALL':
-        s = pd.Series(['blue', 'green', 'red', 'lightness', 'green-magenta',
-                       'blue-yellow', 'hue', 'saturation', 'value'], dtype="category")
-        color_channels = ['blue', 'yellow', 'green', 'magenta', 'blueviolet',
-                          'dimgray', 'red', 'cyan', 'orange']
-        df_all = pd.melt(dataset, id_vars=['bins'], value_vars=s, var_name='color Channel',
-                         value_name='proportion of pixels (%)')
-        hist_fig = (ggplot(df_all, aes(x='bins', y='proportion of pixels (%)', color='color Channel'))
-                    + geom_line()
-                    + scale_x_continuous(breaks=list(range(0, 256, 25)))
-                    + scale_color_manual(color_channels)
-                    )
-
-    hist_fig = hist_fig + labs(x="Pixel intensity", y="Proportion of pixels (%)")
+    # Colorspace conversions of the image (shared with other functions using the same image)
+    bundle = _channel_bundle(rgb_img)
+    # Pixels in the mask
+    in_mask = mask > 0
+    pixels = float(np.count_nonzero(in_mask))
+
+    # Color channel dictionary: colorspace image and channel index
+    channels = {"b": ("img", 0), "g": ("img", 1), "r": ("img", 2),
+                "l": ("lab", 0), "m": ("lab", 1), "y": ("lab", 2),
+                "h": ("hsv", 0), "s": ("hsv", 1), "v": ("hsv", 2)}
+    # Masked pixel values of the colorspace images that are used, shape (pixels, 3)
+    masked = {}
+
+    def _masked_channel(name):
+        space, idx = channels[name]
+        if space not in masked:
+            masked[space] = getattr(bundle, space)[in_mask]
+        return masked[space][:, idx]
+
+    # Calculate the histogram of each channel (proportion of pixels (%) in each 8-bit bin) in one pass per channel
+    histograms = {}
+    for name in hist_types[colorspaces.lower()]:
+        hist = np.bincount(_masked_channel(name), minlength=256)[:256]
+        histograms[name] = ((hist / pixels) * 100).tolist()
 
     # Hue values of zero are red but are also the value for pixels where hue is undefined. The hue value of a pixel will
     # be undef. when the color values are saturated. Therefore, hue values of 0 are excluded from the calculations below
+    h = _masked_channel("h")
+    h = h[h > 0]
     # Calculate the median hue value (median is rescaled from the encoded 0-179 range to the 0-359 degree range)
-    hue_median = np.median(h[np.where(h > 0)]) * 2
+    hue_median = np.median(h) * 2
 
     # Calculate the circular mean and standard deviation of the encoded hue values
     # The mean and standard-deviation are rescaled from the encoded 0-179 range to the 0-359 degree range
-    hue_circular_mean = stats.circmean(h[np.where(h > 0)], high=179, low=0) * 2
-    hue_circular_std = stats.circstd(h[np.where(h > 0)], high=179, low=0) * 2
+    hue_circular_mean = stats.circmean(h, high=179, low=0) * 2
+    hue_circular_std = stats.circstd(h, high=179, low=0) * 2
 
-    # Plot or print the histogram
-    analysis_image = hist_fig
-    _debug(visual=hist_fig, filename=os.path.join(params.debug_outdir, str(params.device) + '_analyze_color_hist.png'))
+    # Plot or print the histogram, the figure is only made when it is used
+    analysis_image = LazyFigure(_color_hist_fig, histograms=histograms, colorspaces=colorspaces)
+    _debug(visual=analysis_image,
+           filename=os.path.join(params.debug_outdir, str(params.device) + '_analyze_color_hist.png'))
 
     # Store into global measurements
     # RGB signal values are in an unsigned 8-bit scale of 0-255
@@ -183,36 +104,36 @@ def analyze_color(rgb_img, mask, hist_plot_type=None, colorspaces="all", label="
     if colorspaces.upper() in ('RGB', 'ALL'):
         outputs.add_observation(sample=label, variable='blue_frequencies', trait='blue frequencies',
                                 method='plantcv.plantcv.analyze_color', scale='frequency', datatype=list,
-                                value=histograms["b"]["hist"], label=rgb_values)
+                                value=histograms["b"], label=rgb_values)
         outputs.add_observation(sample=label, variable='green_frequencies', trait='green frequencies',
                                 method='plantcv.plantcv.analyze_color', scale='frequency', datatype=list,
-                                value=histograms["g"]["hist"], label=rgb_values)
+                                value=histograms["g"], label=rgb_values)
         outputs.add_observation(sample=label, variable='red_frequencies', trait='red frequencies',
                                 method='plantcv.plantcv.analyze_color', scale='frequency', datatype=list,
-                                value=histograms["r"]["hist"], label=rgb_values)
+                                value=histograms["r"], label=rgb_values)
 
     if colorspaces.upper() in ('LAB', 'ALL'):
         outputs.add_observation(sample=label, variable='lightness_frequencies', trait='lightness frequencies',
                                 method='plantcv.plantcv.analyze_color', scale='frequency', datatype=list,
-                                value=histograms["l"]["hist"], label=percent_values)
+                                value=histograms["l"], label=percent_values)
         outputs.add_observation(sample=label, variable='green-magenta_frequencies',
                                 trait='green-magenta frequencies',
                                 method='plantcv.plantcv.analyze_color', scale='frequency', datatype=list,
-                                value=histograms["m"]["hist"], label=diverging_values)
+                                value=histograms["m"], label=diverging_values)
         outputs.add_observation(sample=label, variable='blue-yellow_frequencies', trait='blue-yellow frequencies',
                                 method='plantcv.plantcv.analyze_color', scale='frequency', datatype=list,
-                                value=histograms["y"]["hist"], label=diverging_values)
+                                value=histograms["y"], label=diverging_values)
 
     if colorspaces.upper() in ('HSV', 'ALL'):
         outputs.add_observation(sample=label, variable='hue_frequencies', trait='hue frequencies',
                                 method='plantcv.plantcv.analyze_color', scale='frequency', datatype=list,
-                                value=histograms["h"]["hist"][0:180], label=hue_values)
+                                value=histograms["h"][0:180], label=hue_values)
         outputs.add_observation(sample=label, variable='saturation_frequencies', trait='saturation frequencies',
                                 method='plantcv.plantcv.analyze_color', scale='frequency', datatype=list,
-                                value=histograms["s"]["hist"], label=percent_values)
+                                value=histograms["s"], label=percent_values)
         outputs.add_observation(sample=label, variable='value_frequencies', trait='value frequencies',
                                 method='plantcv.plantcv.analyze_color', scale='frequency', datatype=list,
-                                value=histograms["v"]["hist"], label=percent_values)
+                                value=histograms["v"], label=percent_values)
 
     # Always save hue stats
     outputs.add_observation(sample=label, variable='hue_circular_mean', trait='hue circular mean',
@@ -229,3 +150,73 @@ def analyze_color(rgb_img, mask, hist_plot_type=None, colorspaces="all", label="
     outputs.images.append(analysis_image)
 
     return analysis_image
+
+
+def _color_hist_fig(histograms, colorspaces):
+    """Make the histogram figure of the analyzed color channels.
+
+    Inputs:
+    histograms  = Dictionary of channel histograms (proportion of pixels (%) in each 8-bit bin)
+    colorspaces = 'all', 'rgb', 'lab', or 'hsv'
+
+    Returns:
+    hist_fig    = histogram figure
+
+    :param histograms: dict
+    :param colorspaces: str
+    :return hist_fig: plotnine.ggplot.ggplot
+    """
+    # Channel labels
+    labels = {"b": "blue", "g": "green", "r": "red", "l": "lightness", "m": "green-magenta", "y": "blue-yellow",
+              "h": "hue", "s": "saturation", "v": "value"}
+
+    # Create a dataframe of bin labels and histogram data
+    # Create list of bin labels for 8-bit data
+    dataset = pd.DataFrame({'bins': np.arange(0, 256),
+                            **{labels[name]: hist for name, hist in histograms.items()}})
+    # Make the histogram figure using plotnine
+    if colorspaces.upper() == 'RGB':
+        df_rgb = pd.melt(dataset, id_vars=['bins'], value_vars=['blue', 'green', 'red'],
+                         var_name='color Channel', value_name='proportion of pixels (%)')
+        hist_fig = (ggplot(df_rgb, aes(x='bins', y='proportion of pixels (%)', color='color Channel'))
+                    + geom_line()
+                    + scale_x_continuous(breaks=list(range(0, 256, 25)))
+                    + scale_color_manual(['blue', 'green', 'red'])
+                    )
+
+    elif colorspaces.upper() == 'LAB':
+        df_lab = pd.melt(dataset, id_vars=['bins'],
+                         value_vars=['lightness', 'green-magenta', 'blue-yellow'],
+                         var_name='color Channel', value_name='proportion of pixels (%)')
+        hist_fig = (ggplot(df_lab, aes(x='bins', y='proportion of pixels (%)', color='color Channel'))
+                    + geom_line()
+                    + scale_x_continuous(breaks=list(range(0, 256, 25)))
+                    + scale_color_manual(['yellow', 'magenta', 'dimgray'])
+                    )
+
+    elif colorspaces.upper() == 'HSV':
+        df_hsv = pd.melt(dataset, id_vars=['bins'],
+                         value_vars=['hue', 'saturation', 'value'],
+                         var_name='color Channel', value_name='proportion of pixels (%)')
+        hist_fig = (ggplot(df_hsv, aes(x='bins', y='proportion of pixels (%)', color='color Channel'))
+                    + geom_line()
+                    + scale_x_continuous(breaks=list(range(0, 256, 25)))
+                    + scale_color_manual(['blueviolet', 'cyan', 'orange'])
+                    )
+
+    else:
+        s = pd.Series(['blue', 'green', 'red', 'lightness', 'green-magenta',
+                       'blue-yellow', 'hue', 'saturation', 'value'], dtype="category")
+        color_channels = ['blue', 'yellow', 'green', 'magenta', 'blueviolet',
+                          'dimgray', 'red', 'cyan', 'orange']
+        df_all = pd.melt(dataset, id_vars=['bins'], value_vars=s, var_name='color Channel',
+                         value_name='proportion of pixels (%)')
+        hist_fig = (ggplot(df_all, aes(x='bins', y='proportion of pixels (%)', color='color Channel'))
+                    + geom_line()
+                    + scale_x_continuous(breaks=list(range(0, 256, 25)))
+                    + scale_color_manual(color_channels)
+                    )
+
+    hist_fig = hist_fig + labs(x="Pixel intensity", y="Proportion of pixels (%)")
+
+    return hist_fig
@@ -1,6 +1,7 @@
 # PlantCV classes
 import os
 import json
+import numpy as np
 from plantcv.plantcv import fatal_error
 
 
@@ -9,7 +10,8 @@ class Params:
 
     def __init__(self, device=0, debug=None, debug_outdir=".", line_thickness=5, dpi=100, text_size=0.55,
                  text_thickness=2, marker_size=60, color_scale="gist_rainbow", color_sequence="sequential",
-                 saved_color_scale=None, verbose=True):
+                 saved_color_scale=None, verbose=True, debug_format="png", png_compression=None,
+                 debug_writer_threads=0, debug_writer_queue=32):
         """Initialize parameters.
 
         Keyword arguments/parameters:
@@ -25,6 +27,11 @@ class Params:
         color_sequence    = Build color scales in "sequential" or "random" order. (default: sequential)
         saved_color_scale = Saved color scale that will be applied next time color_palette is called. (default: None)
         verbose           = Whether or not in verbose mode. (default: True)
+        debug_format      = File format (extension) of debug images saved in print mode, e.g. png or jpg. (default: png)
+        png_compression   = PNG compression level (0-9) used by print_image, None = OpenCV default. (default: None)
+        debug_writer_threads = Number of threads that write images in the background, 0 = no background writing.
+                               (default: 0)
+        debug_writer_queue   = Maximum number of images waiting to be written in the background. (default: 32)
 
         :param device: int
         :param debug: str
@@ -38,6 +45,10 @@ class Params:
         :param color_sequence: str
         :param saved_color_scale: list
         :param verbose: bool
+        :param debug_format: str
+        :param png_compression: int
+        :param debug_writer_threads: int
+        :param debug_writer_queue: int
         """
         self.device = device
         self.debug = debug
@@ -51,6 +62,10 @@ class Params:
         self.color_sequence = color_sequence
         self.saved_color_scale = saved_color_scale
         self.verbose = verbose
+        self.debug_format = debug_format
+        self.png_compression = png_compression
+        self.debug_writer_threads = debug_writer_threads
+        self.debug_writer_queue = debug_writer_queue
 
 
 class Outputs:
@@ -133,6 +148,10 @@ class Outputs:
         :param filename: str
         :param outformat: str
         """
+        # Results are saved at the end of a workflow, wait for the debug images written in the background
+        from plantcv.plantcv._image_writer import _writer
+        _writer.flush()
+
         if outformat.upper() == "JSON":
             if os.path.isfile(filename):
                 with open(filename, 'r') as f:
@@ -190,9 +209,9 @@ class Spectral_data:
         # Min/max available wavelengths (for spectral datacube)
         self.max_wavelength = max_wavelength
         self.min_wavelength = min_wavelength
-        #  Min/max pixel value for single wavelength or index
-        self.max_value = max_value
-        self.min_value = min_value
+        #  Min/max pixel value for single wavelength or index (None = calculated when first used)
+        self._max_value = max_value
+        self._min_value = min_value
         # Numpy data type
         self.d_type = d_type
         # Contains all available wavelengths where keys are wavelength and value are indices
@@ -205,9 +224,97 @@ class Spectral_data:
         self.wavelength_units = wavelength_units
         # The type of array data (entire datacube, specific index, first derivative, etc)
         self.array_type = array_type
-        # Pseudo-RGB image if the array_type is a datacube
-        self.pseudo_rgb = pseudo_rgb
+        # Pseudo-RGB image if the array_type is a datacube (None = created when first used)
+        self._pseudo_rgb = pseudo_rgb
         # The filename where the data originated from
         self.filename = filename
         # The default band indices needed to make an pseudo_rgb image, if not available then store None
         self.default_bands = default_bands
+
+    @property
+    def max_value(self):
+        """Maximum pixel value, calculated from the array data the first time it is needed."""
+        if self._max_value is None and self.array_data is not None:
+            self._calc_min_max()
+        return self._max_value
+
+    @max_value.setter
+    def max_value(self, value):
+        self._max_value = value
+
+    @property
+    def min_value(self):
+        """Minimum pixel value, calculated from the array data the first time it is needed."""
+        if self._min_value is None and self.array_data is not None:
+            self._calc_min_max()
+        return self._min_value
+
+    @min_value.setter
+    def min_value(self, value):
+        self._min_value = value
+
+    @property
+    def pseudo_rgb(self):
+        """Pseudo-RGB image of a datacube, created from three bands the first time it is needed."""
+        if self._pseudo_rgb is None and self.array_type == "datacube" and self.array_data is not None:
+            # Imported here to avoid a circular import
+            from plantcv.plantcv.hyperspectral.read_data import _make_pseudo_rgb
+            self._pseudo_rgb = _make_pseudo_rgb(spectral_array=self)
+        return self._pseudo_rgb
+
+    @pseudo_rgb.setter
+    def pseudo_rgb(self, value):
+        self._pseudo_rgb = value
+
+    def _band_index(self, wavelength):
+        """Find the index of the band closest to a target wavelength.
+
+        The wavelengths are sorted once and cached, the cache is rebuilt if wavelength_dict is replaced or changes size.
+
+        Keyword arguments/parameters:
+        wavelength = Target wavelength value
+
+        Returns:
+        band       = Index of the closest band in the array data
+
+        :param wavelength: float
+        :return band: int
+        """
+        # Imported here to avoid a circular import
+        from plantcv.plantcv.hyperspectral.read_data import _find_closest
+        cache = self.__dict__.get("_wavelength_cache")
+        if cache is None or cache[0] is not self.wavelength_dict or cache[1] != len(self.wavelength_dict):
+            wavelengths = np.array([float(i) for i in self.wavelength_dict.keys()])
+            bands = np.array([int(i) for i in self.wavelength_dict.values()])
+            order = np.argsort(wavelengths, kind="stable")
+            cache = (self.wavelength_dict, len(self.wavelength_dict), wavelengths[order], bands[order])
+            self.__dict__["_wavelength_cache"] = cache
+        return int(cache[3][_find_closest(cache[2], wavelength)])
+
+    def _calc_min_max(self, chunk_size=2 ** 26):
+        """Calculate the min and max pixel values in blocks of lines so memory-mapped data is not loaded at once.
+
+        Keyword arguments/parameters:
+        chunk_size = Approximate number of bytes read per block of lines. (default: 64 MB)
+
+        :param chunk_size: int
+        """
+        lines_per_chunk = max(1, chunk_size // max(1, self.array_data[0].nbytes))
+        max_pixel = None
+        min_pixel = None
+        for start in range(0, self.array_data.shape[0], lines_per_chunk):
+            chunk = self.array_data[start:start + lines_per_chunk]
+            chunk_max = np.amax(chunk)
+            chunk_min = np.amin(chunk)
+            # Like np.amax/np.amin of the whole array, a NaN in any block makes the result NaN
+            max_pixel = chunk_max if max_pixel is None else np.maximum(max_pixel, chunk_max)
+            min_pixel = chunk_min if min_pixel is None else np.minimum(min_pixel, chunk_min)
+        self._max_value = float(max_pixel)
+        self._min_value = float(min_pixel)
+
+    def __setstate__(self, state):
+        """Restore a pickled instance, including instances pickled before values were calculated when first used."""
+        for attr in ["max_value", "min_value", "pseudo_rgb"]:
+            if attr in state:
+                state["_" + attr] = state.pop(attr)
+        self.__dict__.update(state)
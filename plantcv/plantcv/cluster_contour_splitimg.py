@@ -7,10 +7,11 @@ from plantcv.plantcv import print_image
 from plantcv.plantcv import apply_mask
 from plantcv.plantcv import params
 from plantcv.plantcv._debug import _debug
+from plantcv.plantcv.cluster_contours import _contour_children, _draw_filled_contour
 
 
 def cluster_contour_splitimg(img, grouped_contour_indexes, contours, hierarchy, outdir=None, file=None,
-                             filenames=None):
+                             filenames=None, cluster_labels=None):
 
     """
     This function takes clustered contours and splits them into multiple images, also does a check to make sure that
@@ -26,6 +27,8 @@ def cluster_contour_splitimg(img, grouped_contour_indexes, contours, hierarchy,
                               output of filename from read_image function
     filenames               = input txt file with list of filenames in order from top to bottom left to right
                               (likely list of genotypes)
+    cluster_labels          = optional label image of the clusters, output of cluster_contours with
+                              cluster_labels=True (the cluster masks are then not redrawn from the contours)
 
     Returns:
     output_path             = array of paths to output images
@@ -37,6 +40,7 @@ def cluster_contour_splitimg(img, grouped_contour_indexes, contours, hierarchy,
     :param outdir: str
     :param file: str
     :param filenames: str
+    :param cluster_labels: numpy.ndarray
     :return output_path: str
     """
     params.device += 1
@@ -60,6 +64,8 @@ def cluster_contour_splitimg(img, grouped_contour_indexes, contours, hierarchy,
 
     # make sure the number of objects matches the namelist, and if not, remove the smallest grouped countor
     # removing contours is not ideal but the lists don't match there is a warning to check output
+    # Indexes of the clusters that are kept (in grouped_contour_indexes)
+    corrected_cluster_ids = list(range(0, len(grouped_contour_indexes)))
     if len(namelist) == len(grouped_contour_indexes):
         corrected_contour_indexes = grouped_contour_indexes
     elif len(namelist) < len(grouped_contour_indexes):
@@ -83,10 +89,12 @@ def cluster_contour_splitimg(img, grouped_contour_indexes, contours, hierarchy,
         rm_contour = lencontour[diff:]
         rm_contour = np.sort(rm_contour, order='group')
         corrected_contour_indexes = []
+        corrected_cluster_ids = []
 
         for x in rm_contour:
             index = x[2]
             corrected_contour_indexes.append(grouped_contour_indexes[index])
+            corrected_cluster_ids.append(index)
 
     elif len(namelist) > len(grouped_contour_indexes):
         print("Warning number of names is more than number of  grouped contours, double check output")
@@ -104,6 +112,7 @@ def cluster_contour_splitimg(img, grouped_contour_indexes, contours, hierarchy,
         group_names1.append(maskname)
 
     # split image
+    children = _contour_children(hierarchy, len(contours))
     output_path = []
     output_imgs = []
     output_masks = []
@@ -116,15 +125,18 @@ def cluster_contour_splitimg(img, grouped_contour_indexes, contours, hierarchy,
             savename = os.path.join(".", group_names[y])
             savename1 = os.path.join(".", group_names1[y])
         iy, ix = np.shape(img)[:2]
-        mask = np.zeros((iy, ix, 3), dtype=np.uint8)
         masked_img = np.copy(img)
-        for a in x:
-            if hierarchy[0][a][3] > -1:
-                cv2.drawContours(mask, contours, a, (0, 0, 0), -1, lineType=8, hierarchy=hierarchy)
-            else:
-                cv2.drawContours(mask, contours, a, (255, 255, 255), -1, lineType=8, hierarchy=hierarchy)
-
-        mask_binary = mask[:, :, 0]
+        if cluster_labels is not None:
+            # The cluster mask is the cluster label in the label image
+            mask_binary = np.where(cluster_labels == corrected_cluster_ids[y] + 1, 255, 0).astype(np.uint8)
+        else:
+            mask = np.zeros((iy, ix), dtype=np.uint8)
+            for a in x:
+                if hierarchy[0][a][3] > -1:
+                    _draw_filled_contour(mask, contours, children, a, 0)
+                else:
+                    _draw_filled_contour(mask, contours, children, a, 255)
+            mask_binary = mask
 
         if np.sum(mask_binary) != 0:
             retval, mask_binary = cv2.threshold(mask_binary, 254, 255, cv2.THRESH_BINARY)
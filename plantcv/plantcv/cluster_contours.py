@@ -6,7 +6,7 @@ from plantcv.plantcv import color_palette
 from plantcv.plantcv import params
 
 
-def cluster_contours(img, roi_objects, roi_obj_hierarchy, nrow=1, ncol=1, show_grid=False):
+def cluster_contours(img, roi_objects, roi_obj_hierarchy, nrow=1, ncol=1, show_grid=False, cluster_labels=False):
     """
     This function take a image with multiple contours and clusters them based on user input of rows and columns
 
@@ -19,10 +19,13 @@ def cluster_contours(img, roi_objects, roi_obj_hierarchy, nrow=1, ncol=1, show_g
     ncol                    = number of columns to cluster (this should be the approximate number of desired columns
                               in the entire image (even if there isn't a literal row of plants)
     show_grid               = if True then the grid will get plot to show how plants are being clustered
+    cluster_labels          = if True then a label image of the clusters is also returned
 
     Returns:
     grouped_contour_indexes = contours grouped
     contours                = All inputed contours
+    roi_obj_hierarchy       = object hierarchy
+    labels                  = label image of the clusters (cluster i has value i + 1), only if cluster_labels is True
 
     :param img: numpy.ndarray
     :param roi_objects: list
@@ -30,9 +33,11 @@ def cluster_contours(img, roi_objects, roi_obj_hierarchy, nrow=1, ncol=1, show_g
     :param nrow: int
     :param ncol: int
     :param show_grid: bool
+    :param cluster_labels: bool
     :return grouped_contour_indexes: list
     :return contours: list
     :return roi_obj_hierarchy: list
+    :return labels: numpy.ndarray
     """
     if len(np.shape(img)) == 3:
         iy, ix, iz = np.shape(img)
@@ -53,86 +58,186 @@ def cluster_contours(img, roi_objects, roi_obj_hierarchy, nrow=1, ncol=1, show_g
         cstep1 = int(cstep)
         cbreaks = range(0, ix, cstep1)
 
+    # Center of mass of each contour (contours with no area are not clustered)
+    index, cx, cy = _contour_centroids(roi_objects)
+
     # categorize what bin the center of mass of each contour
-    def digitize(a, step):
-        # The way cbreaks and rbreaks are calculated, step will never be an integer
-        # if isinstance(step, int):
-        #     i = step
-        # else:
-        num_bins = len(step)
-        for x in range(0, num_bins):
-            if x == 0:
-                if a >= 0 and a < step[1]:
-                    return 1
-            else:
-                if a >= step[x - 1] and a < step[x]:
-                    return x
-                if a >= np.max(step):
-                    return num_bins
-
-    dtype = [('cx', int), ('cy', int), ('rowbin', int), ('colbin', int), ('index', int)]
-    coord = []
-    for i in range(0, len(roi_objects)):
-        m = cv2.moments(roi_objects[i])
-        if m['m00'] != 0:
-            cx = int(m['m10'] / m['m00'])
-            cy = int(m['m01'] / m['m00'])
-            colbin = digitize(cx, cbreaks)
-            rowbin = digitize(cy, rbreaks)
-            a = (cx, cy, colbin, rowbin, i)
-            coord.append(a)
-    coord1 = np.array(coord, dtype=dtype)
-    coord2 = np.sort(coord1, order=('colbin', 'rowbin'))
-
-    # get the list of unique coordinates and group the contours with the same bin coordinates
-    groups = []
-    for i, y in enumerate(coord2):
-        col = y[3]
-        row = y[2]
-        location = str(row) + ',' + str(col)
-        groups.append(location)
-
-    unigroup = np.unique(groups)
-    coordgroups = []
-
-    for i, y in enumerate(unigroup):
-        col_row = y.split(',')
-        col = int(col_row[0])
-        row = int(col_row[1])
-        for a, b in enumerate(coord2):
-            if b[2] == col and b[3] == row:
-                grp = i
-                contour = b[4]
-                coordgroups.append((grp, contour))
-            else:
-                pass
-
-    coordlist = [[y[1] for y in coordgroups if y[0] == x] for x in range(0, (len(unigroup)))]
+    colbin = np.digitize(cx, cbreaks)
+    rowbin = np.digitize(cy, rbreaks)
+
+    # Sort the contours by row bin, column bin, center of mass and index
+    order = np.lexsort((index, cy, cx, colbin, rowbin))
+    index, colbin, rowbin = index[order], colbin[order], rowbin[order]
+
+    # Group the contours with the same bin coordinates
+    bin_pairs, group = np.unique(np.column_stack((colbin, rowbin)), axis=0, return_inverse=True)
+    # Groups are ordered by their "column,row" text label
+    group_rank = np.argsort(np.argsort([f"{c},{r}" for c, r in bin_pairs], kind="stable"))
+    group = group_rank[np.reshape(group, -1)]
+    # Contours stay in the sorted order within each group
+    members = np.argsort(group, kind="stable")
+    bounds = np.cumsum(np.bincount(group, minlength=len(bin_pairs)))[:-1]
+    coordlist = [grp.tolist() for grp in np.split(index[members], bounds)] if len(index) > 0 else []
 
     contours = roi_objects
     grouped_contour_indexes = coordlist
 
-    # Debug image is rainbow printed contours
-    if len(np.shape(img)) == 3:
-        img_copy = np.copy(img)
-    else:
-        iy, ix = np.shape(img)
-        img_copy = np.zeros((iy, ix, 3), dtype=np.uint8)
-
+    # Debug image is rainbow printed contours (the color scale is saved for other functions even if debug is off)
     rand_color = color_palette(len(coordlist))
-    for i, x in enumerate(coordlist):
-        for a in x:
-            if roi_obj_hierarchy[0][a][3] > -1:
-                pass
-            else:
-                cv2.drawContours(img_copy, roi_objects, a, rand_color[i], -1, hierarchy=roi_obj_hierarchy)
-    if show_grid:
-        for y in rbreaks:
-            cv2.line(img_copy, (0, y), (ix, y), (255, 0, 0), params.line_thickness)
-        for x in cbreaks:
-            cv2.line(img_copy, (x, 0), (x, iy), (255, 0, 0), params.line_thickness)
+    img_copy = None
+    if params.debug is not None:
+        if len(np.shape(img)) == 3:
+            img_copy = np.copy(img)
+        else:
+            iy, ix = np.shape(img)
+            img_copy = np.zeros((iy, ix, 3), dtype=np.uint8)
+
+        children = _contour_children(roi_obj_hierarchy, len(roi_objects))
+        for i, x in enumerate(coordlist):
+            for a in x:
+                if roi_obj_hierarchy[0][a][3] > -1:
+                    pass
+                else:
+                    _draw_filled_contour(img_copy, roi_objects, children, a, rand_color[i])
+        if show_grid:
+            for y in rbreaks:
+                cv2.line(img_copy, (0, y), (ix, y), (255, 0, 0), params.line_thickness)
+            for x in cbreaks:
+                cv2.line(img_copy, (x, 0), (x, iy), (255, 0, 0), params.line_thickness)
 
     _debug(visual=img_copy,  # keep this outside if statement to avoid additional test
            filename=os.path.join(params.debug_outdir, str(params.device) + '_clusters.png'))
 
+    if cluster_labels:
+        return grouped_contour_indexes, contours, roi_obj_hierarchy, _cluster_labels(
+            np.shape(img)[:2], grouped_contour_indexes, contours, roi_obj_hierarchy)
     return grouped_contour_indexes, contours, roi_obj_hierarchy
+
+
+def _contour_centroids(contours):
+    """Calculate the center of mass of contours, the same as with cv2.moments, for all contours at once.
+
+    Inputs:
+    contours = list of contours
+
+    Returns:
+    index    = indexes of the contours with an area
+    cx       = x-coordinates of the centers of mass (truncated to integers)
+    cy       = y-coordinates of the centers of mass (truncated to integers)
+
+    :param contours: list
+    :return index: numpy.ndarray
+    :return cx: numpy.ndarray
+    :return cy: numpy.ndarray
+    """
+    if len(contours) == 0 or not all(np.issubdtype(np.asarray(cnt).dtype, np.integer) for cnt in contours):
+        # Fall back to cv2.moments, e.g. for floating point contours
+        centroids = []
+        for i, cnt in enumerate(contours):
+            m = cv2.moments(cnt)
+            if m['m00'] != 0:
+                centroids.append((i, int(m['m10'] / m['m00']), int(m['m01'] / m['m00'])))
+        index, cx, cy = np.array(centroids, dtype=int).reshape(-1, 3).T
+        return index, cx, cy
+
+    # Green's theorem sums of all contours, exact in 64-bit integers
+    lengths = np.array([len(np.reshape(cnt, (-1, 2))) for cnt in contours])
+    points = np.concatenate([np.reshape(cnt, (-1, 2)) for cnt in contours]).astype(np.int64)
+    starts = np.cumsum(lengths) - lengths
+    # The previous point of each point, the last point of a contour is the previous point of its first point
+    previous = np.roll(points, 1, axis=0)
+    nonempty = lengths > 0
+    previous[starts[nonempty]] = points[(starts + lengths - 1)[nonempty]]
+    x, y = points[:, 0], points[:, 1]
+    x_1, y_1 = previous[:, 0], previous[:, 1]
+    dxy = x_1 * y - x * y_1
+    a00 = np.add.reduceat(dxy, starts[nonempty])
+    a10 = np.add.reduceat(dxy * (x_1 + x), starts[nonempty])
+    a01 = np.add.reduceat(dxy * (y_1 + y), starts[nonempty])
+    index = np.flatnonzero(nonempty)[a00 != 0]
+    a00, a10, a01 = (a.astype(np.float64)[a00 != 0] for a in (a00, a10, a01))
+    # Same floating point operations as cv2.moments
+    sign = np.where(a00 > 0, 1.0, -1.0)
+    m00 = a00 * (sign * 0.5)
+    m10 = a10 * (sign * 0.16666666666666666666666666666667)
+    m01 = a01 * (sign * 0.16666666666666666666666666666667)
+    return index, np.trunc(m10 / m00).astype(int), np.trunc(m01 / m00).astype(int)
+
+
+def _cluster_labels(shape, grouped_contour_indexes, contours, hierarchy):
+    """Make a label image of clustered contours.
+
+    Each cluster is drawn in turn, like the cluster masks of cluster_contour_splitimg: parent contours are filled with
+    the cluster label and child contours (holes) are filled with 0.
+
+    Inputs:
+    shape                   = shape of the image
+    grouped_contour_indexes = indexes of clusters of contours
+    contours                = list of contours
+    hierarchy               = contour hierarchy
+
+    Returns:
+    labels                  = label image, cluster i has value i + 1
+
+    :param shape: tuple
+    :param grouped_contour_indexes: list
+    :param contours: list
+    :param hierarchy: numpy.ndarray
+    :return labels: numpy.ndarray
+    """
+    labels = np.zeros(shape, dtype=np.int32)
+    children = _contour_children(hierarchy, len(contours))
+    for i, group in enumerate(grouped_contour_indexes):
+        for a in group:
+            value = 0 if hierarchy[0][a][3] > -1 else i + 1
+            _draw_filled_contour(labels, contours, children, a, value)
+    return labels
+
+
+def _contour_children(hierarchy, num_contours):
+    """List the child contours (holes) of each contour.
+
+    Inputs:
+    hierarchy    = contour hierarchy
+    num_contours = number of contours
+
+    Returns:
+    children     = list of child contour indexes of each contour
+
+    :param hierarchy: numpy.ndarray
+    :param num_contours: int
+    :return children: list
+    """
+    children = [[] for _ in range(num_contours)]
+    for i, parent in enumerate(np.reshape(hierarchy, (-1, 4))[:num_contours, 3]):
+        if parent > -1:
+            children[parent].append(i)
+    return children
+
+
+def _draw_filled_contour(img, contours, children, index, color):
+    """Fill a contour except for its holes, the same as cv2.drawContours with the hierarchy of all contours.
+
+    Only the contour and its children are passed to OpenCV, so drawing is not slowed down by the number of contours.
+
+    Inputs:
+    img      = image to draw on
+    contours = list of contours
+    children = list of child contour indexes of each contour, output of _contour_children
+    index    = index of the contour to draw
+    color    = fill color
+
+    :param img: numpy.ndarray
+    :param contours: list
+    :param children: list
+    :param index: int
+    :param color: tuple
+    """
+    holes = children[index]
+    num_holes = len(holes)
+    # Hierarchy of the contour (0) and its children (1 to num_holes): [next, previous, first child, parent]
+    local_hierarchy = [[-1, -1, 1 if num_holes > 0 else -1, -1]]
+    for i in range(1, num_holes + 1):
+        local_hierarchy.append([i + 1 if i < num_holes else -1, i - 1 if i > 1 else -1, -1, 0])
+    cv2.drawContours(img, [contours[index]] + [contours[k] for k in holes], 0, color, -1, lineType=8,
+                     hierarchy=np.array([local_hierarchy]))
@@ -26,15 +26,20 @@ def find_objects(img, mask):
     :return hierarchy: numpy.ndarray
     """
     mask1 = np.copy(mask)
-    ori_img = np.copy(img)
-    # If the reference image is grayscale convert it to color
-    if len(np.shape(ori_img)) == 2:
-        ori_img = cv2.cvtColor(ori_img, cv2.COLOR_GRAY2BGR)
     objects, hierarchy = cv2.findContours(mask1, cv2.RETR_TREE, cv2.CHAIN_APPROX_NONE)[-2:]
     # Cast tuple objects as a list
     objects = list(objects)
-    for i, cnt in enumerate(objects):
-        cv2.drawContours(ori_img, objects, i, (255, 102, 255), -1, lineType=8, hierarchy=hierarchy)
+
+    # The debugging image is only drawn when it is used
+    ori_img = None
+    if params.debug is not None:
+        ori_img = np.copy(img)
+        # If the reference image is grayscale convert it to color
+        if len(np.shape(ori_img)) == 2:
+            ori_img = cv2.cvtColor(ori_img, cv2.COLOR_GRAY2BGR)
+        # Each object is filled, including objects inside other objects
+        for cnt in objects:
+            cv2.drawContours(ori_img, [cnt], 0, (255, 102, 255), -1, lineType=8)
 
     _debug(visual=ori_img,
            filename=os.path.join(params.debug_outdir, str(params.device) + '_id_objects.png'))
@@ -0,0 +1,15 @@
+# Wait for images written in the background
+
+
+def flush_images():
+    """Wait for all images queued by print_image (params.debug_writer_threads > 0) to be written to files.
+
+    Raises an error if any of the queued images could not be written.
+
+    Inputs:
+    None
+
+    :return:
+    """
+    from plantcv.plantcv._image_writer import _writer
+    _writer.flush()
@@ -1,13 +1,21 @@
-from plantcv.plantcv.hyperspectral.read_data import _find_closest
-from plantcv.plantcv.hyperspectral.read_data import _make_pseudo_rgb
-from plantcv.plantcv.hyperspectral.read_data import read_data
-from plantcv.plantcv.hyperspectral.extract_wavelength import extract_wavelength
-from plantcv.plantcv.hyperspectral.analyze_index import analyze_index
-from plantcv.plantcv.hyperspectral.analyze_spectral import analyze_spectral
-from plantcv.plantcv.hyperspectral.calibrate import calibrate
-from plantcv.plantcv.hyperspectral._avg_reflectance import _avg_reflectance
-from plantcv.plantcv.hyperspectral._inverse_covariance import _inverse_covariance
+from plantcv.plantcv._lazy_loader import _lazy_load
+
+# Functions are imported on first access, public name: (submodule, attribute)
+_lazy_load(__name__, {
+    "_find_closest": ("read_data", "_find_closest"),
+    "_make_pseudo_rgb": ("read_data", "_make_pseudo_rgb"),
+    "read_data": ("read_data", "read_data"),
+    "extract_wavelength": ("extract_wavelength", "extract_wavelength"),
+    "analyze_index": ("analyze_index", "analyze_index"),
+    "analyze_spectral": ("analyze_spectral", "analyze_spectral"),
+    "calibrate": ("calibrate", "calibrate"),
+    "_avg_reflectance": ("_avg_reflectance", "_avg_reflectance"),
+    "_inverse_covariance": ("_inverse_covariance", "_inverse_covariance"),
+    "_covariance": ("_inverse_covariance", "_covariance"),
+    "_masked_stats": ("_masked_stats", "_masked_stats"),
+})
 
 # add new functions to end of lists
 __all__ = ["read_data", "_find_closest", "analyze_spectral", "analyze_index", "calibrate",
-           "_make_pseudo_rgb", "extract_wavelength", "_avg_reflectance", "_inverse_covariance"]
+           "_make_pseudo_rgb", "extract_wavelength", "_avg_reflectance", "_inverse_covariance",
+           "_masked_stats", "_covariance"]
@@ -1,6 +1,6 @@
 # Calculate masked average background reflectance
 
-import numpy as np
+from plantcv.plantcv.hyperspectral._masked_stats import _masked_stats
 
 
 def _avg_reflectance(spectral_data, mask):
@@ -19,18 +19,7 @@ def _avg_reflectance(spectral_data, mask):
     :param mask: numpy.ndarray
     :return spectral_array: __main__.Spectral_data
     """
-    # Initialize list of average reflectance values
-    avg_r = []
-
-    # For each band in a hyperspectral datacube mask and take the average
-    for i in range(0, len(spectral_data.wavelength_dict)):
-        band = spectral_data.array_data[:, :, [i]]
-        band_reshape = np.transpose(np.transpose(band)[0])
-        masked_band = band_reshape[np.where(mask > 0)]
-        band_avg = np.average(masked_band)
-        avg_r.append(band_avg)
-
-    # Convert into array object rather than list
-    avg_r = np.asarray(avg_r)
+    # Per-band means of the masked pixels, calculated in blocks of lines
+    avg_r = _masked_stats(spectral_data=spectral_data, mask=mask, median=False)["mean"]
 
     return avg_r
@@ -3,24 +3,80 @@
 import numpy as np
 
 
-def _inverse_covariance(spectral_array):
+def _covariance(spectral_array, mask=None, subsample=1, chunk_size=2 ** 26):
+    """Calculate the band covariance matrix of a hyperspectral datacube.
+    The sums of the (shifted) pixel values and of their outer products are accumulated in float64 over blocks of lines,
+    so the (n_pixels x n_bands) matrix of the datacube is never created and memory-mapped data are not loaded at once.
+
+    Inputs:
+    spectral_array      = Hyperspectral data instance
+    mask                = Optional binary mask, only masked pixels are used (default: None, all pixels are used)
+    subsample           = Only use every nth line and every nth sample (default: 1, all pixels are used)
+    chunk_size          = Approximate number of bytes of float64 data processed per block of lines (default: 64 MB)
+
+    Returns:
+    covariance          = Band covariance matrix of a hyperspectral datacube
+
+    :param spectral_array: __main__.Spectral_data
+    :param mask: numpy.ndarray
+    :param subsample: int
+    :param chunk_size: int
+    :return covariance: numpy.ndarray
+    """
+    hsi_img = spectral_array.array_data
+    n_lines, n_samples, n_band = hsi_img.shape
+    subsample = max(1, int(subsample))
+
+    # Number of (subsampled) lines read per block
+    lines_per_chunk = max(1, chunk_size // max(1, n_samples * n_band * np.dtype(np.float64).itemsize))
+    step = lines_per_chunk * subsample
+
+    n_pixels = 0
+    shift = None
+    sums = np.zeros(n_band)
+    products = np.zeros((n_band, n_band))
+    for start in range(0, n_lines, step):
+        pixels = hsi_img[start:start + step:subsample, ::subsample]
+        if mask is not None:
+            pixels = pixels[np.nonzero(mask[start:start + step:subsample, ::subsample] > 0)]
+        pixels = np.reshape(pixels, (-1, n_band)).astype(np.float64)
+        if pixels.shape[0] == 0:
+            continue
+        # Values are shifted by the mean of the first block to limit cancellation in the sums of products
+        if shift is None:
+            shift = pixels.mean(axis=0)
+        pixels -= shift
+        n_pixels += pixels.shape[0]
+        sums += pixels.sum(axis=0)
+        products += pixels.T @ pixels
+
+    # Unbiased covariance, as calculated by np.cov
+    with np.errstate(divide="ignore", invalid="ignore"):
+        covariance = (products - np.outer(sums, sums) / n_pixels) / (n_pixels - 1)
+
+    return covariance
+
+
+def _inverse_covariance(spectral_array, mask=None, subsample=1, chunk_size=2 ** 26):
     """Calculate the inverse covariance matrix of a hyperspectral datacube.
     Used in various GatorSense hyperspectral tools (https://github.com/GatorSense/hsi_toolkit_py)
 
     Inputs:
     spectral_array      = Hyperspectral data instance
+    mask                = Optional binary mask, only masked pixels are used (default: None, all pixels are used)
+    subsample           = Only use every nth line and every nth sample (default: 1, all pixels are used)
+    chunk_size          = Approximate number of bytes of float64 data processed per block of lines (default: 64 MB)
 
     Returns:
     inverse_covariance  = Inverse covariance matrix of a hyperspectral datacube
 
     :param spectral_array: __main__.Spectral_data
+    :param mask: numpy.ndarray
+    :param subsample: int
+    :param chunk_size: int
     :return inverse_covariance: numpy array
     """
-    hsi_img = spectral_array.array_data
-
-    n_lines, n_samples, n_band = hsi_img.shape
-    n_pixels = n_lines * n_samples
-    hsi_data = np.reshape(hsi_img, (n_pixels, n_band), order='F').T
-    inverse_covariance = np.linalg.pinv(np.cov(hsi_data.T, rowvar=False))
+    covariance = _covariance(spectral_array=spectral_array, mask=mask, subsample=subsample, chunk_size=chunk_size)
+    inverse_covariance = np.linalg.pinv(covariance)
 
     return inverse_covariance
@@ -0,0 +1,151 @@
+# Calculate masked reflectance statistics of hyperspectral data from blocks of lines
+
+import numpy as np
+
+
+def _rank_value(hist, rank, low, width, exact):
+    """Find the value at a rank (0-based position in sorted order) of histogram binned data.
+
+    Inputs:
+    hist   = Histogram counts
+    rank   = Rank of the value
+    low    = Lower edge of the first bin
+    width  = Bin width
+    exact  = True if each bin holds a single integer value
+
+    Returns:
+    value  = Value at the rank, linearly interpolated within the bin if the bins are not exact
+
+    :param hist: numpy.ndarray
+    :param rank: int
+    :param low: float
+    :param width: float
+    :param exact: bool
+    :return value: float
+    """
+    cumulative = np.cumsum(hist)
+    idx = int(np.searchsorted(cumulative, rank, side="right"))
+    if exact:
+        return float(low + idx)
+    before = cumulative[idx - 1] if idx > 0 else 0
+    return float(low + (idx + (rank - before + 0.5) / hist[idx]) * width)
+
+
+def _masked_blocks(array_data, mask, lines_per_chunk):
+    """Read the masked pixels of a datacube, one block of lines at a time.
+
+    Lines without masked pixels are not read.
+
+    Inputs:
+    array_data      = Datacube (lines, samples, bands)
+    mask            = Binary mask
+    lines_per_chunk = Number of lines per block
+
+    Returns:
+    pixels          = Generator of the masked pixels of each block, shape (pixels, bands)
+
+    :param array_data: numpy.ndarray
+    :param mask: numpy.ndarray
+    :param lines_per_chunk: int
+    :return pixels: generator
+    """
+    for start in range(0, array_data.shape[0], lines_per_chunk):
+        rows = mask[start:start + lines_per_chunk] > 0
+        if rows.any():
+            yield array_data[start:start + lines_per_chunk][np.nonzero(rows)]
+
+
+def _masked_stats(spectral_data, mask, median=True, chunk_size=2 ** 26, bins=2 ** 16):
+    """Calculate per-band and global reflectance statistics of the masked pixels of a hyperspectral data instance.
+
+    The datacube is read in blocks of lines, and only lines that contain masked pixels are read, so memory-mapped data
+    are never loaded at once. Per-band means and variances are combined across blocks with Welford's (Chan's) method.
+    The global median of the finite values is estimated from a histogram: it is exact for 8-bit and 16-bit integer
+    data and otherwise interpolated within one of `bins` bins spanning the min and max masked values, which takes a
+    second pass over the masked lines.
+
+    Inputs:
+    spectral_data = Hyperspectral data instance
+    mask          = Binary mask
+    median        = If False the global median is not estimated (skips building the histogram) (default: True)
+    chunk_size    = Approximate number of bytes read per block of lines (default: 64 MB)
+    bins          = Number of histogram bins used to estimate the median of non-integer data (default: 65536)
+
+    Returns:
+    stats         = Dictionary of per-band statistics (count, mean, var, std, min, max arrays) and global statistics
+                    of all masked values (global_mean, global_std, global_median)
+
+    :param spectral_data: __main__.Spectral_data
+    :param mask: numpy.ndarray
+    :param median: bool
+    :param chunk_size: int
+    :param bins: int
+    :return stats: dict
+    """
+    array_data = spectral_data.array_data
+    nbands = array_data.shape[2]
+    lines_per_chunk = max(1, chunk_size // max(1, array_data[0].nbytes))
+
+    # Histogram of all values, integer data are binned with one bin per value in the first pass
+    exact = np.issubdtype(array_data.dtype, np.integer) and array_data.dtype.itemsize <= 2
+    if median and exact:
+        low, width = np.iinfo(array_data.dtype).min, 1.0
+        hist = np.zeros(np.iinfo(array_data.dtype).max - low + 1, dtype=np.int64)
+    # Range of the finite masked values, used to bin non-integer data in the second pass
+    finite_min, finite_max = np.inf, -np.inf
+
+    count = 0
+    mean = np.zeros(nbands)
+    m2 = np.zeros(nbands)
+    band_max = np.full(nbands, np.nan)
+    band_min = np.full(nbands, np.nan)
+    for pixels in _masked_blocks(array_data=array_data, mask=mask, lines_per_chunk=lines_per_chunk):
+        block_count = pixels.shape[0]
+        values = pixels.astype(np.float64)
+        block_mean = values.mean(axis=0)
+        block_m2 = ((values - block_mean) ** 2).sum(axis=0)
+        # Combine the block mean and sum of squared differences with the running values
+        total = count + block_count
+        delta = block_mean - mean
+        mean += delta * block_count / total
+        m2 += block_m2 + delta ** 2 * count * block_count / total
+        count = total
+        band_max = np.fmax(band_max, pixels.max(axis=0))
+        band_min = np.fmin(band_min, pixels.min(axis=0))
+        if median:
+            if exact:
+                hist += np.bincount(pixels.ravel().astype(np.int64) - low, minlength=len(hist))
+            else:
+                finite = np.isfinite(values)
+                finite_min = min(finite_min, values.min(where=finite, initial=np.inf))
+                finite_max = max(finite_max, values.max(where=finite, initial=-np.inf))
+
+    if median and not exact and finite_min <= finite_max:
+        # Second pass: histogram of the finite masked values between their min and max
+        low = finite_min
+        width = (finite_max - finite_min) / bins
+        if not width > 0:
+            width = 1.0
+        hist = np.zeros(bins, dtype=np.int64)
+        for pixels in _masked_blocks(array_data=array_data, mask=mask, lines_per_chunk=lines_per_chunk):
+            values = pixels.astype(np.float64).ravel()
+            values = values[np.isfinite(values)]
+            # The max value is on the upper edge of the last bin
+            idx = np.minimum(((values - low) / width).astype(np.int64), bins - 1)
+            hist += np.bincount(idx, minlength=bins)
+
+    var = m2 / count if count > 0 else np.full(nbands, np.nan)
+    stats = {"count": count, "mean": mean if count > 0 else np.full(nbands, np.nan), "var": var, "std": np.sqrt(var),
+             "max": band_max, "min": band_min}
+
+    # Every band has the same number of values, so the global statistics are combined from the band statistics
+    stats["global_mean"] = float(np.mean(stats["mean"]))
+    stats["global_std"] = float(np.sqrt(np.mean(var) + np.mean((stats["mean"] - stats["global_mean"]) ** 2)))
+    stats["global_median"] = float("nan")
+    if median and count > 0 and (exact or finite_min <= finite_max):
+        # The median is the mean of the middle value(s)
+        nvalues = int(hist.sum())
+        stats["global_median"] = (_rank_value(hist, (nvalues - 1) // 2, low, width, exact) +
+                                  _rank_value(hist, nvalues // 2, low, width, exact)) / 2
+
+    return stats
@@ -6,6 +6,8 @@ import pandas as pd
 from plantcv.plantcv import deprecation_warning, params
 from plantcv.plantcv import outputs
 from plantcv.plantcv._debug import _debug
+from plantcv.plantcv._lazy_figure import LazyFigure
+from plantcv.plantcv.hyperspectral._masked_stats import _masked_stats
 from plotnine import ggplot, aes, geom_line, scale_x_continuous
 
 
@@ -33,16 +35,9 @@ def analyze_spectral(array, mask, histplot=None, label="default"):
         deprecation_warning("'histplot' will be deprecated in a future version of PlantCV. "
                             "Instead of a histogram this function plots the mean of spectra in the masked area.")
 
-    array_data = array.array_data
-
-    # List of wavelengths recorded created from parsing the header file will be string, make list of floats
-    wavelength_data = array_data[np.where(mask > 0)]
-
-    # Calculate mean reflectance across wavelengths
-    wavelength_means = wavelength_data.mean(axis=0)
-    max_per_band = wavelength_data.max(axis=0)
-    min_per_band = wavelength_data.min(axis=0)
-    std_per_band = wavelength_data.std(axis=0)
+    # Per-band and global reflectance statistics of the masked pixels, calculated from blocks of the datacube
+    stats = _masked_stats(spectral_data=array, mask=mask)
+    wavelength_means = stats["mean"]
 
     # Identify smallest and largest wavelengths available to scale the x-axis
     min_wavelength = array.min_wavelength
@@ -58,15 +53,15 @@ def analyze_spectral(array, mask, histplot=None, label="default"):
 
     for i, wavelength in enumerate(array.wavelength_dict):
         new_wavelengths.append(wavelength)
-        band_averages.append((wavelength_means[i]).astype(float))
-        new_std_per_band.append(std_per_band[i].astype(float))
-        new_max_per_band.append(max_per_band[i].astype(float))
-        new_min_per_band.append(min_per_band[i].astype(float))
+        band_averages.append(float(wavelength_means[i]))
+        new_std_per_band.append(float(stats["std"][i]))
+        new_max_per_band.append(float(stats["max"][i]))
+        new_min_per_band.append(float(stats["min"][i]))
 
-    # Calculate reflectance statistics
-    avg_reflectance = np.average(wavelength_data)
-    std_reflectance = np.std(wavelength_data)
-    median_reflectance = np.median(wavelength_data)
+    # Reflectance statistics of all masked values
+    avg_reflectance = stats["global_mean"]
+    std_reflectance = stats["global_std"]
+    median_reflectance = stats["global_median"]
 
     wavelength_labels = []
     for i in array.wavelength_dict.keys():
@@ -96,17 +91,44 @@ def analyze_spectral(array, mask, histplot=None, label="default"):
                             method='plantcv.plantcv.hyperspectral.analyze_spectral', scale='None', datatype=list,
                             value=new_std_per_band, label=wavelength_labels)
 
-    dataset = pd.DataFrame({'Wavelength (' + array.wavelength_units + ')': new_wavelengths,
-                            'Reflectance': wavelength_means})
-    mean_spectra = (ggplot(data=dataset,
-                    mapping=aes(x='Wavelength (' + array.wavelength_units + ')', y='Reflectance'))
-                    + geom_line(color='purple')
-                    + scale_x_continuous(breaks=list(range(int(np.floor(min_wavelength)),
-                                                           int(np.ceil(max_wavelength)), 50)))
-                    )
+    # The mean spectra figure is only made when it is used
+    mean_spectra = LazyFigure(_mean_spectra_fig, wavelengths=new_wavelengths, wavelength_means=wavelength_means,
+                              wavelength_units=array.wavelength_units, min_wavelength=min_wavelength,
+                              max_wavelength=max_wavelength)
 
     analysis_img = mean_spectra
 
     _debug(visual=mean_spectra, filename=os.path.join(params.debug_outdir, str(params.device) + "_mean_spectra.png"))
 
     return analysis_img
+
+
+def _mean_spectra_fig(wavelengths, wavelength_means, wavelength_units, min_wavelength, max_wavelength):
+    """Make the mean spectra figure.
+
+    Inputs:
+    wavelengths      = List of wavelengths
+    wavelength_means = Mean reflectance of each wavelength
+    wavelength_units = Wavelength units
+    min_wavelength   = Smallest wavelength
+    max_wavelength   = Largest wavelength
+
+    Returns:
+    mean_spectra     = Mean spectra figure
+
+    :param wavelengths: list
+    :param wavelength_means: numpy.ndarray
+    :param wavelength_units: str
+    :param min_wavelength: float
+    :param max_wavelength: float
+    :return mean_spectra: plotnine.ggplot.ggplot
+    """
+    dataset = pd.DataFrame({'Wavelength (' + wavelength_units + ')': wavelengths,
+                            'Reflectance': wavelength_means})
+    mean_spectra = (ggplot(data=dataset,
+                    mapping=aes(x='Wavelength (' + wavelength_units + ')', y='Reflectance'))
+                    + geom_line(color='purple')
+                    + scale_x_continuous(breaks=list(range(int(np.floor(min_wavelength)),
+                                                           int(np.ceil(max_wavelength)), 50)))
+                    )
+    return mean_spectra
@@ -1,20 +1,68 @@
 # Calibrate hyperspectral image data
 
 import os
+import sys
 import numpy as np
 from plantcv.plantcv import params
+from plantcv.plantcv import fatal_error
 from plantcv.plantcv._debug import _debug
 from plantcv.plantcv import Spectral_data
-from plantcv.plantcv.hyperspectral.read_data import _make_pseudo_rgb
 
+# Output data types and their ENVI data type codes
+_ENVI_DTYPES = {"float64": 5, "float32": 4, "uint16": 12}
+# Reflectance scale factor of calibrated values stored as unsigned 16-bit integers
+_UINT16_SCALE = 65535
 
-def calibrate(raw_data, white_reference, dark_reference):
+
+def _write_envi_header(hdr_file, spectral_array, dtype, scale=None):
+    """Write an ENVI header file for a band interleaved by pixel (BIP) datacube.
+
+    Inputs:
+    hdr_file       = Header file path/name
+    spectral_array = Hyperspectral data instance
+    dtype          = Output data type name
+    scale          = Reflectance scale factor, or None if the values are not scaled
+
+    :param hdr_file: str
+    :param spectral_array: __main__.Spectral_data
+    :param dtype: str
+    :param scale: int
+    """
+    lines, samples, bands = spectral_array.array_data.shape
+    # Wavelengths are written in band order
+    wavelengths = [str(wl) for wl, _ in sorted(spectral_array.wavelength_dict.items(), key=lambda item: item[1])]
+    header = ["ENVI",
+              "description = {PlantCV calibrated hyperspectral data}",
+              f"samples = {samples}",
+              f"lines = {lines}",
+              f"bands = {bands}",
+              "header offset = 0",
+              "file type = ENVI Standard",
+              f"data type = {_ENVI_DTYPES[dtype]}",
+              "interleave = bip",
+              f"byte order = {0 if sys.byteorder == 'little' else 1}",
+              f"wavelength units = {spectral_array.wavelength_units}"]
+    if spectral_array.default_bands is not None:
+        header.append("default bands = {" + ",".join(map(str, spectral_array.default_bands)) + "}")
+    if scale is not None:
+        header.append(f"reflectance scale factor = {scale}")
+    header.append("wavelength = {" + ",".join(wavelengths) + "}")
+    with open(hdr_file, "w") as fp:
+        fp.write("\n".join(header) + "\n")
+
+
+def calibrate(raw_data, white_reference, dark_reference, dtype="float64", output_file=None, chunk_size=2 ** 26):
     """This function allows you calibrate raw hyperspectral image data with white and dark reference data.
 
     Inputs:
     raw_data        = Raw image 'Spectral_data' class instance
     white_reference = White reference 'Spectral_data' class instance
     dark_reference  = Dark reference 'Spectral_data' class instance
+    dtype           = Data type of the calibrated values, either "float64", "float32", or "uint16" (reflectance scaled
+                      to 0-65535) (default: "float64")
+    output_file     = Optional ENVI data file that the calibrated datacube is written to (as a memory-mapped, band
+                      interleaved by pixel file with a matching .hdr file) instead of memory (default: None)
+    chunk_size      = Approximate number of bytes of raw data calibrated per block of lines (default: 64 MB)
 
     Returns:
     calibrated      = Calibrated hyperspectral image
@@ -22,39 +70,76 @@ def calibrate(raw_data, white_reference, dark_reference):
     :param raw_data: __main__.Spectral_data
     :param white_reference: __main__.Spectral_data
     :param dark_reference: __main__.Spectral_data
+    :param dtype: str
+    :param output_file: str
+    :param chunk_size: int
     :return calibrated: __main__.Spectral_data
     """
+    if dtype not in _ENVI_DTYPES:
+        fatal_error(f"Data type {dtype} is not supported. Use 'float64', 'float32', or 'uint16'")
+
     # Average dark reference over the first axis (repeated line scans) -> float64
     # Converts the input shape from (y, x, z) to (1, x, z)
-    dark = np.mean(dark_reference.array_data, axis=0, keepdims=True)
+    dark = np.mean(dark_reference.array_data, axis=0, keepdims=True, dtype=np.float64)
 
     # Average white reference over the first axis (repeated line scans) -> float64
     # Converts the input shape from (y, x, z) to (1, x, z)
-    white = np.mean(white_reference.array_data, axis=0, keepdims=True)
-
-    # Convert the raw data to float64
-    raw = raw_data.array_data.astype("float64")
+    white = np.mean(white_reference.array_data, axis=0, keepdims=True, dtype=np.float64)
+    white_dark = white - dark
 
-    # Calibrate using reflectance = (raw data - dark reference) / (white reference - dark reference)
-    # Note that dark and white are broadcast over each line (y) in raw
-    cal = (raw - dark) / (white - dark)
+    raw = raw_data.array_data
+    interleave = raw_data.interleave
+    filename = raw_data.filename
+    if output_file is None:
+        cal = np.empty(raw.shape, dtype=dtype)
+    else:
+        # The calibrated datacube is written to a band interleaved by pixel (y, x, z) file
+        cal = np.memmap(output_file, dtype=dtype, mode="w+", shape=raw.shape)
+        interleave = "BIP"
+        filename = output_file
 
-    # Clip the calibrated values to the range 0 - 1
-    np.clip(cal, a_min=0, a_max=1, out=cal)
+    # Calibrate blocks of lines so that only one block of float64 values is in memory at a time
+    lines_per_chunk = max(1, chunk_size // max(1, raw[0].size * np.dtype(np.float64).itemsize))
+    max_value = None
+    min_value = None
+    for start in range(0, raw.shape[0], lines_per_chunk):
+        # Convert the raw data to float64
+        block = raw[start:start + lines_per_chunk].astype(np.float64)
+        # Calibrate using reflectance = (raw data - dark reference) / (white reference - dark reference)
+        # Note that dark and white are broadcast over each line (y) in raw
+        block -= dark
+        block /= white_dark
+        # Clip the calibrated values to the range 0 - 1
+        np.clip(block, a_min=0, a_max=1, out=block)
+        if dtype == "uint16":
+            # Undefined reflectance values (white reference equal to dark reference) are stored as 0
+            np.nan_to_num(block, copy=False)
+            block *= _UINT16_SCALE
+            np.rint(block, out=block)
+        cal[start:start + lines_per_chunk] = block
+        # Update the min and max values of the stored data
+        block_max = np.amax(cal[start:start + lines_per_chunk])
+        block_min = np.amin(cal[start:start + lines_per_chunk])
+        max_value = block_max if max_value is None else np.maximum(max_value, block_max)
+        min_value = block_min if min_value is None else np.minimum(min_value, block_min)
 
     # Make a new class instance with the calibrated hyperspectral image
+    # The pseudo-rgb image is created when it is first used
     calibrated = Spectral_data(array_data=cal, max_wavelength=raw_data.max_wavelength, min_wavelength=raw_data.min_wavelength,
-                               max_value=np.amax(cal), min_value=np.amin(cal), d_type=cal.dtype,
+                               max_value=max_value, min_value=min_value, d_type=cal.dtype,
                                wavelength_dict=raw_data.wavelength_dict, samples=raw_data.samples, lines=raw_data.lines,
-                               interleave=raw_data.interleave, wavelength_units=raw_data.wavelength_units,
-                               array_type=raw_data.array_type, pseudo_rgb=None, filename=raw_data.filename,
+                               interleave=interleave, wavelength_units=raw_data.wavelength_units,
+                               array_type=raw_data.array_type, pseudo_rgb=None, filename=filename,
                                default_bands=raw_data.default_bands)
 
-    # Make pseudo-rgb image for the calibrated image
-    calibrated.pseudo_rgb = _make_pseudo_rgb(spectral_array=calibrated)
+    if output_file is not None:
+        cal.flush()
+        _write_envi_header(hdr_file=os.path.splitext(output_file)[0] + ".hdr", spectral_array=calibrated, dtype=dtype,
+                           scale=_UINT16_SCALE if dtype == "uint16" else None)
 
     # Debug visualization
-    _debug(visual=calibrated.pseudo_rgb,
-           filename=os.path.join(params.debug_outdir, str(params.device) + '_calibrated_rgb.png'))
+    if params.debug is not None:
+        _debug(visual=calibrated.pseudo_rgb,
+               filename=os.path.join(params.debug_outdir, str(params.device) + '_calibrated_rgb.png'))
 
     return calibrated
@@ -5,7 +5,6 @@ import numpy as np
 from plantcv.plantcv import params
 from plantcv.plantcv._debug import _debug
 from plantcv.plantcv import Spectral_data
-from plantcv.plantcv.hyperspectral.read_data import _find_closest
 
 
 def extract_wavelength(spectral_data, wavelength):
@@ -22,11 +21,8 @@ def extract_wavelength(spectral_data, wavelength):
     :param wavelength: float
     :return index_array: __main__.Spectral_data
     """
-    # Make a list of all keys which are the wavelengths
-    all_wavelengths = spectral_data.wavelength_dict.keys()
-
     # Find index of the band with the closest wavelengths
-    band_index = _find_closest(np.array([float(i) for i in all_wavelengths]), wavelength)
+    band_index = spectral_data._band_index(wavelength)
 
     # Print which wavelength will be used
     wl_dict = spectral_data.wavelength_dict
@@ -61,9 +61,9 @@ def _make_pseudo_rgb(spectral_array):
         min_wavelength = min([float(i) for i in wl_keys])
         # Check range of available wavelength
         if max_wavelength >= 635 and min_wavelength <= 490:
-            id_red = _find_closest(spectral_array=np.array([float(i) for i in wl_keys]), target=710)
-            id_green = _find_closest(spectral_array=np.array([float(i) for i in wl_keys]), target=540)
-            id_blue = _find_closest(spectral_array=np.array([float(i) for i in wl_keys]), target=480)
+            id_red = spectral_array._band_index(710)
+            id_green = spectral_array._band_index(540)
+            id_blue = spectral_array._band_index(480)
 
             pseudo_rgb = cv2.merge((array_data[:, :, [id_blue]],
                                     array_data[:, :, [id_green]],
@@ -118,15 +118,18 @@ def _find_hdr(filename):
     return None
 
 
-def read_data(filename):
+def read_data(filename, memmap=False):
     """Read hyperspectral image data from file.
     Inputs:
     filename          = Name of image file
+    memmap            = If True, the datacube is memory-mapped instead of read into memory, so that only the bands
+                        and pixels that are used are read from disk (default: False)
 
     Returns:
     spectral_array    = Hyperspectral data instance
 
     :param filename: str
+    :param memmap: bool
     :return spectral_array: __main__.Spectral_data
     """
     # Initialize dictionary
@@ -180,9 +183,6 @@ def read_data(filename):
                   "9": np.complex128, "12": np.uint16, "13": np.uint32, "14": np.int64, "15": np.uint64}
     header_dict["datatype"] = dtype_dict[header_dict["datatype"]]
 
-    # Read in the data from the file
-    raw_data = np.fromfile(filename, header_dict["datatype"], -1)
-
     # Reshape the raw data into a datacube array
     data_format = {
         # Band Interleaved by Line (BIL)
@@ -213,6 +213,14 @@ def read_data(filename):
     if interleave_type not in data_format:
         fatal_error(f"Interleave type {interleave_type} is not supported.")
 
+    if memmap:
+        # Memory-map the data file (copy-on-write, changes to the array are never written to the file)
+        raw_data = np.memmap(filename, dtype=header_dict["datatype"], mode="c",
+                             shape=data_format[interleave_type]["reshape"])
+    else:
+        # Read in the data from the file
+        raw_data = np.fromfile(filename, header_dict["datatype"], -1)
+
     # Reshape raw data into a data cube
     array_data = raw_data.reshape(data_format[interleave_type]["reshape"]
                                   ).transpose(data_format[interleave_type]["transpose"])
@@ -224,29 +232,25 @@ def read_data(filename):
         header_dict["defaultbands"] = header_dict["defaultbands"].replace("}", "")
         default_bands = header_dict["defaultbands"].split(",")
 
-    # Find array min and max values
-    max_pixel = float(np.amax(array_data))
-    min_pixel = float(np.amin(array_data))
-
     wavelength_units = header_dict.get("wavelengthunits")
     if wavelength_units is None:
         wavelength_units = "nm"
 
-        # Create an instance of the spectral_data class
+    # Create an instance of the spectral_data class
+    # The array min and max values and the pseudo-rgb image are calculated when they are first used
     spectral_array = Spectral_data(array_data=array_data,
                                    max_wavelength=float(str(header_dict["wavelength"][-1]).rstrip()),
                                    min_wavelength=float(str(header_dict["wavelength"][0]).rstrip()),
-                                   max_value=max_pixel, min_value=min_pixel,
+                                   max_value=None, min_value=None,
                                    d_type=header_dict["datatype"],
                                    wavelength_dict=wavelength_dict, samples=int(header_dict["samples"]),
                                    lines=int(header_dict["lines"]), interleave=header_dict["interleave"],
                                    wavelength_units=wavelength_units, array_type="datacube",
                                    pseudo_rgb=None, filename=filename, default_bands=default_bands)
 
-    # Make pseudo-rgb image and replace it inside the class instance object
-    pseudo_rgb = _make_pseudo_rgb(spectral_array)
-    spectral_array.pseudo_rgb = pseudo_rgb
-
-    _debug(visual=pseudo_rgb, filename=os.path.join(params.debug_outdir, str(params.device) + "_pseudo_rgb.png"))
+    # Only make the pseudo-rgb image of a memory-mapped datacube now if it is needed for debugging
+    if not memmap or params.debug is not None:
+        _debug(visual=spectral_array.pseudo_rgb,
+               filename=os.path.join(params.debug_outdir, str(params.device) + "_pseudo_rgb.png"))
 
     return spectral_array
@@ -1,21 +1,26 @@
-from plantcv.plantcv.morphology.find_branch_pts import find_branch_pts
-from plantcv.plantcv.morphology.find_tips import find_tips
-from plantcv.plantcv.morphology._iterative_prune import _iterative_prune
-from plantcv.plantcv.morphology.segment_skeleton import segment_skeleton
-from plantcv.plantcv.morphology.segment_sort import segment_sort
-from plantcv.plantcv.morphology.prune import prune
-from plantcv.plantcv.morphology.skeletonize import skeletonize
-from plantcv.plantcv.morphology.check_cycles import check_cycles
-from plantcv.plantcv.morphology.segment_angle import segment_angle
-from plantcv.plantcv.morphology.segment_path_length import segment_path_length
-from plantcv.plantcv.morphology.segment_euclidean_length import segment_euclidean_length
-from plantcv.plantcv.morphology.segment_curvature import segment_curvature
-from plantcv.plantcv.morphology.segment_tangent_angle import segment_tangent_angle
-from plantcv.plantcv.morphology.segment_id import segment_id
-from plantcv.plantcv.morphology.segment_insertion_angle import segment_insertion_angle
-from plantcv.plantcv.morphology.segment_combine import segment_combine
-from plantcv.plantcv.morphology.analyze_stem import analyze_stem
-from plantcv.plantcv.morphology.fill_segments import fill_segments
+from plantcv.plantcv._lazy_loader import _lazy_load
+
+# Functions are imported on first access, public name: (submodule, attribute)
+_lazy_load(__name__, {
+    "find_branch_pts": ("find_branch_pts", "find_branch_pts"),
+    "find_tips": ("find_tips", "find_tips"),
+    "_iterative_prune": ("_iterative_prune", "_iterative_prune"),
+    "segment_skeleton": ("segment_skeleton", "segment_skeleton"),
+    "segment_sort": ("segment_sort", "segment_sort"),
+    "prune": ("prune", "prune"),
+    "skeletonize": ("skeletonize", "skeletonize"),
+    "check_cycles": ("check_cycles", "check_cycles"),
+    "segment_angle": ("segment_angle", "segment_angle"),
+    "segment_path_length": ("segment_path_length", "segment_path_length"),
+    "segment_euclidean_length": ("segment_euclidean_length", "segment_euclidean_length"),
+    "segment_curvature": ("segment_curvature", "segment_curvature"),
+    "segment_tangent_angle": ("segment_tangent_angle", "segment_tangent_angle"),
+    "segment_id": ("segment_id", "segment_id"),
+    "segment_insertion_angle": ("segment_insertion_angle", "segment_insertion_angle"),
+    "segment_combine": ("segment_combine", "segment_combine"),
+    "analyze_stem": ("analyze_stem", "analyze_stem"),
+    "fill_segments": ("fill_segments", "fill_segments"),
+})
 
 __all__ = ["find_branch_pts", "find_tips", "prune", "skeletonize", "check_cycles", "segment_skeleton", "segment_angle",
            "segment_path_length", "segment_euclidean_length", "segment_curvature", "segment_sort", "segment_id",
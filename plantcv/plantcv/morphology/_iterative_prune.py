@@ -1,15 +1,14 @@
-import cv2
 import numpy as np
-from plantcv.plantcv import params
-from plantcv.plantcv import find_objects
-from plantcv.plantcv import image_subtract
-from plantcv.plantcv.morphology import find_tips
+from plantcv.plantcv.morphology._skeleton_lut import _NEIGHBORS, _TIP_LUT, _neighborhood_codes
 
 
 def _iterative_prune(skel_img, size):
     """Iteratively remove endpoints (tips) from a skeletonized image.
     The pruning algorithm was inspired by Jean-Patrick Pommier: https://gist.github.com/jeanpat/5712699
     "Prunes" barbs off a skeleton.
+    Each iteration removes the tips (find_tips) of the skeleton left by the previous iteration. Only the neighbors of
+    removed tips can become new tips, so the tips are traced along the skeleton instead of searched for in the whole
+    image each iteration.
     Inputs:
     skel_img    = Skeletonized image
     size        = Size to get pruned off each branch
@@ -20,30 +19,38 @@ def _iterative_prune(skel_img, size):
     :return pruned_img: numpy.ndarray
     """
     pruned_img = skel_img.copy()
-    # Store debug
-    debug = params.debug
-    params.debug = None
-
-    # Check to see if the skeleton has multiple objects
-    objects, _ = find_objects(pruned_img, pruned_img)
-
-    # Iteratively remove endpoints (tips) from a skeleton
-    for i in range(0, size):
-        endpoints = find_tips(pruned_img)
-        pruned_img = image_subtract(pruned_img, endpoints)
-
-    # Make debugging image
-    pruned_plot = np.zeros(skel_img.shape[:2], np.uint8)
-    pruned_plot = cv2.cvtColor(pruned_plot, cv2.COLOR_GRAY2RGB)
-    skel_obj, skel_hierarchy = find_objects(skel_img, skel_img)
-    pruned_obj, pruned_hierarchy = find_objects(pruned_img, pruned_img)
-
-    # Reset debug mode
-    params.debug = debug
-
-    cv2.drawContours(pruned_plot, skel_obj, -1, (0, 0, 255), params.line_thickness,
-                     lineType=8, hierarchy=skel_hierarchy)
-    cv2.drawContours(pruned_plot, pruned_obj, -1, (255, 255, 255), params.line_thickness,
-                     lineType=8, hierarchy=pruned_hierarchy)
+    # Skeleton and neighborhood codes, padded so that the neighbors of every pixel are in the arrays
+    skel = np.pad(skel_img > 0, 1)
+    codes = np.pad(_neighborhood_codes(skel_img > 0), 1)
+
+    # Tips of the skeleton, (row, column) positions in the padded arrays
+    ys, xs = np.nonzero(_TIP_LUT[codes] & skel)
+    for _ in range(0, size):
+        if len(ys) == 0:
+            break
+        # Remove the tips
+        skel[ys, xs] = False
+        codes[ys, xs] = 0
+        # The removed tips are no longer neighbors of the pixels around them
+        around_y = []
+        around_x = []
+        for n, (dy, dx) in enumerate(_NEIGHBORS):
+            # The neighbor in direction n of a tip has the tip as its neighbor in the opposite direction
+            codes[ys + dy, xs + dx] &= np.uint16(~(1 << ((n + 4) % 8)) & 0xFFFF)
+            around_y.append(ys + dy)
+            around_x.append(xs + dx)
+        around_y = np.concatenate(around_y)
+        around_x = np.concatenate(around_x)
+        # Skeleton pixels next to removed tips are the only pixels that can be tips of the next iteration
+        on_skel = skel[around_y, around_x]
+        candidates = np.unique(np.ravel_multi_index((around_y[on_skel], around_x[on_skel]), skel.shape))
+        ys, xs = np.unravel_index(candidates, skel.shape)
+        is_tip = _TIP_LUT[codes[ys, xs]]
+        ys, xs = ys[is_tip], xs[is_tip]
+
+    pruned_img[~skel[1:-1, 1:-1]] = 0
+    if size > 0:
+        # Like image_subtract, the pruned image is 8-bit
+        pruned_img = pruned_img.astype(np.uint8)
 
     return pruned_img
@@ -0,0 +1,170 @@
+# Lookup tables for skeleton tips and branch points, and per-segment drawing helpers
+
+import cv2
+import numpy as np
+
+
+# Offsets (row, column) of the 8 neighbors of a pixel, the n-th neighbor sets bit n of the neighborhood code if it is
+# part of the skeleton, and bit n + 8 if it is outside the image
+_NEIGHBORS = ((-1, -1), (-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1))
+
+
+def _hitmiss_lut(kernels):
+    """Make a lookup table of the neighborhood codes that match any of a list of hit-or-miss kernels.
+
+    Inputs:
+    kernels = List of 3x3 hit-or-miss kernels (1 = foreground, -1 = background, 0 = don't care)
+
+    Returns:
+    lut     = Boolean lookup table indexed by neighborhood code (65536 values)
+
+    :param kernels: list
+    :return lut: numpy.ndarray
+    """
+    codes = np.arange(2 ** 16)
+    lut = np.zeros(2 ** 16, dtype=bool)
+    for kernel in kernels:
+        # Bits of the neighbors that must be skeleton (hit) and background (miss)
+        hit = sum(1 << n for n, (dy, dx) in enumerate(_NEIGHBORS) if kernel[dy + 1, dx + 1] == 1)
+        miss = sum(1 << n for n, (dy, dx) in enumerate(_NEIGHBORS) if kernel[dy + 1, dx + 1] == -1)
+        # Like cv2.MORPH_HITMISS, pixels outside the image match neither 1 nor -1
+        lut |= ((codes & hit) == hit) & ((codes & (miss | miss << 8)) == 0)
+    return lut
+
+
+def _rotations(kernel):
+    """Return a hit-or-miss kernel and its three 90 degree rotations."""
+    return [np.rot90(kernel, k) for k in range(4)]
+
+
+# In a kernel: 1 values line up with 255s, -1s line up with 0s, and 0s correspond to don't care
+# The endpoints algorithm was inspired by Jean-Patrick Pommier: https://gist.github.com/jeanpat/5712699
+_TIP_KERNELS = (_rotations(np.array([[-1, -1, -1],
+                                     [-1, 1, -1],
+                                     [0, 1, 0]])) +
+                _rotations(np.array([[-1, -1, -1],
+                                     [-1, 1, 0],
+                                     [-1, 0, 1]])))
+# T like branch points
+_BRANCH_PT_KERNELS = (_rotations(np.array([[-1, 1, -1],
+                                           [1, 1, 1],
+                                           [-1, -1, -1]])) +
+                      _rotations(np.array([[1, -1, 1],
+                                           [-1, 1, -1],
+                                           [1, -1, -1]])) +
+                      # Y like branch points
+                      _rotations(np.array([[1, -1, 1],
+                                           [0, 1, 0],
+                                           [0, 1, 0]])) +
+                      _rotations(np.array([[-1, 1, -1],
+                                           [1, 1, 0],
+                                           [-1, 0, 1]])))
+_TIP_LUT = _hitmiss_lut(_TIP_KERNELS)
+_BRANCH_PT_LUT = _hitmiss_lut(_BRANCH_PT_KERNELS)
+
+
+def _neighborhood_codes(skel):
+    """Encode the 8-neighborhood of each skeleton pixel as a 16-bit code.
+
+    Pixels that are not part of the skeleton get the code 0.
+
+    Inputs:
+    skel  = Boolean skeleton image
+
+    Returns:
+    codes = Neighborhood code of each pixel
+
+    :param skel: numpy.ndarray
+    :return codes: numpy.ndarray
+    """
+    h, w = skel.shape
+    padded = np.pad(skel, 1).astype(np.uint16)
+    outside = np.pad(np.zeros((h, w), dtype=np.uint16), 1, constant_values=1)
+    codes = np.zeros((h, w), dtype=np.uint16)
+    for n, (dy, dx) in enumerate(_NEIGHBORS):
+        codes |= padded[1 + dy:1 + dy + h, 1 + dx:1 + dx + w] << n
+        codes |= outside[1 + dy:1 + dy + h, 1 + dx:1 + dx + w] << (n + 8)
+    codes[~skel] = 0
+    return codes
+
+
+def _find_tips(skel_img):
+    """Find the tips (endpoints) of a skeleton, identical to the hit-or-miss transform with the endpoint kernels.
+
+    Inputs:
+    skel_img = Skeletonized image
+
+    Returns:
+    tip_img  = Image with just tips, rest 0
+
+    :param skel_img: numpy.ndarray
+    :return tip_img: numpy.ndarray
+    """
+    skel = skel_img > 0
+    return (_TIP_LUT[_neighborhood_codes(skel)] & skel).astype(np.uint8) * 255
+
+
+def _find_branch_pts(skel_img):
+    """Find the branch points of a skeleton, identical to the hit-or-miss transform with the branch point kernels.
+
+    Inputs:
+    skel_img       = Skeletonized image
+
+    Returns:
+    branch_pts_img = Image with just branch points, rest 0
+
+    :param skel_img: numpy.ndarray
+    :return branch_pts_img: numpy.ndarray
+    """
+    skel = skel_img > 0
+    return (_BRANCH_PT_LUT[_neighborhood_codes(skel)] & skel).astype(np.uint8) * 255
+
+
+def _draw_segment(cnt, shape):
+    """Draw a segment contour (1 pixel wide) on the part of an image that holds it.
+
+    The part of the image includes one background pixel around the segment, unless the segment is on the image border.
+
+    Inputs:
+    cnt    = Segment contour
+    shape  = Shape of the full size image
+
+    Returns:
+    img    = Part of the image with the segment drawn
+    offset = (x, y) position of the part in the full size image
+
+    :param cnt: numpy.ndarray
+    :param shape: tuple
+    :return img: numpy.ndarray
+    :return offset: tuple
+    """
+    x, y, w, h = cv2.boundingRect(cnt)
+    x0, y0 = max(x - 1, 0), max(y - 1, 0)
+    x1, y1 = min(x + w + 1, shape[1]), min(y + h + 1, shape[0])
+    img = np.zeros((y1 - y0, x1 - x0), np.uint8)
+    cv2.drawContours(img, [cnt], 0, 255, 1, lineType=8, offset=(-x0, -y0))
+    return img, (x0, y0)
+
+
+def _segment_tips(cnt, shape):
+    """Find the tips of a single segment contour.
+
+    The tips are the same objects, in the same order, as find_objects of find_tips of the segment drawn on a full size
+    image.
+
+    Inputs:
+    cnt         = Segment contour
+    shape       = Shape of the full size image
+
+    Returns:
+    tip_objects = List of tip contours
+
+    :param cnt: numpy.ndarray
+    :param shape: tuple
+    :return tip_objects: list
+    """
+    segment_img, offset = _draw_segment(cnt, shape)
+    tips = _find_tips(segment_img)
+    tip_objects, _ = cv2.findContours(tips, cv2.RETR_TREE, cv2.CHAIN_APPROX_NONE, offset=offset)[-2:]
+    return list(tip_objects)
+
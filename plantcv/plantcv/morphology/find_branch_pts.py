@@ -2,12 +2,12 @@
 
 import os
 import cv2
-import numpy as np
 from plantcv.plantcv import params
 from plantcv.plantcv import dilate
 from plantcv.plantcv import outputs
 from plantcv.plantcv import find_objects
 from plantcv.plantcv._debug import _debug
+from plantcv.plantcv.morphology._skeleton_lut import _find_branch_pts
 
 
 def find_branch_pts(skel_img, mask=None, label="default"):
@@ -27,45 +27,8 @@ def find_branch_pts(skel_img, mask=None, label="default"):
     :param label: str
     :return branch_pts_img: numpy.ndarray
     """
-    # In a kernel: 1 values line up with 255s, -1s line up with 0s, and 0s correspond to don't care
-    # T like branch points
-    t1 = np.array([[-1, 1, -1],
-                   [1, 1, 1],
-                   [-1, -1, -1]])
-    t2 = np.array([[1, -1, 1],
-                   [-1, 1, -1],
-                   [1, -1, -1]])
-    t3 = np.rot90(t1)
-    t4 = np.rot90(t2)
-    t5 = np.rot90(t3)
-    t6 = np.rot90(t4)
-    t7 = np.rot90(t5)
-    t8 = np.rot90(t6)
-
-    # Y like branch points
-    y1 = np.array([[1, -1, 1],
-                   [0, 1, 0],
-                   [0, 1, 0]])
-    y2 = np.array([[-1, 1, -1],
-                   [1, 1, 0],
-                   [-1, 0, 1]])
-    y3 = np.rot90(y1)
-    y4 = np.rot90(y2)
-    y5 = np.rot90(y3)
-    y6 = np.rot90(y4)
-    y7 = np.rot90(y5)
-    y8 = np.rot90(y6)
-    kernels = [t1, t2, t3, t4, t5, t6, t7, t8, y1, y2, y3, y4, y5, y6, y7, y8]
-
-    branch_pts_img = np.zeros(skel_img.shape[:2], dtype=int)
-
-    # Store branch points
-    for kernel in kernels:
-        branch_pts_img = np.logical_or(cv2.morphologyEx(skel_img, op=cv2.MORPH_HITMISS, kernel=kernel,
-                                                        borderType=cv2.BORDER_CONSTANT, borderValue=0), branch_pts_img)
-
-    # Switch type to uint8 rather than bool
-    branch_pts_img = branch_pts_img.astype(np.uint8) * 255
+    # Hit-or-miss transform with the T and Y like branch point kernels, in one pass over the image
+    branch_pts_img = _find_branch_pts(skel_img)
 
     # Store debug
     debug = params.debug
@@ -2,12 +2,12 @@
 
 import os
 import cv2
-import numpy as np
 from plantcv.plantcv import params
 from plantcv.plantcv import dilate
 from plantcv.plantcv import outputs
 from plantcv.plantcv import find_objects
 from plantcv.plantcv._debug import _debug
+from plantcv.plantcv.morphology._skeleton_lut import _find_tips
 
 
 def find_tips(skel_img, mask=None, label="default"):
@@ -27,27 +27,8 @@ def find_tips(skel_img, mask=None, label="default"):
     :param label: str
     :return tip_img: numpy.ndarray
     """
-    # In a kernel: 1 values line up with 255s, -1s line up with 0s, and 0s correspond to dont care
-    endpoint1 = np.array([[-1, -1, -1],
-                          [-1, 1, -1],
-                          [0, 1,  0]])
-    endpoint2 = np.array([[-1, -1, -1],
-                          [-1, 1, 0],
-                          [-1, 0, 1]])
-
-    endpoint3 = np.rot90(endpoint1)
-    endpoint4 = np.rot90(endpoint2)
-    endpoint5 = np.rot90(endpoint3)
-    endpoint6 = np.rot90(endpoint4)
-    endpoint7 = np.rot90(endpoint5)
-    endpoint8 = np.rot90(endpoint6)
-
-    endpoints = [endpoint1, endpoint2, endpoint3, endpoint4, endpoint5, endpoint6, endpoint7, endpoint8]
-    tip_img = np.zeros(skel_img.shape[:2], dtype=int)
-    for endpoint in endpoints:
-        tip_img = np.logical_or(cv2.morphologyEx(skel_img, op=cv2.MORPH_HITMISS, kernel=endpoint,
-                                                 borderType=cv2.BORDER_CONSTANT, borderValue=0), tip_img)
-    tip_img = tip_img.astype(np.uint8) * 255
+    # Hit-or-miss transform with the endpoint kernels, in one pass over the image
+    tip_img = _find_tips(skel_img)
     # Store debug
     debug = params.debug
     params.debug = None
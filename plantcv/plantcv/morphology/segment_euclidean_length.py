@@ -2,14 +2,12 @@
 
 import os
 import cv2
-import numpy as np
 from plantcv.plantcv import params
 from plantcv.plantcv import outputs
 from plantcv.plantcv import fatal_error
-from plantcv.plantcv import find_objects
 from plantcv.plantcv import color_palette
 from plantcv.plantcv._debug import _debug
-from plantcv.plantcv.morphology import find_tips
+from plantcv.plantcv.morphology._skeleton_lut import _segment_tips
 from scipy.spatial.distance import euclidean
 
 
@@ -45,11 +43,8 @@ def segment_euclidean_length(segmented_img, objects, label="default"):
         x_list.append(objects[i][0][0][0])
         y_list.append(objects[i][0][0][1])
 
-        # Draw segments one by one to group segment tips together
-        finding_tips_img = np.zeros(segmented_img.shape[:2], np.uint8)
-        cv2.drawContours(finding_tips_img, objects, i, (255, 255, 255), 1, lineType=8)
-        segment_tips = find_tips(finding_tips_img)
-        tip_objects, tip_hierarchies = find_objects(segment_tips, segment_tips)
+        # Draw segments one by one (on the part of the image that holds each) to group segment tips together
+        tip_objects = _segment_tips(cnt, segmented_img.shape[:2])
         points = []
         if not len(tip_objects) == 2:
             fatal_error("Too many tips found per segment, try pruning again")
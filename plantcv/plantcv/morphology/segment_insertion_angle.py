@@ -7,7 +7,6 @@ from plantcv.plantcv import params
 from plantcv.plantcv import dilate
 from plantcv.plantcv import closing
 from plantcv.plantcv import outputs
-from plantcv.plantcv import logical_and
 from plantcv.plantcv import fatal_error
 from plantcv.plantcv import find_objects
 from plantcv.plantcv import color_palette
@@ -15,6 +14,7 @@ from plantcv.plantcv.morphology import _iterative_prune
 from plantcv.plantcv.morphology import find_tips
 from plantcv.plantcv.morphology.segment_tangent_angle import _slope_to_intesect_angle
 from plantcv.plantcv._debug import _debug
+from plantcv.plantcv.morphology._skeleton_lut import _draw_segment
 
 
 def segment_insertion_angle(skel_img, segmented_img, leaf_objects, stem_objects, size, label="default"):
@@ -66,16 +66,16 @@ def segment_insertion_angle(skel_img, segmented_img, leaf_objects, stem_objects,
         tip_tuples.append((cnt[0][0][0], cnt[0][0][1]))
 
     for i, cnt in enumerate(leaf_objects):
-        # Draw leaf objects
-        find_segment_tangents = np.zeros(segmented_img.shape[:2], np.uint8)
-        cv2.drawContours(find_segment_tangents, leaf_objects, i, 255, 1, lineType=8)
+        # Draw leaf objects on the part of the image that holds each
+        find_segment_tangents, offset = _draw_segment(cnt, segmented_img.shape[:2])
 
         # Prune back ends of leaves
         pruned_segment = _iterative_prune(find_segment_tangents, size)
 
         # Segment ends are the portions pruned off
         segment_ends = find_segment_tangents - pruned_segment
-        segment_end_obj, segment_end_hierarchy = find_objects(segment_ends, segment_ends)
+        segment_end_obj, segment_end_hierarchy = cv2.findContours(segment_ends, cv2.RETR_TREE,
+                                                                  cv2.CHAIN_APPROX_NONE, offset=offset)[-2:]
 
         if not len(segment_end_obj) == 2:
             print("Size too large, contour with ID#", i, "got pruned away completely.")
@@ -88,10 +88,10 @@ def segment_insertion_angle(skel_img, segmented_img, leaf_objects, stem_objects,
             # Determine if a segment is leaf end or leaf insertion segment
             for j, obj in enumerate(segment_end_obj):
 
-                segment_plot = np.zeros(segmented_img.shape[:2], np.uint8)
-                cv2.drawContours(segment_plot, obj, -1, 255, 1, lineType=8)
-                segment_plot = dilate(segment_plot, 3, 1)
-                overlap_img = logical_and(segment_plot, tips)
+                segment_plot, (x, y) = _draw_segment(obj, segmented_img.shape[:2])
+                segment_plot = cv2.dilate(segment_plot, np.ones((3, 3), np.uint8))
+                h, w = segment_plot.shape
+                overlap_img = np.logical_and(segment_plot, tips[y:y + h, x:x + w])
 
                 # If none of the tips are within a segment_end then it's an insertion segment
                 if np.sum(overlap_img) == 0:
@@ -106,7 +106,7 @@ def segment_insertion_angle(skel_img, segmented_img, leaf_objects, stem_objects,
     rand_color = color_palette(num=len(valid_segment), saved=True)
 
     for i, cnt in enumerate(valid_segment):
-        cv2.drawContours(labeled_img, valid_segment, i, rand_color[i], params.line_thickness, lineType=8)
+        cv2.drawContours(labeled_img, [cnt], 0, rand_color[i], params.line_thickness, lineType=8)
 
     # Plot stem segments
     stem_img = np.zeros(segmented_img.shape[:2], np.uint8)
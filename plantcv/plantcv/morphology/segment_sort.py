@@ -5,9 +5,9 @@ import cv2
 import numpy as np
 from plantcv.plantcv import dilate
 from plantcv.plantcv import params
-from plantcv.plantcv import logical_and
 from plantcv.plantcv.morphology import find_tips
 from plantcv.plantcv._debug import _debug
+from plantcv.plantcv.morphology._skeleton_lut import _draw_segment
 
 
 def segment_sort(skel_img, objects, mask=None, first_stem=True):
@@ -48,9 +48,10 @@ def segment_sort(skel_img, objects, mask=None, first_stem=True):
 
     # Loop through segment contours
     for i, cnt in enumerate(objects):
-        segment_plot = np.zeros(skel_img.shape[:2], np.uint8)
-        cv2.drawContours(segment_plot, objects, i, 255, 1, lineType=8)
-        overlap_img = logical_and(segment_plot, tips_img)
+        # Draw the segment on the part of the image that holds it
+        segment_plot, (x, y) = _draw_segment(cnt, skel_img.shape[:2])
+        h, w = segment_plot.shape
+        overlap_img = np.logical_and(segment_plot, tips_img[y:y + h, x:x + w])
 
         # The first contour is the base, and while it contains a tip, it isn't a leaf
         if i == 0 and first_stem:
@@ -69,10 +70,8 @@ def segment_sort(skel_img, objects, mask=None, first_stem=True):
 
     # Plot segments where green segments are leaf objects and fuschia are other objects
     labeled_img = cv2.cvtColor(labeled_img, cv2.COLOR_GRAY2RGB)
-    for i, cnt in enumerate(primary_objects):
-        cv2.drawContours(labeled_img, primary_objects, i, (255, 0, 255), params.line_thickness, lineType=8)
-    for i, cnt in enumerate(secondary_objects):
-        cv2.drawContours(labeled_img, secondary_objects, i, (0, 255, 0), params.line_thickness, lineType=8)
+    cv2.drawContours(labeled_img, primary_objects, -1, (255, 0, 255), params.line_thickness, lineType=8)
+    cv2.drawContours(labeled_img, secondary_objects, -1, (0, 255, 0), params.line_thickness, lineType=8)
 
     _debug(visual=labeled_img, filename=os.path.join(params.debug_outdir, f"{params.device}_sorted_segments.png"))
 
@@ -6,10 +6,10 @@ import numpy as np
 import pandas as pd
 from plantcv.plantcv import params
 from plantcv.plantcv import outputs
-from plantcv.plantcv import find_objects
 from plantcv.plantcv import color_palette
 from plantcv.plantcv.morphology import _iterative_prune
 from plantcv.plantcv._debug import _debug
+from plantcv.plantcv.morphology._skeleton_lut import _draw_segment
 
 
 def _slope_to_intesect_angle(m1, m2):
@@ -63,12 +63,13 @@ def segment_tangent_angle(segmented_img, objects, size, label="default"):
     rand_color = color_palette(num=len(objects), saved=True)
 
     for i, cnt in enumerate(objects):
-        find_tangents = np.zeros(segmented_img.shape[:2], np.uint8)
-        cv2.drawContours(find_tangents, objects, i, 255, 1, lineType=8)
-        cv2.drawContours(labeled_img, objects, i, rand_color[i], params.line_thickness, lineType=8)
+        # Draw the segment on the part of the image that holds it
+        find_tangents, offset = _draw_segment(cnt, segmented_img.shape[:2])
+        cv2.drawContours(labeled_img, [cnt], 0, rand_color[i], params.line_thickness, lineType=8)
         pruned_segment = _iterative_prune(find_tangents, size)
         segment_ends = find_tangents - pruned_segment
-        segment_end_obj, segment_end_hierarchy = find_objects(segment_ends, segment_ends)
+        segment_end_obj, segment_end_hierarchy = cv2.findContours(segment_ends, cv2.RETR_TREE, cv2.CHAIN_APPROX_NONE,
+                                                                  offset=offset)[-2:]
         slopes = []
         for j, obj in enumerate(segment_end_obj):
             # Find bounds for regression lines to get drawn
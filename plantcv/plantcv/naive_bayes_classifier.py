@@ -1,14 +1,18 @@
 # Classify pixels as plant or non-plant using the naive Bayes method written by Arash Abbasi,
 # adapted for Python by Noah Fahlgren
 
-import cv2
 import numpy as np
 import os
 from plantcv.plantcv._debug import _debug
+from plantcv.plantcv._channel_bundle import _channel_bundle
 from plantcv.plantcv import fatal_error
 from plantcv.plantcv import params
 
 
+# Parsed PDF files, keyed by file path and modification time
+_pdf_cache = {}
+
+
 def naive_bayes_classifier(rgb_img, pdf_file):
     """
     Use the Naive Bayes classifier to output a plant binary mask.
@@ -24,60 +28,35 @@ def naive_bayes_classifier(rgb_img, pdf_file):
     :param pdf_file: str
     :return masks: dict
     """
-    # Initialize PDF dictionary
-    pdfs = {}
-    # Read the PDF file
-    pf = open(pdf_file, "r")
-    # Read the first line (header)
-    pf.readline()
-    # Read each line of the file and parse the PDFs, store in the PDF dictionary
-    for row in pf:
-        # Remove newline character
-        row = row.rstrip("\n")
-        # Split the row into columns on tab characters
-        cols = row.split("\t")
-        # Make sure there are the correct number of columns (i.e. is this a valid PDF file?)
-        if len(cols) != 258:
-            fatal_error("Naive Bayes PDF file is not formatted correctly. Error on line:\n" + row)
-        # Store the PDFs. Column 0 is the class, Column 1 is the color channel, the rest are p at
-        # intensity values 0-255. Cast text p values as float
-        class_name = cols[0]
-        channel = cols[1]
-        if class_name not in pdfs:
-            pdfs[class_name] = {}
-        pdfs[class_name][channel] = [float(i) for i in cols[2:]]
-
-    # Split the input BGR image into component channels for BGR, HSV, and LAB colorspaces
-    h, s, v = cv2.split(cv2.cvtColor(rgb_img, cv2.COLOR_BGR2HSV))
+    # Read the PDF file (cached)
+    pdfs = _read_pdf_file(pdf_file)
+
+    # Split the input BGR image into HSV channels (shared with other functions using the same image)
+    hsv = _channel_bundle(rgb_img).hsv
+    h, s, v = hsv[:, :, 0], hsv[:, :, 1], hsv[:, :, 2]
 
     # Calculate the dimensions of the input image
     width, height, depth = np.shape(rgb_img)
 
-    # Initialize an empty ndarray for plant and background. These will be used to store the joint probabilities
-    px_p = {}
-    for class_name in pdfs.keys():
-        px_p[class_name] = np.zeros([width, height])
+    # Track the highest and second-highest joint probability of each pixel and the class with the highest probability
+    best_p = np.full([width, height], -np.inf)
+    second_p = np.full([width, height], -np.inf)
+    best_class = np.zeros([width, height], dtype=np.intp)
+    for i, class_name in enumerate(pdfs.keys()):
+        # Calculate the joint probability that each pixel is in the class using the PDFs as lookup tables
+        px_p = pdfs[class_name]["hue"][h] * pdfs[class_name]["saturation"][s] * pdfs[class_name]["value"][v]
+        higher = px_p > best_p
+        second_p = np.where(higher, best_p, np.maximum(second_p, px_p))
+        best_p = np.where(higher, px_p, best_p)
+        best_class[higher] = i
 
-    # Loop over the image coordinates (each i, j pixel)
-    for i in range(0, width):
-        for j in range(0, height):
-            for class_name in pdfs.keys():
-                # Calculate the joint probability that this is in the class
-                px_p[class_name][i][j] = pdfs[class_name]["hue"][h[i][j]] * pdfs[class_name]["saturation"][s[i][j]] * \
-                    pdfs[class_name]["value"][v[i][j]]
-
-    # Initialize empty masks
+    # Set pixel intensities to 255 (white) for the mask where the class has the highest probability
+    # Pixels where two or more classes tie for the highest probability are not assigned to any class
+    assigned = best_p > second_p
     masks = {}
-    for class_name in pdfs.keys():
+    for i, class_name in enumerate(pdfs.keys()):
         masks[class_name] = np.zeros([width, height], dtype=np.uint8)
-    # Set pixel intensities to 255 (white) for the mask where the class has the highest probability
-    for class_name in masks:
-        background_classes = []
-        for name in masks:
-            if class_name is not name:
-                background_classes.append(px_p[name])
-        background_class = np.maximum.reduce(background_classes)
-        masks[class_name][np.where(px_p[class_name] > background_class)] = 255
+        masks[class_name][assigned & (best_class == i)] = 255
 
     # Print or plot the mask if debug is not None
     for class_name, mask in masks.items():
@@ -85,3 +64,46 @@ def naive_bayes_classifier(rgb_img, pdf_file):
                cmap='gray')
 
     return masks
+
+
+def _read_pdf_file(pdf_file):
+    """Read a naive Bayes PDF file into lookup tables, caching the result until the file changes.
+
+    Inputs:
+    pdf_file = filename of file containing PDFs output from the Naive Bayes training method (see plantcv-train.py)
+
+    Returns:
+    pdfs     = Dictionary of classes, each a dictionary of channel PDFs (lookup tables indexed by intensity value)
+
+    :param pdf_file: str
+    :return pdfs: dict
+    """
+    key = (os.path.abspath(pdf_file), os.path.getmtime(pdf_file))
+    if key in _pdf_cache:
+        return _pdf_cache[key]
+
+    # Initialize PDF dictionary
+    pdfs = {}
+    # Read the PDF file
+    with open(pdf_file, "r") as pf:
+        # Read the first line (header)
+        pf.readline()
+        # Read each line of the file and parse the PDFs, store in the PDF dictionary
+        for row in pf:
+            # Remove newline character
+            row = row.rstrip("\n")
+            # Split the row into columns on tab characters
+            cols = row.split("\t")
+            # Make sure there are the correct number of columns (i.e. is this a valid PDF file?)
+            if len(cols) != 258:
+                fatal_error("Naive Bayes PDF file is not formatted correctly. Error on line:\n" + row)
+            # Store the PDFs. Column 0 is the class, Column 1 is the color channel, the rest are p at
+            # intensity values 0-255. Cast text p values as float
+            class_name = cols[0]
+            channel = cols[1]
+            if class_name not in pdfs:
+                pdfs[class_name] = {}
+            pdfs[class_name][channel] = np.array([float(i) for i in cols[2:]], dtype=np.float64)
+
+    _pdf_cache[key] = pdfs
+    return pdfs
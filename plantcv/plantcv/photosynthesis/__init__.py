@@ -1,5 +1,10 @@
-from plantcv.plantcv.photosynthesis.read_cropreporter import read_cropreporter
-from plantcv.plantcv.photosynthesis.analyze_fvfm import analyze_fvfm
+from plantcv.plantcv._lazy_loader import _lazy_load
+
+# Functions are imported on first access, public name: (submodule, attribute)
+_lazy_load(__name__, {
+    "read_cropreporter": ("read_cropreporter", "read_cropreporter"),
+    "analyze_fvfm": ("analyze_fvfm", "analyze_fvfm"),
+})
 
 
 __all__ = ["read_cropreporter", "analyze_fvfm"]
@@ -10,6 +10,7 @@ from plantcv.plantcv import plot_image
 from plantcv.plantcv import fatal_error
 from plantcv.plantcv import params
 from plantcv.plantcv import outputs
+from plantcv.plantcv._lazy_figure import LazyFigure
 
 
 def analyze_fvfm(fdark, fmin, fmax, mask, bins=256, label="default"):
@@ -79,13 +80,8 @@ def analyze_fvfm(fdark, fmin, fmax, mask, bins=256, label="default"):
     # Calculate which non-zero bin has the maximum Fv/Fm value
     max_bin = midpoints[np.argmax(fvfm_hist)]
 
-    # Create a dataframe
-    dataset = pd.DataFrame({'Plant Pixels': fvfm_hist, 'Fv/Fm': midpoints})
-    # Make the histogram figure using plotnine
-    fvfm_hist_fig = (ggplot(data=dataset, mapping=aes(x='Fv/Fm', y='Plant Pixels'))
-                     + geom_line(color='green', show_legend=True)
-                     + geom_label(label='Peak Bin Value: ' + str(max_bin),
-                                  x=.15, y=205, size=8, color='green'))
+    # The histogram figure is only made when it is used
+    fvfm_hist_fig = LazyFigure(_fvfm_hist_fig, fvfm_hist=fvfm_hist, midpoints=midpoints, max_bin=max_bin)
     analysis_images.append(fvfm_hist_fig)
 
     if params.debug == 'print':
@@ -116,3 +112,29 @@ def analyze_fvfm(fdark, fmin, fmax, mask, bins=256, label="default"):
     outputs.images.append(analysis_images)
 
     return analysis_images
+
+
+def _fvfm_hist_fig(fvfm_hist, midpoints, max_bin):
+    """Make the Fv/Fm histogram figure.
+
+    Inputs:
+    fvfm_hist     = Histogram of Fv/Fm values
+    midpoints     = Histogram bin midpoints
+    max_bin       = Midpoint of the bin with the most pixels
+
+    Returns:
+    fvfm_hist_fig = Fv/Fm histogram figure
+
+    :param fvfm_hist: numpy.ndarray
+    :param midpoints: numpy.ndarray
+    :param max_bin: float
+    :return fvfm_hist_fig: plotnine.ggplot.ggplot
+    """
+    # Create a dataframe
+    dataset = pd.DataFrame({'Plant Pixels': fvfm_hist, 'Fv/Fm': midpoints})
+    # Make the histogram figure using plotnine
+    fvfm_hist_fig = (ggplot(data=dataset, mapping=aes(x='Fv/Fm', y='Plant Pixels'))
+                     + geom_line(color='green', show_legend=True)
+                     + geom_label(label='Peak Bin Value: ' + str(max_bin),
+                                  x=.15, y=205, size=8, color='green'))
+    return fvfm_hist_fig
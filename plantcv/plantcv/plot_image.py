@@ -13,6 +13,10 @@ def plot_image(img, cmap=None):
     :param cmap: str
     :return:
     """
+    # Make figures that are only made when they are first used (plantcv.plantcv._lazy_figure.LazyFigure)
+    if hasattr(img, "_build_figure"):
+        img._build_figure()
+
     image_type = type(img)
 
     dimensions = numpy.shape(img)
@@ -1,4 +1,5 @@
 # Print image to file
+import os
 import cv2
 import numpy
 import matplotlib
@@ -9,6 +10,10 @@ from plantcv.plantcv import fatal_error
 def print_image(img, filename):
     """Save image to file.
 
+    If params.debug_writer_threads is greater than 0, numpy array images are copied and written by background threads,
+    use flush_images to wait for the queued images to be written. PNG files are written with the compression level
+    params.png_compression (if set).
+
     Inputs:
     img      = image object
     filename = name of file to save image to
@@ -17,10 +22,23 @@ def print_image(img, filename):
     :param filename: string
     :return:
     """
+    # Make figures that are only made when they are first used (plantcv.plantcv._lazy_figure.LazyFigure)
+    if hasattr(img, "_build_figure"):
+        img._build_figure()
+
     # Print numpy array type images
     image_type = type(img)
     if image_type == numpy.ndarray:
-        cv2.imwrite(filename, img)
+        write_params = []
+        if params.png_compression is not None and os.path.splitext(filename)[1].lower() == ".png":
+            write_params = [cv2.IMWRITE_PNG_COMPRESSION, params.png_compression]
+        if params.debug_writer_threads > 0:
+            from plantcv.plantcv._image_writer import _writer
+            # Write a copy so that changes made to the image after this call are not written
+            _writer.submit(img=numpy.copy(img), filename=filename, threads=params.debug_writer_threads,
+                           queue_size=params.debug_writer_queue, write_params=write_params)
+        else:
+            cv2.imwrite(filename, img, write_params)
 
     # Print matplotlib type images
     elif image_type == matplotlib.figure.Figure:
@@ -3,19 +3,20 @@
 import os
 import cv2
 import numpy as np
-import pandas as pd
 from plantcv.plantcv import fatal_error
 from plantcv.plantcv import params
 from plantcv.plantcv.hyperspectral import read_data
 from plantcv.plantcv._debug import _debug
 
 
-def readimage(filename, mode="native"):
+def readimage(filename, mode="native", read_only=False):
     """Read image from file.
 
     Inputs:
     filename = name of image file
     mode     = mode of imread ("native", "rgb", "rgba", "gray", "csv", "envi")
+    read_only = if True the image can not be changed in place, which lets the functions that convert it to other
+                colorspaces (e.g. rgb2gray_hsv, analyze_color) share the conversions (default: False)
 
     Returns:
     img      = image object as numpy array
@@ -24,6 +25,7 @@ def readimage(filename, mode="native"):
 
     :param filename: str
     :param mode: str
+    :param read_only: bool
     :return img: numpy.ndarray
     :return path: str
     :return img_name: str
@@ -35,6 +37,8 @@ def readimage(filename, mode="native"):
     elif mode.upper() == "RGBA":
         img = cv2.imread(filename, -1)
     elif mode.upper() == "CSV":
+        # pandas is only imported to read CSV images
+        import pandas as pd
         inputarray = pd.read_csv(filename, sep=',', header=None)
         img = inputarray.values
     elif mode.upper() == "ENVI":
@@ -50,6 +54,10 @@ def readimage(filename, mode="native"):
     if img is None:
         fatal_error("Failed to open " + filename)
 
+    # Read-only images share their colorspace conversions between functions
+    if read_only:
+        img.flags.writeable = False
+
     # Split path from filename
     path, img_name = os.path.split(filename)
 
@@ -1,7 +1,7 @@
 # RGB -> Gray
 
-import cv2
 import os
+from plantcv.plantcv._channel_bundle import _channel_bundle
 from plantcv.plantcv import params
 from plantcv.plantcv._debug import _debug
 
@@ -18,7 +18,11 @@ def rgb2gray(rgb_img):
     :param rgb_img: numpy.ndarray
     :return gray: numpy.ndarray
     """
-    gray = cv2.cvtColor(rgb_img, cv2.COLOR_BGR2GRAY)
+    # Convert the image to grayscale (shared with other functions using the same image)
+    gray = _channel_bundle(rgb_img).gray
+    if not gray.flags.writeable:
+        # Copy the shared grayscale image so that it is not modified
+        gray = gray.copy()
 
     _debug(visual=gray, filename=os.path.join(params.debug_outdir, str(params.device) + "_gray.png"))
 
@@ -1,11 +1,10 @@
 # RGB -> CMYK -> Gray
 
-import cv2
 import os
+from plantcv.plantcv._channel_bundle import _channel_bundle
 from plantcv.plantcv._debug import _debug
 from plantcv.plantcv import fatal_error
 from plantcv.plantcv import params
-import numpy as np
 
 
 def rgb2gray_cmyk(rgb_img, channel):
@@ -28,30 +27,16 @@ def rgb2gray_cmyk(rgb_img, channel):
     if channel not in names:
         fatal_error("Channel " + str(channel) + " is not c, m, y or k!")
 
-    # Create float
-    bgr = rgb_img.astype(float)/255.
-
-    # K channel
-    k = 1 - np.max(bgr, axis=2)
-
-    # C Channel
-    c = (1 - bgr[..., 2] - k) / (1 - k)
-
-    # M Channel
-    m = (1 - bgr[..., 1] - k) / (1 - k)
-
-    # Y Channel
-    y = (1 - bgr[..., 0] - k) / (1 - k)
-
-    # Convert the input BGR image to LAB colorspace
-    cmyk = (np.dstack((c, m, y, k)) * 255).astype(np.uint8)
-    # Split CMYK channels
-    y, m, c, k = cv2.split(cmyk)
-    # Create a channel dictionaries for lookups by a channel name index
-    channels = {"c": c, "m": m, "y": y, "k": k}
+    # Convert the input BGR image to CMYK colorspace (shared with other functions using the same image)
+    cmyk = _channel_bundle(rgb_img).cmyk
+    # Create a channel index dictionary for lookups by a channel name index
+    # The channels are named in the order the CMYK image has always been split in
+    channels = {"y": 0, "m": 1, "c": 2, "k": 3}
+    # Copy the channel so that the shared CMYK image is not modified
+    gray_img = cmyk[:, :, channels[channel]].copy()
 
     # Save or display the grayscale image
-    _debug(visual=channels[channel], filename=os.path.join(params.debug_outdir,
-                                                           str(params.device) + "_cmyk_" + names[channel] + ".png"))
+    _debug(visual=gray_img, filename=os.path.join(params.debug_outdir,
+                                                  str(params.device) + "_cmyk_" + names[channel] + ".png"))
 
-    return channels[channel]
+    return gray_img
@@ -1,7 +1,7 @@
 # RGB -> HSV -> Gray
 
-import cv2
 import os
+from plantcv.plantcv._channel_bundle import _channel_bundle
 from plantcv.plantcv._debug import _debug
 from plantcv.plantcv import fatal_error
 from plantcv.plantcv import params
@@ -28,16 +28,16 @@ def rgb2gray_hsv(rgb_img, channel):
     if channel not in names:
         fatal_error("Channel " + str(channel) + " is not h, s or v!")
 
-    # Convert the input BGR image to HSV colorspace
-    hsv = cv2.cvtColor(rgb_img, cv2.COLOR_BGR2HSV)
-    # Split HSV channels
-    h, s, v = cv2.split(hsv)
-    # Create a channel dictionaries for lookups by a channel name index
-    channels = {"h": h, "s": s, "v": v}
+    # Convert the input BGR image to HSV colorspace (shared with other functions using the same image)
+    hsv = _channel_bundle(rgb_img).hsv
+    # Create a channel index dictionary for lookups by a channel name index
+    channels = {"h": 0, "s": 1, "v": 2}
+    # Copy the channel so that the shared HSV image is not modified
+    gray_img = hsv[:, :, channels[channel]].copy()
 
-    _debug(visual=channels[channel],
+    _debug(visual=gray_img,
            filename=os.path.join(params.debug_outdir,
                                  str(params.device) + "_hsv_" + names[channel] + ".png"),
            cmap='gray')
 
-    return channels[channel]
+    return gray_img
@@ -1,7 +1,7 @@
 # RGB -> LAB -> Gray
 
-import cv2
 import os
+from plantcv.plantcv._channel_bundle import _channel_bundle
 from plantcv.plantcv._debug import _debug
 from plantcv.plantcv import fatal_error
 from plantcv.plantcv import params
@@ -28,16 +28,16 @@ def rgb2gray_lab(rgb_img, channel):
     if channel not in names:
         fatal_error("Channel " + str(channel) + " is not l, a or b!")
 
-    # Convert the input BGR image to LAB colorspace
-    lab = cv2.cvtColor(rgb_img, cv2.COLOR_BGR2LAB)
-    # Split LAB channels
-    l, a, b = cv2.split(lab)
-    # Create a channel dictionaries for lookups by a channel name index
-    channels = {"l": l, "a": a, "b": b}
+    # Convert the input BGR image to LAB colorspace (shared with other functions using the same image)
+    lab = _channel_bundle(rgb_img).lab
+    # Create a channel index dictionary for lookups by a channel name index
+    channels = {"l": 0, "a": 1, "b": 2}
+    # Copy the channel so that the shared LAB image is not modified
+    gray_img = lab[:, :, channels[channel]].copy()
 
-    _debug(visual=channels[channel],
+    _debug(visual=gray_img,
            filename=os.path.join(params.debug_outdir,
                                  str(params.device) + "_lab_" + names[channel] + ".png"),
            cmap="gray")
 
-    return channels[channel]
+    return gray_img
@@ -3,7 +3,6 @@
 import cv2
 import numpy as np
 import os
-from plantcv.plantcv import logical_and
 from plantcv.plantcv._debug import _debug
 from plantcv.plantcv import fatal_error
 from plantcv.plantcv import params
@@ -59,14 +58,21 @@ def roi_objects(img, roi_contour, roi_hierarchy, object_contour, obj_hierarchy,
 
     # Allows user to find all objects that are completely inside or overlapping with ROI
     if roi_type.upper() in ('PARTIAL', 'LARGEST'):
+        # Bounding box of the ROI, contours with bounding boxes outside of it do not overlap with the ROI
+        roi_x, roi_y, roi_w, roi_h = cv2.boundingRect(roi_mask)
         # Filter contours outside of the region of interest
         for c, cnt in enumerate(object_contour):
-            filtering_mask = np.zeros(np.shape(img)[:2], dtype=np.uint8)
-            cv2.fillPoly(filtering_mask, [np.vstack(object_contour[c])], (255))
-            overlap_img = logical_and(filtering_mask, roi_mask)
+            cnt_points = np.vstack(cnt)
+            x, y, w, h = cv2.boundingRect(cnt_points)
+            overlap = False
+            if x < roi_x + roi_w and roi_x < x + w and y < roi_y + roi_h and roi_y < y + h:
+                # Fill the contour on the part of the image that holds it
+                filtering_mask = np.zeros((h, w), dtype=np.uint8)
+                cv2.fillPoly(filtering_mask, [cnt_points], (255), offset=(-x, -y))
+                overlap = np.any(np.logical_and(filtering_mask, roi_mask[y:y + h, x:x + w]))
             # Delete contours that do not overlap at all with the ROI
-            if np.sum(overlap_img) == 0:
-                cv2.drawContours(mask, object_contour, c, (0), -1, lineType=8, hierarchy=obj_hierarchy)
+            if not overlap:
+                cv2.drawContours(mask, [cnt], 0, (0), -1, lineType=8)
 
         # Find the kept contours and area
         kept_cnt, kept_hierarchy = cv2.findContours(np.copy(mask), cv2.RETR_TREE, cv2.CHAIN_APPROX_NONE)[-2:]
@@ -1,34 +1,40 @@
-from plantcv.plantcv.spectral_index.spectral_index import ndvi
-from plantcv.plantcv.spectral_index.spectral_index import gdvi
-from plantcv.plantcv.spectral_index.spectral_index import savi
-from plantcv.plantcv.spectral_index.spectral_index import pri
-from plantcv.plantcv.spectral_index.spectral_index import ari
-from plantcv.plantcv.spectral_index.spectral_index import ci_rededge
-from plantcv.plantcv.spectral_index.spectral_index import cri550
-from plantcv.plantcv.spectral_index.spectral_index import cri700
-from plantcv.plantcv.spectral_index.spectral_index import egi
-from plantcv.plantcv.spectral_index.spectral_index import evi
-from plantcv.plantcv.spectral_index.spectral_index import mari
-from plantcv.plantcv.spectral_index.spectral_index import mcari
-from plantcv.plantcv.spectral_index.spectral_index import mtci
-from plantcv.plantcv.spectral_index.spectral_index import ndre
-from plantcv.plantcv.spectral_index.spectral_index import psnd_chla
-from plantcv.plantcv.spectral_index.spectral_index import psnd_chlb
-from plantcv.plantcv.spectral_index.spectral_index import psnd_car
-from plantcv.plantcv.spectral_index.spectral_index import psri
-from plantcv.plantcv.spectral_index.spectral_index import pssr_chla
-from plantcv.plantcv.spectral_index.spectral_index import pssr_chlb
-from plantcv.plantcv.spectral_index.spectral_index import pssr_car
-from plantcv.plantcv.spectral_index.spectral_index import rgri
-from plantcv.plantcv.spectral_index.spectral_index import rvsi
-from plantcv.plantcv.spectral_index.spectral_index import sipi
-from plantcv.plantcv.spectral_index.spectral_index import sr
-from plantcv.plantcv.spectral_index.spectral_index import vari
-from plantcv.plantcv.spectral_index.spectral_index import vi_green
-from plantcv.plantcv.spectral_index.spectral_index import wi
+from plantcv.plantcv._lazy_loader import _lazy_load
+
+# Functions are imported on first access, public name: (submodule, attribute)
+_lazy_load(__name__, {
+    "ndvi": ("spectral_index", "ndvi"),
+    "gdvi": ("spectral_index", "gdvi"),
+    "savi": ("spectral_index", "savi"),
+    "pri": ("spectral_index", "pri"),
+    "ari": ("spectral_index", "ari"),
+    "ci_rededge": ("spectral_index", "ci_rededge"),
+    "cri550": ("spectral_index", "cri550"),
+    "cri700": ("spectral_index", "cri700"),
+    "egi": ("spectral_index", "egi"),
+    "evi": ("spectral_index", "evi"),
+    "mari": ("spectral_index", "mari"),
+    "mcari": ("spectral_index", "mcari"),
+    "mtci": ("spectral_index", "mtci"),
+    "ndre": ("spectral_index", "ndre"),
+    "psnd_chla": ("spectral_index", "psnd_chla"),
+    "psnd_chlb": ("spectral_index", "psnd_chlb"),
+    "psnd_car": ("spectral_index", "psnd_car"),
+    "psri": ("spectral_index", "psri"),
+    "pssr_chla": ("spectral_index", "pssr_chla"),
+    "pssr_chlb": ("spectral_index", "pssr_chlb"),
+    "pssr_car": ("spectral_index", "pssr_car"),
+    "rgri": ("spectral_index", "rgri"),
+    "rvsi": ("spectral_index", "rvsi"),
+    "sipi": ("spectral_index", "sipi"),
+    "sr": ("spectral_index", "sr"),
+    "vari": ("spectral_index", "vari"),
+    "vi_green": ("spectral_index", "vi_green"),
+    "wi": ("spectral_index", "wi"),
+    "compute": ("spectral_index", "compute"),
+})
 
 
 # add new functions to end of lists
 __all__ = ["ndvi", "gdvi", "savi", "pri", "ari", "ci_rededge", "cri550", "cri700", "egi", "evi", "mari", "mcari",
            "mtci", "ndre", "psnd_chla", "psnd_chlb", "psnd_car", "psri", "pssr_chla", "pssr_chlb", "pssr_car", "rgri", "rvsi",
-           "sipi", "sr", "vari", "vi_green", "wi"]
+           "sipi", "sr", "vari", "vi_green", "wi", "compute"]
@@ -8,7 +8,41 @@ from plantcv.plantcv._debug import _debug
 from plantcv.plantcv import fatal_error
 from plantcv.plantcv import Spectral_data
 from plantcv.plantcv.transform import rescale
-from plantcv.plantcv.hyperspectral import _find_closest
+
+
+# Indices calculated from a hyperspectral datacube, index name: (method, wavelengths, formula)
+# The formula is called with the bands closest to each wavelength, in the order the wavelengths are listed
+_INDICES = {
+    "ndvi": ("NDVI", (800, 670), lambda r800, r670: (r800 - r670) / (r800 + r670)),
+    "gdvi": ("GDVI", (800, 550), lambda r800, r550: r800 - r550),
+    "savi": ("SAVI", (800, 680), lambda r800, r680: (1.5 * (r800 - r680)) / (r800 + r680 + 0.5)),
+    "pri": ("PRI", (531, 570), lambda r531, r570: (r531 - r570) / (r531 + r570)),
+    "ari": ("ARI", (550, 700), lambda r550, r700: (1 / r550) - (1 / r700)),
+    "ci_rededge": ("CI_REDEDGE", (700, 800), lambda r700, r800: (r800 / r700) - 1),
+    "cri550": ("CRI510", (510, 550), lambda r510, r550: (1 / r510) - (1 / r550)),
+    "cri700": ("CRI700", (510, 700), lambda r510, r700: (1 / r510) - (1 / r700)),
+    "evi": ("EVI", (480, 670, 800),
+            lambda r480, r670, r800: (2.5 * (r800 - r670)) / (1 + r800 + (6 * r670) - (7.5 * r480))),
+    "mari": ("MARI", (550, 700, 800), lambda r550, r700, r800: ((1 / r550) - (1 / r700)) * r800),
+    "mcari": ("MCARI", (550, 670, 700),
+              lambda r550, r670, r700: ((r700 - r670) - 0.2 * (r700 - r550)) * (r700 / r670)),
+    "mtci": ("MTCI", (681.25, 708.75, 753.75), lambda r681, r708, r753: (r753 - r708) / (r708 - r681)),
+    "ndre": ("NDRE", (720, 790), lambda r720, r790: (r790 - r720) / (r790 + r720)),
+    "psnd_chla": ("PSND_CHLA", (680, 800), lambda r680, r800: (r800 - r680) / (r800 + r680)),
+    "psnd_chlb": ("PSND_CHLB", (635, 800), lambda r635, r800: (r800 - r635) / (r800 + r635)),
+    "psnd_car": ("PSND_CAR", (470, 800), lambda r470, r800: (r800 - r470) / (r800 + r470)),
+    "psri": ("PSRI", (500, 678, 750), lambda r500, r678, r750: (r678 - r500) / r750),
+    "pssr_chla": ("PSSR_CHLA", (800, 680), lambda r800, r680: r800 / r680),
+    "pssr_chlb": ("PSSR_CHLB", (800, 635), lambda r800, r635: r800 / r635),
+    "pssr_car": ("PSSR_CAR", (800, 470), lambda r800, r470: r800 / r470),
+    "rgri": ("RGRI", (670, 560), lambda r670, r560: r670 / r560),
+    "rvsi": ("RVSI", (714, 733, 752), lambda r714, r733, r752: ((r714 + r752) / 2) - r733),
+    "sipi": ("SIPI", (480, 670, 800), lambda r480, r670, r800: (r800 - r670) / (r800 - r480)),
+    "sr": ("SR", (670, 800), lambda r670, r800: r800 / r670),
+    "vari": ("VARI", (670, 550, 480), lambda r670, r550, r480: (r550 - r670) / (r550 + r670 - r480)),
+    "vi_green": ("VI_GREEN", (670, 550), lambda r670, r550: (r550 - r670) / (r550 + r670)),
+    "wi": ("WI", (900, 970), lambda r900, r970: r900 / r970),
+}
 
 
 def ndvi(hsi, distance=20):
@@ -29,16 +63,7 @@ def ndvi(hsi, distance=20):
     :param distance: int
     :return index_array: __main__.Spectral_data
     """
-    if (float(hsi.max_wavelength) + distance) >= 800 and (float(hsi.min_wavelength) - distance) <= 670:
-        # Obtain index that best represents NIR and red bands
-        r800_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 800)
-        r670_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 670)
-        r800 = (hsi.array_data[:, :, r800_index])
-        r670 = (hsi.array_data[:, :, r670_index])
-        # Naturally ranges from -1 to 1
-        index_array_raw = (r800 - r670) / (r800 + r670)
-        return _package_index(hsi=hsi, raw_index=index_array_raw, method="NDVI")
-    fatal_error("Available wavelengths are not suitable for calculating NDVI. Try increasing distance.")
+    return _compute_index(hsi=hsi, index="ndvi", distance=distance)
 
 
 def gdvi(hsi, distance=20):
@@ -59,15 +84,7 @@ def gdvi(hsi, distance=20):
     :param distance: int
     :return index_array: __main__.Spectral_data
     """
-    if (float(hsi.max_wavelength) + distance) >= 800 and (float(hsi.min_wavelength) - distance) <= 550:
-        r800_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 800)
-        r550_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 550)
-        r800 = (hsi.array_data[:, :, r800_index])
-        r550 = (hsi.array_data[:, :, r550_index])
-        # Naturally ranges from -1 to 1
-        index_array_raw = r800 - r550
-        return _package_index(hsi=hsi, raw_index=index_array_raw, method="GDVI")
-    fatal_error("Available wavelengths are not suitable for calculating GDVI. Try increasing distance.")
+    return _compute_index(hsi=hsi, index="gdvi", distance=distance)
 
 
 def savi(hsi, distance=20):
@@ -88,15 +105,7 @@ def savi(hsi, distance=20):
     :param distance: int
     :return index_array: __main__.Spectral_data
     """
-    if (float(hsi.max_wavelength) + distance) >= 800 and (float(hsi.min_wavelength) - distance) <= 680:
-        r800_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 800)
-        r680_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 680)
-        r800 = (hsi.array_data[:, :, r800_index])
-        r680 = (hsi.array_data[:, :, r680_index])
-        # Naturally ranges from -1.2 to 1.2
-        index_array_raw = (1.5 * (r800 - r680)) / (r800 + r680 + 0.5)
-        return _package_index(hsi=hsi, raw_index=index_array_raw, method="SAVI")
-    fatal_error("Available wavelengths are not suitable for calculating SAVI. Try increasing distance.")
+    return _compute_index(hsi=hsi, index="savi", distance=distance)
 
 
 def pri(hsi, distance=20):
@@ -117,15 +126,7 @@ def pri(hsi, distance=20):
     :param distance: int
     :return index_array: __main__.Spectral_data
     """
-    if (float(hsi.max_wavelength) + distance) >= 570 and (float(hsi.min_wavelength) - distance) <= 531:
-        # Obtain index that best approximates 570 and 531 nm bands
-        r570_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 570)
-        r531_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 531)
-        r570 = (hsi.array_data[:, :, r570_index])
-        r531 = (hsi.array_data[:, :, r531_index])
-        index_array_raw = (r531 - r570) / (r531 + r570)
-        return _package_index(hsi=hsi, raw_index=index_array_raw, method="PRI")
-    fatal_error("Available wavelengths are not suitable for calculating PRI. Try increasing distance.")
+    return _compute_index(hsi=hsi, index="pri", distance=distance)
 
 
 def ari(hsi, distance=20):
@@ -146,14 +147,7 @@ def ari(hsi, distance=20):
     :param distance: int
     :return index_array: __main__.Spectral_data
     """
-    if (float(hsi.max_wavelength) + distance) >= 700 and (float(hsi.min_wavelength) - distance) <= 550:
-        r550_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 550)
-        r700_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 700)
-        r550 = (hsi.array_data[:, :, r550_index])
-        r700 = (hsi.array_data[:, :, r700_index])
-        index_array_raw = (1 / r550) - (1 / r700)
-        return _package_index(hsi=hsi, raw_index=index_array_raw, method="ARI")
-    fatal_error("Available wavelengths are not suitable for calculating ARI. Try increasing distance.")
+    return _compute_index(hsi=hsi, index="ari", distance=distance)
 
 
 def ci_rededge(hsi, distance=20):
@@ -174,15 +168,7 @@ def ci_rededge(hsi, distance=20):
     :param distance: int
     :return index_array: __main__.Spectral_data
     """
-    if (float(hsi.max_wavelength) + distance) >= 800 and (float(hsi.min_wavelength) - distance) <= 700:
-        r700_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 700)
-        r800_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 800)
-        r700 = (hsi.array_data[:, :, r700_index])
-        r800 = (hsi.array_data[:, :, r800_index])
-        # Naturally ranges from -1 to inf
-        index_array_raw = (r800 / r700) - 1
-        return _package_index(hsi=hsi, raw_index=index_array_raw, method="CI_REDEDGE")
-    fatal_error("Available wavelengths are not suitable for calculating CI_REDEDGE. Try increasing distance.")
+    return _compute_index(hsi=hsi, index="ci_rededge", distance=distance)
 
 
 def cri550(hsi, distance=20):
@@ -203,15 +189,7 @@ def cri550(hsi, distance=20):
     :param distance: int
     :return index_array: __main__.Spectral_data
     """
-    if (float(hsi.max_wavelength) + distance) >= 550 and (float(hsi.min_wavelength) - distance) <= 510:
-        r510_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 510)
-        r550_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 550)
-        r510 = (hsi.array_data[:, :, r510_index])
-        r550 = (hsi.array_data[:, :, r550_index])
-        # Naturally ranges from -inf to inf
-        index_array_raw = (1 / r510) - (1 / r550)
-        return _package_index(hsi=hsi, raw_index=index_array_raw, method="CRI510")
-    fatal_error("Available wavelengths are not suitable for calculating CRI510. Try increasing distance.")
+    return _compute_index(hsi=hsi, index="cri550", distance=distance)
 
 
 def cri700(hsi, distance=20):
@@ -232,15 +210,7 @@ def cri700(hsi, distance=20):
     :param distance: int
     :return index_array: __main__.Spectral_data
     """
-    if (float(hsi.max_wavelength) + distance) >= 700 and (float(hsi.min_wavelength) - distance) <= 510:
-        r510_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 510)
-        r700_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 700)
-        r510 = (hsi.array_data[:, :, r510_index])
-        r700 = (hsi.array_data[:, :, r700_index])
-        # Naturally ranges from -inf to inf
-        index_array_raw = (1 / r510) - (1 / r700)
-        return _package_index(hsi=hsi, raw_index=index_array_raw, method="CRI700")
-    fatal_error("Available wavelengths are not suitable for calculating CRI700. Try increasing distance.")
+    return _compute_index(hsi=hsi, index="cri700", distance=distance)
 
 
 def egi(rgb_img):
@@ -297,17 +267,7 @@ def evi(hsi, distance=20):
     :param distance: int
     :return index_array: __main__.Spectral_data
     """
-    if (float(hsi.max_wavelength) + distance) >= 800 and (float(hsi.min_wavelength) - distance) <= 480:
-        r480_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 480)
-        r670_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 670)
-        r800_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 800)
-        r480 = (hsi.array_data[:, :, r480_index])
-        r670 = (hsi.array_data[:, :, r670_index])
-        r800 = (hsi.array_data[:, :, r800_index])
-        # Naturally ranges from -inf to inf
-        index_array_raw = (2.5 * (r800 - r670)) / (1 + r800 + (6 * r670) - (7.5 * r480))
-        return _package_index(hsi=hsi, raw_index=index_array_raw, method="EVI")
-    fatal_error("Available wavelengths are not suitable for calculating EVI. Try increasing distance.")
+    return _compute_index(hsi=hsi, index="evi", distance=distance)
 
 
 def mari(hsi, distance=20):
@@ -328,17 +288,7 @@ def mari(hsi, distance=20):
     :param distance: int
     :return index_array: __main__.Spectral_data
     """
-    if (float(hsi.max_wavelength) + distance) >= 800 and (float(hsi.min_wavelength) - distance) <= 550:
-        r550_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 550)
-        r700_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 700)
-        r800_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 800)
-        r550 = (hsi.array_data[:, :, r550_index])
-        r700 = (hsi.array_data[:, :, r700_index])
-        r800 = (hsi.array_data[:, :, r800_index])
-        # Naturally ranges from -inf to inf
-        index_array_raw = ((1 / r550) - (1 / r700)) * r800
-        return _package_index(hsi=hsi, raw_index=index_array_raw, method="MARI")
-    fatal_error("Available wavelengths are not suitable for calculating MARI. Try increasing distance.")
+    return _compute_index(hsi=hsi, index="mari", distance=distance)
 
 
 def mcari(hsi, distance=20):
@@ -359,17 +309,7 @@ def mcari(hsi, distance=20):
     :param distance: int
     :return index_array: __main__.Spectral_data
     """
-    if (float(hsi.max_wavelength) + distance) >= 700 and (float(hsi.min_wavelength) - distance) <= 550:
-        r550_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 550)
-        r670_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 670)
-        r700_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 700)
-        r550 = (hsi.array_data[:, :, r550_index])
-        r670 = (hsi.array_data[:, :, r670_index])
-        r700 = (hsi.array_data[:, :, r700_index])
-        # Naturally ranges from -inf to inf
-        index_array_raw = ((r700 - r670) - 0.2 * (r700 - r550)) * (r700 / r670)
-        return _package_index(hsi=hsi, raw_index=index_array_raw, method="MCARI")
-    fatal_error("Available wavelengths are not suitable for calculating MCARI. Try increasing distance.")
+    return _compute_index(hsi=hsi, index="mcari", distance=distance)
 
 
 def mtci(hsi, distance=20):
@@ -390,17 +330,7 @@ def mtci(hsi, distance=20):
     :param distance: int
     :return index_array: __main__.Spectral_data
     """
-    if (float(hsi.max_wavelength) + distance) >= 753.75 and (float(hsi.min_wavelength) - distance) <= 681.25:
-        r681_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 681.25)
-        r708_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 708.75)
-        r753_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 753.75)
-        r681 = (hsi.array_data[:, :, r681_index])
-        r708 = (hsi.array_data[:, :, r708_index])
-        r753 = (hsi.array_data[:, :, r753_index])
-        # Naturally ranges from -inf to inf
-        index_array_raw = (r753 - r708) / (r708 - r681)
-        return _package_index(hsi=hsi, raw_index=index_array_raw, method="MTCI")
-    fatal_error("Available wavelengths are not suitable for calculating MTCI. Try increasing distance.")
+    return _compute_index(hsi=hsi, index="mtci", distance=distance)
 
 
 def ndre(hsi, distance=20):
@@ -421,15 +351,7 @@ def ndre(hsi, distance=20):
     :param distance: int
     :return index_array: __main__.Spectral_data
     """
-    if (float(hsi.max_wavelength) + distance) >= 790 and (float(hsi.min_wavelength) - distance) <= 720:
-        r720_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 720)
-        r790_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 790)
-        r790 = (hsi.array_data[:, :, r790_index])
-        r720 = (hsi.array_data[:, :, r720_index])
-        # Naturally ranges from -1 to 1
-        index_array_raw = (r790 - r720) / (r790 + r720)
-        return _package_index(hsi=hsi, raw_index=index_array_raw, method="NDRE")
-    fatal_error("Available wavelengths are not suitable for calculating NDRE. Try increasing distance.")
+    return _compute_index(hsi=hsi, index="ndre", distance=distance)
 
 
 def psnd_chla(hsi, distance=20):
@@ -450,15 +372,7 @@ def psnd_chla(hsi, distance=20):
     :param distance: int
     :return index_array: __main__.Spectral_data
     """
-    if (float(hsi.max_wavelength) + distance) >= 800 and (float(hsi.min_wavelength) - distance) <= 680:
-        r680_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 680)
-        r800_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 800)
-        r680 = (hsi.array_data[:, :, r680_index])
-        r800 = (hsi.array_data[:, :, r800_index])
-        # Naturally ranges from -1 to 1
-        index_array_raw = (r800 - r680) / (r800 + r680)
-        return _package_index(hsi=hsi, raw_index=index_array_raw, method="PSND_CHLA")
-    fatal_error("Available wavelengths are not suitable for calculating PSND_CHLA. Try increasing distance.")
+    return _compute_index(hsi=hsi, index="psnd_chla", distance=distance)
 
 
 def psnd_chlb(hsi, distance=20):
@@ -479,15 +393,7 @@ def psnd_chlb(hsi, distance=20):
     :param distance: int
     :return index_array: __main__.Spectral_data
     """
-    if (float(hsi.max_wavelength) + distance) >= 800 and (float(hsi.min_wavelength) - distance) <= 635:
-        r635_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 635)
-        r800_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 800)
-        r635 = (hsi.array_data[:, :, r635_index])
-        r800 = (hsi.array_data[:, :, r800_index])
-        # Naturally ranges from -1 to 1
-        index_array_raw = (r800 - r635) / (r800 + r635)
-        return _package_index(hsi=hsi, raw_index=index_array_raw, method="PSND_CHLB")
-    fatal_error("Available wavelengths are not suitable for calculating PSND_CHLB. Try increasing distance.")
+    return _compute_index(hsi=hsi, index="psnd_chlb", distance=distance)
 
 
 def psnd_car(hsi, distance=20):
@@ -508,15 +414,7 @@ def psnd_car(hsi, distance=20):
     :param distance: int
     :return index_array: __main__.Spectral_data
     """
-    if (float(hsi.max_wavelength) + distance) >= 800 and (float(hsi.min_wavelength) - distance) <= 470:
-        r470_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 470)
-        r800_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 800)
-        r470 = (hsi.array_data[:, :, r470_index])
-        r800 = (hsi.array_data[:, :, r800_index])
-        # Naturally ranges from -1 to 1
-        index_array_raw = (r800 - r470) / (r800 + r470)
-        return _package_index(hsi=hsi, raw_index=index_array_raw, method="PSND_CAR")
-    fatal_error("Available wavelengths are not suitable for calculating PSND_CAR. Try increasing distance.")
+    return _compute_index(hsi=hsi, index="psnd_car", distance=distance)
 
 
 def psri(hsi, distance=20):
@@ -537,17 +435,7 @@ def psri(hsi, distance=20):
     :param distance: int
     :return index_array: __main__.Spectral_data
     """
-    if (float(hsi.max_wavelength) + distance) >= 750 and (float(hsi.min_wavelength) - distance) <= 500:
-        r500_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 500)
-        r678_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 678)
-        r750_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 750)
-        r500 = (hsi.array_data[:, :, r500_index])
-        r678 = (hsi.array_data[:, :, r678_index])
-        r750 = (hsi.array_data[:, :, r750_index])
-        # Naturally ranges from -inf to inf
-        index_array_raw = (r678 - r500) / r750
-        return _package_index(hsi=hsi, raw_index=index_array_raw, method="PSRI")
-    fatal_error("Available wavelengths are not suitable for calculating PSRI. Try increasing distance.")
+    return _compute_index(hsi=hsi, index="psri", distance=distance)
 
 
 def pssr_chla(hsi, distance=20):
@@ -568,15 +456,7 @@ def pssr_chla(hsi, distance=20):
     :param distance: int
     :return index_array: __main__.Spectral_data
     """
-    if (float(hsi.max_wavelength) + distance) >= 800 and (float(hsi.min_wavelength) - distance) <= 680:
-        r800_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 800)
-        r680_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 680)
-        r800 = (hsi.array_data[:, :, r800_index])
-        r680 = (hsi.array_data[:, :, r680_index])
-        # Naturally ranges from 0 to inf
-        index_array_raw = r800 / r680
-        return _package_index(hsi=hsi, raw_index=index_array_raw, method="PSSR_CHLA")
-    fatal_error("Available wavelengths are not suitable for calculating PSSR_CHLA. Try increasing distance.")
+    return _compute_index(hsi=hsi, index="pssr_chla", distance=distance)
 
 
 def pssr_chlb(hsi, distance=20):
@@ -597,15 +477,7 @@ def pssr_chlb(hsi, distance=20):
     :param distance: int
     :return index_array: __main__.Spectral_data
     """
-    if (float(hsi.max_wavelength) + distance) >= 800 and (float(hsi.min_wavelength) - distance) <= 635:
-        r800_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 800)
-        r635_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 635)
-        r800 = (hsi.array_data[:, :, r800_index])
-        r635 = (hsi.array_data[:, :, r635_index])
-        # Naturally ranges from 0 to inf
-        index_array_raw = r800 / r635
-        return _package_index(hsi=hsi, raw_index=index_array_raw, method="PSSR_CHLB")
-    fatal_error("Available wavelengths are not suitable for calculating PSSR_CHLB. Try increasing distance.")
+    return _compute_index(hsi=hsi, index="pssr_chlb", distance=distance)
 
 
 def pssr_car(hsi, distance=20):
@@ -626,15 +498,7 @@ def pssr_car(hsi, distance=20):
     :param distance: int
     :return index_array: __main__.Spectral_data
     """
-    if (float(hsi.max_wavelength) + distance) >= 800 and (float(hsi.min_wavelength) - distance) <= 470:
-        r800_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 800)
-        r470_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 470)
-        r800 = (hsi.array_data[:, :, r800_index])
-        r470 = (hsi.array_data[:, :, r470_index])
-        # Naturally ranges from 0 to inf
-        index_array_raw = r800 / r470
-        return _package_index(hsi=hsi, raw_index=index_array_raw, method="PSSR_CAR")
-    fatal_error("Available wavelengths are not suitable for calculating PSSR_CAR. Try increasing distance.")
+    return _compute_index(hsi=hsi, index="pssr_car", distance=distance)
 
 
 def rgri(hsi, distance=20):
@@ -652,15 +516,7 @@ def rgri(hsi, distance=20):
     :param distance: int
     :return index_array: __main__.Spectral_data
     """
-    if (float(hsi.max_wavelength) + distance) >= 670 and (float(hsi.min_wavelength) - distance) <= 560:
-        r670_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 670)
-        r560_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 560)
-        r670 = (hsi.array_data[:, :, r670_index])
-        r560 = (hsi.array_data[:, :, r560_index])
-        # Naturally ranges from 0 to inf
-        index_array_raw = r670 / r560
-        return _package_index(hsi=hsi, raw_index=index_array_raw, method="RGRI")
-    fatal_error("Available wavelengths are not suitable for calculating RGRI. Try increasing distance.")
+    return _compute_index(hsi=hsi, index="rgri", distance=distance)
 
 
 def rvsi(hsi, distance=20):
@@ -681,17 +537,7 @@ def rvsi(hsi, distance=20):
     :param distance: int
     :return index_array: __main__.Spectral_data
     """
-    if (float(hsi.max_wavelength) + distance) >= 752 and (float(hsi.min_wavelength) - distance) <= 714:
-        r714_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 714)
-        r733_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 733)
-        r752_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 752)
-        r714 = (hsi.array_data[:, :, r714_index])
-        r733 = (hsi.array_data[:, :, r733_index])
-        r752 = (hsi.array_data[:, :, r752_index])
-        # Naturally ranges from -1 to 1
-        index_array_raw = ((r714 + r752) / 2) - r733
-        return _package_index(hsi=hsi, raw_index=index_array_raw, method="RVSI")
-    fatal_error("Available wavelengths are not suitable for calculating RVSI. Try increasing distance.")
+    return _compute_index(hsi=hsi, index="rvsi", distance=distance)
 
 
 def sipi(hsi, distance=20):
@@ -712,17 +558,7 @@ def sipi(hsi, distance=20):
     :param distance: int
     :return index_array: __main__.Spectral_data
     """
-    if (float(hsi.max_wavelength) + distance) >= 800 and (float(hsi.min_wavelength) - distance) <= 480:
-        r480_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 480)
-        r670_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 670)
-        r800_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 800)
-        r445 = (hsi.array_data[:, :, r480_index])
-        r670 = (hsi.array_data[:, :, r670_index])
-        r800 = (hsi.array_data[:, :, r800_index])
-        # Naturally ranges from -inf to inf
-        index_array_raw = (r800 - r670) / (r800 - r445)
-        return _package_index(hsi=hsi, raw_index=index_array_raw, method="SIPI")
-    fatal_error("Available wavelengths are not suitable for calculating SIPI. Try increasing distance.")
+    return _compute_index(hsi=hsi, index="sipi", distance=distance)
 
 
 def sr(hsi, distance=20):
@@ -743,15 +579,7 @@ def sr(hsi, distance=20):
     :param distance: int
     :return index_array: __main__.Spectral_data
     """
-    if (float(hsi.max_wavelength) + distance) >= 800 and (float(hsi.min_wavelength) - distance) <= 670:
-        r670_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 670)
-        r800_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 800)
-        r670 = (hsi.array_data[:, :, r670_index])
-        r800 = (hsi.array_data[:, :, r800_index])
-        # Naturally ranges from 0 to inf
-        index_array_raw = r800 / r670
-        return _package_index(hsi=hsi, raw_index=index_array_raw, method="SR")
-    fatal_error("Available wavelengths are not suitable for calculating SR. Try increasing distance.")
+    return _compute_index(hsi=hsi, index="sr", distance=distance)
 
 
 def vari(hsi, distance=20):
@@ -772,17 +600,7 @@ def vari(hsi, distance=20):
     :param distance: int
     :return index_array: __main__.Spectral_data
     """
-    if (float(hsi.max_wavelength) + distance) >= 670 and (float(hsi.min_wavelength) - distance) <= 480:
-        r670_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 670)
-        r550_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 550)
-        r480_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 480)
-        r670 = (hsi.array_data[:, :, r670_index])
-        r550 = (hsi.array_data[:, :, r550_index])
-        r480 = (hsi.array_data[:, :, r480_index])
-        # Naturally ranges from -inf to inf
-        index_array_raw = (r550 - r670) / (r550 + r670 - r480)
-        return _package_index(hsi=hsi, raw_index=index_array_raw, method="VARI")
-    fatal_error("Available wavelengths are not suitable for calculating VARI. Try increasing distance.")
+    return _compute_index(hsi=hsi, index="vari", distance=distance)
 
 
 def vi_green(hsi, distance=20):
@@ -803,15 +621,7 @@ def vi_green(hsi, distance=20):
     :param distance: int
     :return index_array: __main__.Spectral_data
     """
-    if (float(hsi.max_wavelength) + distance) >= 670 and (float(hsi.min_wavelength) - distance) <= 550:
-        r670_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 670)
-        r550_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 550)
-        r670 = (hsi.array_data[:, :, r670_index])
-        r550 = (hsi.array_data[:, :, r550_index])
-        # Naturally ranges from -1 to 1
-        index_array_raw = (r550 - r670) / (r550 + r670)
-        return _package_index(hsi=hsi, raw_index=index_array_raw, method="VI_GREEN")
-    fatal_error("Available wavelengths are not suitable for calculating VI_GREEN. Try increasing distance.")
+    return _compute_index(hsi=hsi, index="vi_green", distance=distance)
 
 
 def wi(hsi, distance=20):
@@ -832,15 +642,92 @@ def wi(hsi, distance=20):
     :param distance: int
     :return index_array: __main__.Spectral_data
     """
-    if (float(hsi.max_wavelength) + distance) >= 970 and (float(hsi.min_wavelength) - distance) <= 900:
-        r900_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 900)
-        r970_index = _find_closest(np.array([float(i) for i in hsi.wavelength_dict.keys()]), 970)
-        r900 = (hsi.array_data[:, :, r900_index])
-        r970 = (hsi.array_data[:, :, r970_index])
-        # Naturally ranges from 0 to Inf
-        index_array_raw = r900 / r970
-        return _package_index(hsi=hsi, raw_index=index_array_raw, method="WI")
-    fatal_error("Available wavelengths are not suitable for calculating WBI. Try increasing distance.")
+    return _compute_index(hsi=hsi, index="wi", distance=distance)
+
+
+def compute(hsi, indices, distance=20, chunk_size=2 ** 26):
+    """Calculate several indices from a hyperspectral datacube in one pass over the data.
+
+    Each band needed by any of the indices is read once per block of lines and converted to float32, so a
+    memory-mapped datacube is only read from disk once and never loaded into memory at once.
+
+    Inputs:
+    hsi         = hyperspectral image (PlantCV Spectral_data instance)
+    indices     = list of index names (e.g. ["ndvi", "pri", "ari"])
+    distance    = how lenient to be if the required wavelengths are not available
+    chunk_size  = approximate number of bytes of band data read per block of lines (default: 64 MB)
+
+    Returns:
+    index_arrays = dictionary of index names and float32 index data as Spectral_data instances
+
+    :param hsi: __main__.Spectral_data
+    :param indices: list
+    :param distance: int
+    :param chunk_size: int
+    :return index_arrays: dict
+    """
+    # Resolve the bands of every index before reading any data
+    index_bands = {index: _resolve_bands(hsi=hsi, index=index, distance=distance) for index in indices}
+    bands = sorted({band for ids in index_bands.values() for band in ids})
+
+    lines, samples = hsi.array_data.shape[:2]
+    raw_indices = {index: np.empty((lines, samples), dtype=np.float32) for index in index_bands}
+    lines_per_chunk = max(1, chunk_size // max(1, samples * len(bands) * np.dtype(np.float32).itemsize))
+    for start in range(0, lines, lines_per_chunk):
+        stop = min(start + lines_per_chunk, lines)
+        # Read each band once for all indices
+        chunk = {band: hsi.array_data[start:stop, :, band].astype(np.float32) for band in bands}
+        for index, ids in index_bands.items():
+            raw_indices[index][start:stop] = _INDICES[index][2](*[chunk[band] for band in ids])
+
+    return {index: _package_index(hsi=hsi, raw_index=raw_index, method=_INDICES[index][0])
+            for index, raw_index in raw_indices.items()}
+
+
+def _resolve_bands(hsi, index, distance):
+    """Private function to find the bands used to calculate an index.
+    Inputs:
+    hsi      = hyperspectral data (Spectral_data object)
+    index    = index name (e.g. ndvi)
+    distance = how lenient to be if the required wavelengths are not available
+
+    Returns:
+    bands    = list of band indices, in the order of the index wavelengths
+
+    :params hsi: __main__.Spectral_data
+    :params index: str
+    :params distance: int
+    :return bands: list
+    """
+    if index not in _INDICES:
+        fatal_error(f"{index} is not a supported index. Choose one of: {', '.join(_INDICES)}")
+    method, wavelengths, _ = _INDICES[index]
+    if (float(hsi.max_wavelength) + distance) >= max(wavelengths) and \
+            (float(hsi.min_wavelength) - distance) <= min(wavelengths):
+        # Obtain the bands that best represent each wavelength
+        return [hsi._band_index(wavelength) for wavelength in wavelengths]
+    fatal_error(f"Available wavelengths are not suitable for calculating {method}. Try increasing distance.")
+
+
+def _compute_index(hsi, index, distance):
+    """Private function to calculate a single index from a hyperspectral datacube.
+    Inputs:
+    hsi         = hyperspectral data (Spectral_data object)
+    index       = index name (e.g. ndvi)
+    distance    = how lenient to be if the required wavelengths are not available
+
+    Returns:
+    index_array = Index data as a Spectral_data instance
+
+    :params hsi: __main__.Spectral_data
+    :params index: str
+    :params distance: int
+    :return index_array: __main__.Spectral_data
+    """
+    bands = _resolve_bands(hsi=hsi, index=index, distance=distance)
+    method, _, formula = _INDICES[index]
+    index_array_raw = formula(*[hsi.array_data[:, :, band] for band in bands])
+    return _package_index(hsi=hsi, raw_index=index_array_raw, method=method)
 
 
 def _package_index(hsi, raw_index, method):
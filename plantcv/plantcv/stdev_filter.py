@@ -4,14 +4,14 @@
 import os
 import numpy as np
 from plantcv.plantcv._debug import _debug
+from plantcv.plantcv._filters import _pad, _box_sum
 from plantcv.plantcv import params
-from scipy.ndimage import generic_filter
 
 
 def stdev_filter(img, ksize, borders='nearest'):
     """
-    Creates a binary image from a grayscale image using skimage texture calculation for thresholding.
-    This function is quite slow.
+    Creates an image of the standard deviation of pixel values in the kernel around each pixel.
+    The standard deviation is calculated from box filtered sums and sums of squares (integral images).
 
     Inputs:
     gray_img       = Grayscale image data
@@ -27,11 +27,24 @@ def stdev_filter(img, ksize, borders='nearest'):
     :param borders: str
     :return output: numpy.ndarray
     """
-    # Make an array the same size as the original image
-    output = np.zeros(img.shape, dtype=img.dtype)
-
-    # Apply the texture function over the whole image
-    generic_filter(img, np.std, size=ksize, output=output, mode=borders)
+    window = (ksize,) * img.ndim
+    npix = ksize ** img.ndim
+    padded = _pad(img=img, ksize=ksize, borders=borders)
+
+    if np.issubdtype(img.dtype, np.integer):
+        # Integer sums are exact, so the variance only has a single rounding step
+        padded = padded.astype(np.int64)
+        sums = _box_sum(padded, window)
+        sq_sums = _box_sum(padded * padded, window)
+        variance = (npix * sq_sums - sums * sums) / float(npix * npix)
+    else:
+        # Center float data on its mean to limit cancellation in the sum of squares
+        padded = padded.astype(np.float64)
+        padded -= np.mean(padded)
+        mean = _box_sum(padded, window) / npix
+        variance = _box_sum(padded * padded, window) / npix - mean * mean
+
+    output = np.sqrt(np.clip(variance, 0, None)).astype(img.dtype)
 
     _debug(visual=output,
            filename=os.path.join(params.debug_outdir, str(params.device) + "_variance.png"))
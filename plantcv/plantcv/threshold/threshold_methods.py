@@ -4,12 +4,11 @@ import os
 import cv2
 import math
 import numpy as np
-from matplotlib import pyplot as plt
 from plantcv.plantcv import fatal_error
 from plantcv.plantcv import params
 from plantcv.plantcv._debug import _debug
-from skimage.feature import greycomatrix, greycoprops
-from scipy.ndimage import generic_filter
+from plantcv.plantcv._channel_bundle import _channel_bundle
+from plantcv.plantcv._filters import _pad, _box_sum
 
 
 # Binary threshold
@@ -243,6 +242,8 @@ def triangle(gray_img, max_value, object_type="light", xstep=1):
 
     # Additional figures created by this method, if debug is on
     if params.debug is not None:
+        # pyplot is only imported when debug figures are requested
+        from matplotlib import pyplot as plt
         if params.debug == 'print':
             _, ax = plt.subplots()
             ax.plot(hist)
@@ -267,9 +268,9 @@ def triangle(gray_img, max_value, object_type="light", xstep=1):
 
 
 def texture(gray_img, ksize, threshold, offset=3, texture_method='dissimilarity', borders='nearest',
-            max_value=255):
-    """Creates a binary image from a grayscale image using skimage texture calculation for thresholding.
-    This function is quite slow.
+            max_value=255, threads=1):
+    """Creates a binary image from a grayscale image using grey level co-occurrence matrix texture calculation for
+    thresholding.
 
     Inputs:
     gray_img       = Grayscale image data
@@ -283,6 +284,7 @@ def texture(gray_img, ksize, threshold, offset=3, texture_method='dissimilarity'
     borders        = How the array borders are handled, either 'reflect',
                      'constant', 'nearest', 'mirror', or 'wrap'
     max_value      = Value to apply above threshold (usually 255 = white)
+    threads        = Number of threads used to calculate the texture of blocks of image rows (default: 1)
 
     Returns:
     bin_img        = Thresholded, binary image
@@ -294,23 +296,36 @@ def texture(gray_img, ksize, threshold, offset=3, texture_method='dissimilarity'
     :param texture_method: str
     :param borders: str
     :param max_value: int
+    :param threads: int
     :return bin_img: numpy.ndarray
     """
-    # Function that calculates the texture of a kernel
-    def calc_texture(inputs):
-        inputs = np.reshape(a=inputs, newshape=[ksize, ksize])
-        inputs = inputs.astype(np.uint8)
-        # Greycomatrix takes image, distance offset, angles (in radians), symmetric, and normed
-        # http://scikit-image.org/docs/dev/api/skimage.feature.html#skimage.feature.greycomatrix
-        glcm = greycomatrix(inputs, [offset], [0], 256, symmetric=True, normed=True)
-        diss = greycoprops(glcm, texture_method)[0, 0]
-        return diss
+    if texture_method not in ["contrast", "dissimilarity", "homogeneity", "ASM", "energy", "correlation"]:
+        fatal_error(f"Texture method {texture_method} is not supported. Use 'contrast', 'dissimilarity', "
+                    "'homogeneity', 'ASM', 'energy', or 'correlation'")
+
+    # Gray levels of each kernel are calculated as 8-bit values
+    padded = _pad(img=gray_img, ksize=ksize, borders=borders).astype(np.uint8)
 
     # Make an array the same size as the original image
     output = np.zeros(gray_img.shape, dtype=gray_img.dtype)
 
-    # Apply the texture function over the whole image
-    generic_filter(gray_img, calc_texture, size=ksize, output=output, mode=borders)
+    def calc_texture(start, stop):
+        # Calculate the texture of a block of output rows from the padded rows the kernels cover
+        block = padded[start:stop + ksize - 1]
+        output[start:stop] = _texture_features(padded=block, ksize=ksize, offset=offset,
+                                               texture_method=texture_method)
+
+    # Split the image into blocks of rows
+    rows = gray_img.shape[0]
+    block_size = max(1, -(-rows // max(1, threads)))
+    blocks = [(start, min(rows, start + block_size)) for start in range(0, rows, block_size)]
+    if len(blocks) > 1:
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            list(executor.map(lambda block: calc_texture(*block), blocks))
+    else:
+        for start, stop in blocks:
+            calc_texture(start, stop)
 
     # Threshold so higher texture measurements stand out
     bin_img = binary(gray_img=output, threshold=threshold, max_value=max_value, object_type='light')
@@ -320,6 +335,79 @@ def texture(gray_img, ksize, threshold, offset=3, texture_method='dissimilarity'
     return bin_img
 
 
+def _texture_features(padded, ksize, offset, texture_method):
+    """Calculate a grey level co-occurrence matrix (GLCM) feature for every kernel of a padded grayscale image.
+
+    The GLCM of each kernel is symmetric and normalized, with a single horizontal distance offset, as in
+    skimage.feature.greycomatrix. The features are calculated from box filtered sums of the gray level pairs instead of
+    building a co-occurrence matrix for each kernel.
+
+    Inputs:
+    padded         = Padded uint8 grayscale image data
+    ksize          = Kernel size for texture measure calculation
+    offset         = Distance offset
+    texture_method = Feature of a grey level co-occurrence matrix
+
+    Returns:
+    features       = Texture feature values, shape is padded.shape - ksize + 1
+
+    :param padded: numpy.ndarray
+    :param ksize: int
+    :param offset: int
+    :param texture_method: str
+    :return features: numpy.ndarray
+    """
+    out_shape = (padded.shape[0] - ksize + 1, padded.shape[1] - ksize + 1)
+    # Number of pixel pairs in a kernel
+    pair_cols = ksize - offset
+    npairs = ksize * pair_cols
+    if npairs <= 0:
+        # Empty co-occurrence matrix, skimage reports a correlation of 1 and a value of 0 for the other features
+        return np.full(out_shape, 1.0 if texture_method == "correlation" else 0.0)
+
+    padded = padded.astype(np.int64)
+    # Reference and neighbor gray levels of every pixel pair
+    left = padded[:, :padded.shape[1] - offset]
+    right = padded[:, offset:]
+    window = (ksize, pair_cols)
+
+    if texture_method == "contrast":
+        return _box_sum((left - right) ** 2, window) / npairs
+    if texture_method == "dissimilarity":
+        return _box_sum(np.abs(left - right), window) / npairs
+    if texture_method == "homogeneity":
+        return _box_sum(1.0 / (1.0 + (left - right) ** 2), window) / npairs
+    if texture_method == "correlation":
+        # The symmetric GLCM has the same mean and variance for the reference and neighbor gray levels
+        mean = (_box_sum(left, window) + _box_sum(right, window)) / (2 * npairs)
+        var = (_box_sum(left * left, window) + _box_sum(right * right, window)) / (2 * npairs) - mean ** 2
+        cov = _box_sum(left * right, window) / npairs - mean ** 2
+        features = np.ones(out_shape)
+        nonzero = np.sqrt(np.clip(var, 0, None)) >= 1e-15
+        features[nonzero] = cov[nonzero] / var[nonzero]
+        return features
+    # ASM and energy: the sum of squared GLCM counts equals the number of ordered pixel pair combinations with the same
+    # (unordered) gray level pair, weighted by 4 on the GLCM diagonal and by 2 off the diagonal
+    codes = np.minimum(left, right) * 256 + np.maximum(left, right)
+    weights = np.where(left == right, 4, 2)
+    total = _box_sum(weights, window)
+    rows, cols = codes.shape
+    for drow in range(ksize):
+        for dcol in range(-pair_cols + 1, pair_cols):
+            # Only count each combination once (half plane of displacements), then double the count
+            if drow == 0 and dcol <= 0:
+                continue
+            # Matches are anchored at the top-left corner of the bounding box of the two pixel pairs
+            first = (slice(0, rows - drow), slice(max(0, -dcol), cols - max(0, dcol)))
+            second = (slice(drow, rows), slice(max(0, dcol), cols - max(0, -dcol)))
+            matches = np.where(codes[first] == codes[second], weights[first], 0)
+            total += 2 * _box_sum(matches, (ksize - drow, pair_cols - abs(dcol)))
+    asm = total / (2.0 * npairs) ** 2
+    if texture_method == "energy":
+        return np.sqrt(asm)
+    return asm
+
+
 def custom_range(img, lower_thresh, upper_thresh, channel='gray'):
     """Creates a thresholded image and mask from an RGB image and threshold values.
 
@@ -348,8 +436,8 @@ def custom_range(img, lower_thresh, upper_thresh, channel='gray'):
                         "upper_thresh. If thresholding isn't needed for a channel, set lower_thresh=0 and " +
                         "upper_thresh=255")
 
-        # Convert the RGB image to HSV colorspace
-        hsv_img = cv2.cvtColor(img, cv2.COLOR_BGR2HSV)
+        # Convert the RGB image to HSV colorspace (shared with other functions using the same image)
+        hsv_img = _channel_bundle(img).hsv
 
         # Separate channels
         hue = hsv_img[:, :, 0]
@@ -405,8 +493,8 @@ def custom_range(img, lower_thresh, upper_thresh, channel='gray'):
                         "upper_thresh. If thresholding isn't needed for a channel, set lower_thresh=0 and " +
                         "upper_thresh=255")
 
-        # Convert the RGB image to LAB colorspace
-        lab_img = cv2.cvtColor(img, cv2.COLOR_BGR2LAB)
+        # Convert the RGB image to LAB colorspace (shared with other functions using the same image)
+        lab_img = _channel_bundle(img).lab
 
         # Separate channels (pcv.readimage reads RGB images in as BGR)
         lightness = lab_img[:, :, 0]
@@ -434,8 +522,8 @@ def custom_range(img, lower_thresh, upper_thresh, channel='gray'):
             fatal_error("If useing a grayscale colorspace, 1 threshold is needed for both the " +
                         "lower_thresh and upper_thresh.")
         if len(np.shape(img)) == 3:
-            # Convert RGB image to grayscale colorspace
-            gray_img = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+            # Convert RGB image to grayscale colorspace (shared with other functions using the same image)
+            gray_img = _channel_bundle(img).gray
         else:
             gray_img = img
 
@@ -617,6 +705,7 @@ def _detect_peaks(x, mph=None, mpd=1, threshold=0, edge='rising', kpsh=False, va
 # Internal plotting function for the triangle autothreshold method
 def _plot(x, mph, mpd, threshold, edge, valley, ax, ind):
     """Plot results of the detect_peaks function, see its help."""
+    from matplotlib import pyplot as plt
     if ax is None:
         _, ax = plt.subplots(1, 1, figsize=(8, 4))
 
@@ -1,21 +1,29 @@
-from plantcv.plantcv.transform.color_correction import get_color_matrix
-from plantcv.plantcv.transform.color_correction import get_matrix_m
-from plantcv.plantcv.transform.color_correction import calc_transformation_matrix
-from plantcv.plantcv.transform.color_correction import apply_transformation_matrix
-from plantcv.plantcv.transform.color_correction import save_matrix
-from plantcv.plantcv.transform.color_correction import load_matrix
-from plantcv.plantcv.transform.color_correction import correct_color
-from plantcv.plantcv.transform.color_correction import create_color_card_mask
-from plantcv.plantcv.transform.color_correction import quick_color_check
-from plantcv.plantcv.transform.color_correction import find_color_card
-from plantcv.plantcv.transform.rescale import rescale
-from plantcv.plantcv.transform.rotate import rotate
-from plantcv.plantcv.transform.nonuniform_illumination import nonuniform_illumination
-from plantcv.plantcv.transform.resize import resize, resize_factor
-from plantcv.plantcv.transform.warp import warp, warp_align
-from plantcv.plantcv.transform.gamma_correct import gamma_correct
+from plantcv.plantcv._lazy_loader import _lazy_load
+
+# Functions are imported on first access, public name: (submodule, attribute)
+_lazy_load(__name__, {
+    "get_color_matrix": ("color_correction", "get_color_matrix"),
+    "get_matrix_m": ("color_correction", "get_matrix_m"),
+    "calc_transformation_matrix": ("color_correction", "calc_transformation_matrix"),
+    "apply_transformation_matrix": ("color_correction", "apply_transformation_matrix"),
+    "save_matrix": ("color_correction", "save_matrix"),
+    "load_matrix": ("color_correction", "load_matrix"),
+    "correct_color": ("color_correction", "correct_color"),
+    "create_color_card_mask": ("color_correction", "create_color_card_mask"),
+    "quick_color_check": ("color_correction", "quick_color_check"),
+    "find_color_card": ("color_correction", "find_color_card"),
+    "clear_color_card_cache": ("color_correction", "clear_color_card_cache"),
+    "rescale": ("rescale", "rescale"),
+    "rotate": ("rotate", "rotate"),
+    "nonuniform_illumination": ("nonuniform_illumination", "nonuniform_illumination"),
+    "resize": ("resize", "resize"),
+    "resize_factor": ("resize", "resize_factor"),
+    "warp": ("warp", "warp"),
+    "warp_align": ("warp", "warp_align"),
+    "gamma_correct": ("gamma_correct", "gamma_correct"),
+})
 
 __all__ = ["get_color_matrix", "get_matrix_m", "calc_transformation_matrix", "apply_transformation_matrix",
            "save_matrix", "load_matrix", "correct_color", "create_color_card_mask", "quick_color_check",
-           "find_color_card", "rescale", "nonuniform_illumination", "resize", "resize_factor",
+           "find_color_card", "clear_color_card_cache", "rescale", "nonuniform_illumination", "resize", "resize_factor",
            "warp", "rotate", "warp", "warp_align", "gamma_correct"]
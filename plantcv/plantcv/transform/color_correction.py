@@ -1,6 +1,7 @@
 # Color Corrections Functions
 
 import os
+import sys
 import cv2
 import numpy as np
 from plantcv.plantcv import params
@@ -35,37 +36,77 @@ def get_color_matrix(rgb_img, mask):
     if len(np.shape(mask)) != 2:
         fatal_error("Input mask is not an gray-scale image.")
 
-    img_dtype = rgb_img.dtype
-    # normalization value as max number if the type is unsigned int
-    max_val = 1.0
-    if img_dtype.kind == 'u':
-        max_val = np.iinfo(img_dtype).max
-
-    # convert to float and normalize to work with values between 0-1
-    rgb_img = rgb_img.astype(np.float64)/max_val
+    chip_stats = _ColorChipStats(rgb_img=rgb_img, mask=mask)
 
-    # create empty color_matrix
-    color_matrix = np.zeros((len(np.unique(mask))-1, 4))
+    # The average values of chips with saturated pixels are too low, which skews the color correction matrix fit
+    if np.any(chip_stats.saturated) and params.verbose:
+        saturated_chips = ", ".join(str(chip) for chip in chip_stats.chips[chip_stats.saturated])
+        print(f"Warning: color chips {saturated_chips} have saturated pixels, their average values are too low. "
+              "Check them with plantcv.transform.quick_color_check.", file=sys.stderr)
 
     # create headers
     headers = ["chip_number", "r_avg", "g_avg", "b_avg"]
 
-    # declare row_counter variable and initialize to 0
-    row_counter = 0
-
-    # for each unique color chip calculate each average RGB value
-    for i in np.unique(mask):
-        if i != 0:
-            chip = rgb_img[np.where(mask == i)]
-            color_matrix[row_counter][0] = i
-            color_matrix[row_counter][1] = np.mean(chip[:, 2])
-            color_matrix[row_counter][2] = np.mean(chip[:, 1])
-            color_matrix[row_counter][3] = np.mean(chip[:, 0])
-            row_counter += 1
+    # color_matrix has a row for each unique color chip with the chip number and the average RGB values
+    color_matrix = np.column_stack((chip_stats.chips, chip_stats.mean))
 
     return headers, color_matrix
 
 
+class _ColorChipStats:
+    """Statistics of the pixels of each color chip, computed in one pass over the labeled chip mask.
+
+    The pixels of all chips are grouped by chip once (in image order), instead of searching the whole mask for each
+    chip. Values are normalized between 0-1 like in get_color_matrix.
+    """
+
+    def __init__(self, rgb_img, mask):
+        """Compute the statistics of each color chip.
+
+        Keyword arguments/parameters:
+        rgb_img = RGB image with color chips visualized
+        mask    = a gray-scale img with unique values for each segmented space, representing unique, discrete
+                  color chips (0 = background)
+
+        Attributes:
+        chips     = chip numbers (unique nonzero mask values, sorted)
+        count     = number of pixels in each chip
+        mean      = average red, green, and blue value of each chip (n x 3)
+        std       = standard deviation of the red, green, and blue values of each chip (n x 3)
+        saturated = True for chips with pixels at the maximum value of any channel
+
+        :param rgb_img: numpy.ndarray
+        :param mask: numpy.ndarray
+        """
+        # normalization value as max number if the type is unsigned int
+        max_val = 1.0
+        if rgb_img.dtype.kind == 'u':
+            max_val = np.iinfo(rgb_img.dtype).max
+
+        # Positions of the chip pixels, grouped by chip (a stable sort keeps the pixels of a chip in image order)
+        labels = mask.ravel()
+        chip_pixels = np.flatnonzero(labels)
+        chip_pixels = chip_pixels[np.argsort(labels[chip_pixels], kind="stable")]
+        self.chips, starts, self.count = np.unique(labels[chip_pixels], return_index=True, return_counts=True)
+
+        # BGR values of the chip pixels
+        pixels = rgb_img.reshape(-1, rgb_img.shape[-1])[chip_pixels]
+        self.saturated = np.zeros(len(self.chips), dtype=bool)
+        if len(self.chips) > 0:
+            self.saturated = np.any(np.maximum.reduceat(pixels, starts) >= max_val, axis=1)
+        # convert to float and normalize to work with values between 0-1
+        pixels = pixels.astype(np.float64) / max_val
+
+        self.mean = np.zeros((len(self.chips), 3))
+        self.std = np.zeros((len(self.chips), 3))
+        for row, (start, count) in enumerate(zip(starts, self.count)):
+            chip = pixels[start:start + count]
+            # red, green, and blue are the channels 2, 1, and 0 of the BGR image
+            for col, channel in enumerate((2, 1, 0)):
+                self.mean[row, col] = np.mean(chip[:, channel])
+                self.std[row, col] = np.std(chip[:, channel])
+
+
 def get_matrix_m(target_matrix, source_matrix):
     """Calculate Moore-Penrose inverse matrix for use in calculating transformation_matrix
 
@@ -92,19 +133,17 @@ def get_matrix_m(target_matrix, source_matrix):
         t_cc, t_r, t_g, t_b = np.split(target_matrix, 4, 1)
         s_cc, s_r, s_g, s_b = np.split(source_matrix, 4, 1)
     else:
+        # pair the target and source chips with the same chip number
+        source_rows = {}
+        for i, chip in enumerate(source_matrix[:, 0]):
+            source_rows.setdefault(chip, []).append(i)
+        pairs = [(r, i) for r, chip in enumerate(target_matrix[:, 0]) for i in source_rows.get(chip, [])]
+        # rows without a pair stay 0
         combined_matrix = np.zeros((np.ma.size(source_matrix, 0), 7))
-        row_count = 0
-        for r in range(0, np.ma.size(target_matrix, 0)):
-            for i in range(0, np.ma.size(source_matrix, 0)):
-                if target_matrix[r][0] == source_matrix[i][0]:
-                    combined_matrix[row_count][0] = target_matrix[r][0]
-                    combined_matrix[row_count][1] = target_matrix[r][1]
-                    combined_matrix[row_count][2] = target_matrix[r][2]
-                    combined_matrix[row_count][3] = target_matrix[r][3]
-                    combined_matrix[row_count][4] = source_matrix[i][1]
-                    combined_matrix[row_count][5] = source_matrix[i][2]
-                    combined_matrix[row_count][6] = source_matrix[i][3]
-                    row_count += 1
+        if pairs:
+            t_rows, s_rows = np.transpose(pairs)
+            combined_matrix[:len(pairs), 0:4] = target_matrix[t_rows, 0:4]
+            combined_matrix[:len(pairs), 4:7] = source_matrix[s_rows, 1:4]
         t_cc, t_r, t_g, t_b, s_r, s_g, s_b = np.split(combined_matrix, 7, 1)
     t_r2 = np.square(t_r)
     t_r3 = np.power(t_r, 3)
@@ -206,53 +245,124 @@ def apply_transformation_matrix(source_img, target_img, transformation_matrix):
     if len(np.shape(source_img)) != 3:
         fatal_error("Source_img is not an RGB image.")
 
-    # split transformation_matrix
-    red, green, blue, red2, green2, blue2, red3, green3, blue3 = np.split(transformation_matrix, 9, 1)
-
     source_dtype = source_img.dtype
     # normalization value as max number if the type is unsigned int
     max_val = 1.0
     if source_dtype.kind == 'u':
         max_val = np.iinfo(source_dtype).max
-    # convert img to float to avoid integer overflow, normalize between 0-1
-    source_flt = source_img.astype(np.float64)/max_val
-    # find linear, square, and cubic values of source_img color channels
-    source_b, source_g, source_r = cv2.split(source_flt)
-    source_b2 = np.square(source_b)
-    source_b3 = np.power(source_b, 3)
-    source_g2 = np.square(source_g)
-    source_g3 = np.power(source_g, 3)
-    source_r2 = np.square(source_r)
-    source_r3 = np.power(source_r, 3)
-
-    # apply linear model to source color channels
-    b = 0 + source_r * blue[0] + source_g * blue[1] + source_b * blue[2] + source_r2 * blue[3] + source_g2 * blue[
-        4] + source_b2 * blue[5] + source_r3 * blue[6] + source_g3 * blue[7] + source_b3 * blue[8]
-    g = 0 + source_r * green[0] + source_g * green[1] + source_b * green[2] + source_r2 * green[3] + source_g2 * green[
-        4] + source_b2 * green[5] + source_r3 * green[6] + source_g3 * green[7] + source_b3 * green[8]
-    r = 0 + source_r * red[0] + source_g * red[1] + source_b * red[2] + source_r2 * red[3] + source_g2 * red[
-        4] + source_b2 * red[5] + source_r3 * red[6] + source_g3 * red[7] + source_b3 * red[8]
-
-    # merge corrected color channels onto source_image
-    bgr = [b, g, r]
-    corrected_img = cv2.merge(bgr)
-
-    # return values of the image to the original range
-    corrected_img = max_val*np.clip(corrected_img, 0, 1)
-    # cast back to original dtype (if uint the value defaults to the closest smaller integer)
-    corrected_img = corrected_img.astype(source_dtype)
+
+    # The red, green, and blue columns of transformation_matrix hold the coefficients of the linear, square, and cubic
+    # values of the source red, green, and blue channels (rows r, g, b, r2, g2, b2, r3, g3, b3)
+    coefs = np.asarray(transformation_matrix, dtype=np.float64)[:, :3]
+
+    if source_dtype.kind == 'u' and source_dtype.itemsize <= 2:
+        corrected_img = _apply_transformation_lut(source_img, coefs, max_val)
+    else:
+        corrected_img = _apply_transformation_poly(source_img, coefs, max_val)
+        # return values of the image to the original range
+        corrected_img = max_val * np.clip(corrected_img, 0, 1)
+        # cast back to original dtype (if uint the value defaults to the closest smaller integer)
+        corrected_img = corrected_img.astype(source_dtype)
 
     # For debugging, create a horizontal view of source_img, corrected_img, and target_img to the plotting device
     # plot horizontal comparison of source_img, corrected_img (with rounded elements) and target_img
-    out_img = np.hstack([source_img, corrected_img, target_img])
-    # Change range of visualization image to 0-255 and convert to uin8
-    out_img = ((255.0/max_val)*out_img).astype(np.uint8)
+    out_img = None
+    if params.debug is not None:
+        out_img = np.hstack([source_img, corrected_img, target_img])
+        # Change range of visualization image to 0-255 and convert to uin8
+        out_img = ((255.0/max_val)*out_img).astype(np.uint8)
     _debug(visual=out_img, filename=os.path.join(params.debug_outdir, str(params.device) + '_corrected.png'))
 
     # return corrected_img
     return corrected_img
 
 
+def _apply_transformation_lut(source_img, coefs, max_val):
+    """Apply transformation coefficients to an 8-bit or 16-bit unsigned integer RGB image with lookup tables.
+
+    Each corrected channel is a sum of polynomials of single source channels (no cross terms), so the contribution of
+    every possible value of each source channel to each corrected channel is computed once and looked up per pixel.
+
+    Inputs:
+    source_img    = an RGB (BGR) image to be corrected
+    coefs         = a 9x3 matrix of the red, green, and blue transformation coefficients
+    max_val       = maximum value of the source image data type
+
+    Returns:
+    corrected_img = an RGB image in correct color space
+
+    :param source_img: numpy.ndarray
+    :param coefs: numpy.ndarray
+    :param max_val: int
+    :return corrected_img: numpy.ndarray
+    """
+    # Normalized linear, square, and cubic values of every possible pixel value
+    values = np.arange(max_val + 1, dtype=np.float64) / max_val
+    powers = np.stack([values, np.square(values), np.power(values, 3)])
+    # luts[o, c] is the contribution of source channel c (r, g, b) to corrected channel o (r, g, b)
+    luts = np.einsum("pco,pv->ocv", coefs.reshape(3, 3, 3), powers)
+
+    corrected_img = np.empty(source_img.shape, dtype=source_img.dtype)
+    # Work on blocks of rows so that the floating point intermediates stay small
+    block = max(1, 2 ** 20 // max(1, source_img.shape[1]))
+    for y in range(0, source_img.shape[0], block):
+        source_b, source_g, source_r = cv2.split(source_img[y:y + block])
+        for o, channel in zip((0, 1, 2), (2, 1, 0)):
+            flt = _lookup(luts[o, 0], source_r)
+            flt += _lookup(luts[o, 1], source_g)
+            flt += _lookup(luts[o, 2], source_b)
+            # return values of the image to the original range, cast back to the original dtype (if uint the value
+            # defaults to the closest smaller integer)
+            np.clip(flt, 0, 1, out=flt)
+            flt *= max_val
+            corrected_img[y:y + block, :, channel] = flt
+    return corrected_img
+
+
+def _lookup(lut, values):
+    """Look up the values of an unsigned integer image in a 1D table."""
+    if values.dtype == np.uint8:
+        # cv2.LUT is faster than numpy indexing for 8-bit images
+        return cv2.LUT(values, lut.reshape(1, -1))
+    return lut[values]
+
+
+def _apply_transformation_poly(source_img, coefs, max_val):
+    """Apply transformation coefficients to an RGB image in a single float32 pass.
+
+    Inputs:
+    source_img    = an RGB (BGR) image to be corrected
+    coefs         = a 9x3 matrix of the red, green, and blue transformation coefficients
+    max_val       = value that normalizes the source image between 0-1
+
+    Returns:
+    corrected_img = corrected (BGR) float32 image, normalized between 0-1
+
+    :param source_img: numpy.ndarray
+    :param coefs: numpy.ndarray
+    :param max_val: numeric
+    :return corrected_img: numpy.ndarray
+    """
+    source_flt = source_img.astype(np.float32)
+    source_flt /= np.float32(max_val)
+    source_b, source_g, source_r = cv2.split(source_flt)
+    coefs = coefs.astype(np.float32)
+    corrected = []
+    # corrected blue, green, and red channels (coefficient columns 2, 1, 0)
+    for o in (2, 1, 0):
+        flt = np.zeros(source_r.shape, dtype=np.float32)
+        # Horner's rule for the polynomial of each source channel, c3*x^3 + c2*x^2 + c1*x = ((c3*x + c2)*x + c1)*x
+        for c, channel in enumerate((source_r, source_g, source_b)):
+            term = channel * coefs[6 + c, o]
+            term += coefs[3 + c, o]
+            term *= channel
+            term += coefs[c, o]
+            term *= channel
+            flt += term
+        corrected.append(flt)
+    return cv2.merge(corrected)
+
+
 def save_matrix(matrix, filename):
     """Serializes a matrix as an numpy.ndarray object and save to a .npz file.
     Inputs:
@@ -477,8 +587,24 @@ def quick_color_check(target_matrix, source_matrix, num_chips):
     _debug(visual=p1, filename=os.path.join(params.debug_outdir, 'color_quick_check.png'))
 
 
+# Color cards found by find_color_card in fixed camera views, keyed by the cache_key and the detection settings
+_color_card_cache = {}
+
+
+def clear_color_card_cache(cache_key=None):
+    """Forget the color cards that find_color_card found in fixed camera views
+
+    Inputs:
+    cache_key = Key of the camera view to forget (default None, all camera views)
+
+    :param cache_key: str
+    """
+    for key in [key for key in _color_card_cache if cache_key is None or key[0] == cache_key]:
+        del _color_card_cache[key]
+
+
 def find_color_card(rgb_img, threshold_type='adaptgauss', threshvalue=125, blurry=False, background='dark',
-                    record_chip_size="median", label="default"):
+                    record_chip_size="median", label="default", cache_key=None):
     """Automatically detects a color card and output info to use in create_color_card_mask function
 
     Algorithm written by Brandon Hurr. Updated and implemented into PlantCV by Haley Schuhl.
@@ -494,6 +620,9 @@ def find_color_card(rgb_img, threshold_type='adaptgauss', threshvalue=125, blurr
     record_chip_size = Optional str for choosing chip size measurement to be recorded, either "median",
                         "mean", or None
     label            = optional label parameter, modifies the variable name of observations recorded (default 'default')
+    cache_key        = optional key of a fixed camera view (e.g. camera and zoom metadata). The card found in an image is
+                        reused for later images with the same key (and settings) if its chips are still in place
+                        (default None, no caching). Cached cards are cleared with clear_color_card_cache
 
     Returns:
     df             = Dataframe containing information about the filtered contours
@@ -507,6 +636,91 @@ def find_color_card(rgb_img, threshold_type='adaptgauss', threshvalue=125, blurr
     :param background: str
     :param record_chip_size: str
     :param label: str
+    :param cache_key: str
+    :return df: pandas.core.frame.DataFrame
+    :return start_coord: tuple
+    :return spacing: tuple
+    """
+    # Create gray image for further processing
+    gray_img = cv2.cvtColor(rgb_img, cv2.COLOR_BGR2GRAY)
+
+    # Laplacian Fourier Transform detection of blurriness
+    blurfactor = cv2.Laplacian(gray_img, cv2.CV_64F).var()
+
+    # In a fixed camera view the card found in a previous image is reused if its chips are still in place
+    key = None
+    cached = None
+    if cache_key is not None:
+        key = (cache_key, rgb_img.shape, threshold_type.upper(), threshvalue, blurry, background)
+        cached = _color_card_cache.get(key)
+    if cached is not None and _same_color_card(cached=cached, gray_img=gray_img):
+        df = cached["df"].assign(blurriness=blurfactor)
+        start_coord = cached["start_coord"]
+        spacing = cached["spacing"]
+    else:
+        df, start_coord, spacing = _detect_color_card(gray_img=gray_img, blurfactor=blurfactor,
+                                                      threshold_type=threshold_type, threshvalue=threshvalue,
+                                                      blurry=blurry, background=background)
+        if key is not None:
+            window = _color_card_window(gray_img, df)
+            _color_card_cache[key] = {"df": df.copy(), "start_coord": start_coord, "spacing": spacing,
+                                      "signature": _color_card_signature(gray_img, df), "window": window,
+                                      "patch": gray_img[window].astype(np.float32)}
+
+    if record_chip_size is not None:
+        if record_chip_size.upper() == "MEDIAN":
+            chip_size = df.loc[:, "area"].median()
+            chip_height = df.loc[:, "height"].median()
+            chip_width = df.loc[:, "width"].median()
+        elif record_chip_size.upper() == "MEAN":
+            chip_size = df.loc[:, "area"].mean()
+            chip_height = df.loc[:, "height"].mean()
+            chip_width = df.loc[:, "width"].mean()
+        else:
+            print(str(record_chip_size) + " Is not a valid entry for record_chip_size." +
+                  " Must be either 'mean', 'median', or None.")
+            chip_size = None
+            chip_height = None
+            chip_width = None
+        # Store into global measurements
+        outputs.add_observation(sample=label, variable='color_chip_size', trait='size of color card chips identified',
+                                method='plantcv.plantcv.transform.find_color_card', scale='none',
+                                datatype=float, value=chip_size, label=str(record_chip_size))
+        method = record_chip_size.lower()
+        outputs.add_observation(sample=label, variable=f'{method}_color_chip_height',
+                                trait=f'{method} height of color card chips identified',
+                                method='plantcv.plantcv.transform.find_color_card', scale='none',
+                                datatype=float, value=chip_height, label=str(record_chip_size))
+        outputs.add_observation(sample=label, variable=f'{method}_color_chip_width',
+                                trait=f'{method} size of color card chips identified',
+                                method='plantcv.plantcv.transform.find_color_card', scale='none',
+                                datatype=float, value=chip_width, label=str(record_chip_size))
+
+    return df, start_coord, spacing
+
+
+def _detect_color_card(gray_img, blurfactor, threshold_type, threshvalue, blurry, background):
+    """Detect the chips of a color card in a gray-scale image (the detection part of find_color_card).
+
+    Inputs:
+    gray_img       = Gray-scale version of the input RGB image
+    blurfactor     = Blurriness (variance of the Laplacian) of gray_img
+    threshold_type = Threshold method, either 'normal', 'otsu', or 'adaptgauss'
+    threshvalue    = Thresholding value
+    blurry         = Bool, if True then image sharpening applied
+    background     = Type of image background either 'dark' or 'light'
+
+    Returns:
+    df             = Dataframe containing information about the filtered contours
+    start_coord    = Two element tuple of starting coordinates, location of the top left pixel detected
+    spacing        = Two element tuple of spacing between centers of chips
+
+    :param gray_img: numpy.ndarray
+    :param blurfactor: float
+    :param threshold_type: str
+    :param threshvalue: int
+    :param blurry: bool
+    :param background: str
     :return df: pandas.core.frame.DataFrame
     :return start_coord: tuple
     :return spacing: tuple
@@ -517,19 +731,13 @@ def find_color_card(rgb_img, threshold_type='adaptgauss', threshvalue=125, blurr
     from scipy.spatial.distance import squareform, pdist
 
     # Get image attributes
-    height, width, channels = rgb_img.shape
+    height, width = gray_img.shape
     total_pix = float(height * width)
 
     # Minimum and maximum square size based upon 12 MP image
     min_area = 1000. / 12000000. * total_pix
     max_area = 8000000. / 12000000. * total_pix
 
-    # Create gray image for further processing
-    gray_img = cv2.cvtColor(rgb_img, cv2.COLOR_BGR2GRAY)
-
-    # Laplacian Fourier Transform detection of blurriness
-    blurfactor = cv2.Laplacian(gray_img, cv2.CV_64F).var()
-
     # If image is blurry then try to deblur using kernel
     if blurry:
         # from https://www.packtpub.com/mapt/book/Application+Development/9781785283932/2/ch02lvl1sec22/Sharpening
@@ -665,30 +873,23 @@ def find_color_card(rgb_img, threshold_type='adaptgauss', threshvalue=125, blurr
     # Squares that are within 6 widths of the current square
     pixeldist = median_sq_width_px * 6
     # Computes euclidean distance matrix for the x and y contour centroids
-    distmatrix = pd.DataFrame(squareform(pdist(df[['x', 'y']])))
+    distmatrix = squareform(pdist(df[['x', 'y']]))
     # Add up distances that are less than  ones have distance less than pixeldist pixels
-    distmatrixflat = distmatrix.apply(lambda dist: dist[dist <= pixeldist].count() - 1, axis=1)
+    distmatrixflat = np.count_nonzero(distmatrix <= pixeldist, axis=1) - 1
 
     # Append distprox summary to dataframe
-    df = df.assign(distprox=distmatrixflat.values)
+    df = df.assign(distprox=distmatrixflat)
 
     # Compute how similar in area the squares are. lots of similar values indicates card isolate area measurements
-    filtered_area = df['area']
-    # Create empty matrix for storing comparisons
-    sizecomp = np.zeros((len(filtered_area), len(filtered_area)))
-    # Double loop through all areas to compare to each other
-    for p in range(0, len(filtered_area)):
-        for o in range(0, len(filtered_area)):
-            big = max(filtered_area.iloc[p], filtered_area.iloc[o])
-            small = min(filtered_area.iloc[p], filtered_area.iloc[o])
-            pct = 100. * (small / big)
-            sizecomp[p][o] = pct
+    filtered_area = df['area'].to_numpy()
+    # Compare all areas to each other, percent of the smaller area relative to the bigger area
+    sizecomp = 100. * (np.minimum.outer(filtered_area, filtered_area) / np.maximum.outer(filtered_area, filtered_area))
 
     # How many comparisons given 90% square similarity
-    sizematrix = pd.DataFrame(sizecomp).apply(lambda sim: sim[sim >= 90].count() - 1, axis=1)
+    sizematrix = np.count_nonzero(sizecomp >= 90, axis=1) - 1
 
     # Append sizeprox summary to dataframe
-    df = df.assign(sizeprox=sizematrix.values)
+    df = df.assign(sizeprox=sizematrix)
 
     # Reorder dataframe for better printing
     df = df[['index', 'x', 'y', 'width', 'height', 'res_ratio', 'area', 'square', 'child',
@@ -708,12 +909,12 @@ def find_color_card(rgb_img, threshold_type='adaptgauss', threshvalue=125, blurr
     # Squares that are within 6 widths of the current square
     pixeldist = median_sq_width_px * 5
     # Computes euclidean distance matrix for the x and y contour centroids
-    distmatrix = pd.DataFrame(squareform(pdist(df[['x', 'y']])))
+    distmatrix = squareform(pdist(df[['x', 'y']]))
     # Add up distances that are less than  ones have distance less than pixeldist pixels
-    distmatrixflat = distmatrix.apply(lambda dist: dist[dist <= pixeldist].count() - 1, axis=1)
+    distmatrixflat = np.count_nonzero(distmatrix <= pixeldist, axis=1) - 1
 
     # Append distprox summary to dataframe
-    df = df.assign(distprox=distmatrixflat.values)
+    df = df.assign(distprox=distmatrixflat)
 
     # Filter results for distance proximity to other squares
     df = df[(df['distprox'] >= 4)]
@@ -743,33 +944,85 @@ def find_color_card(rgb_img, threshold_type='adaptgauss', threshvalue=125, blurr
         spacing = int(max(spacing_short, spacing_long))
         spacing = (spacing, spacing)
 
-    if record_chip_size is not None:
-        if record_chip_size.upper() == "MEDIAN":
-            chip_size = df.loc[:, "area"].median()
-            chip_height = df.loc[:, "height"].median()
-            chip_width = df.loc[:, "width"].median()
-        elif record_chip_size.upper() == "MEAN":
-            chip_size = df.loc[:, "area"].mean()
-            chip_height = df.loc[:, "height"].mean()
-            chip_width = df.loc[:, "width"].mean()
-        else:
-            print(str(record_chip_size) + " Is not a valid entry for record_chip_size." +
-                  " Must be either 'mean', 'median', or None.")
-            chip_size = None
-            chip_height = None
-            chip_width = None
-        # Store into global measurements
-        outputs.add_observation(sample=label, variable='color_chip_size', trait='size of color card chips identified',
-                                method='plantcv.plantcv.transform.find_color_card', scale='none',
-                                datatype=float, value=chip_size, label=str(record_chip_size))
-        method = record_chip_size.lower()
-        outputs.add_observation(sample=label, variable=f'{method}_color_chip_height',
-                                trait=f'{method} height of color card chips identified',
-                                method='plantcv.plantcv.transform.find_color_card', scale='none',
-                                datatype=float, value=chip_height, label=str(record_chip_size))
-        outputs.add_observation(sample=label, variable=f'{method}_color_chip_width',
-                                trait=f'{method} size of color card chips identified',
-                                method='plantcv.plantcv.transform.find_color_card', scale='none',
-                                datatype=float, value=chip_width, label=str(record_chip_size))
-
     return df, start_coord, spacing
+
+
+def _color_card_signature(gray_img, df):
+    """Mean gray value of a window at the center of each color card chip.
+
+    Inputs:
+    gray_img  = Gray-scale image
+    df        = Dataframe of color card chips (find_color_card)
+
+    Returns:
+    signature = Array of mean chip values
+
+    :param gray_img: numpy.ndarray
+    :param df: pandas.core.frame.DataFrame
+    :return signature: numpy.ndarray
+    """
+    height, width = gray_img.shape
+    # The windows are half as wide as the chips
+    half = max(int(df["width"].median() / 4), 1)
+    signature = np.zeros(len(df))
+    for i, (x, y) in enumerate(zip(df["x"].astype(int), df["y"].astype(int))):
+        window = gray_img[max(y - half, 0):min(y + half + 1, height), max(x - half, 0):min(x + half + 1, width)]
+        if window.size > 0:
+            signature[i] = np.mean(window)
+    return signature
+
+
+def _color_card_window(gray_img, df):
+    """Part of an image that holds the chips of a color card, with a margin of one chip width.
+
+    Inputs:
+    gray_img = Gray-scale image
+    df       = Dataframe of color card chips (find_color_card)
+
+    Returns:
+    window   = Tuple of row and column slices
+
+    :param gray_img: numpy.ndarray
+    :param df: pandas.core.frame.DataFrame
+    :return window: tuple
+    """
+    height, width = gray_img.shape
+    margin = int(df["width"].median())
+    x0 = max(int((df["x"] - df["width"] / 2).min()) - margin, 0)
+    x1 = min(int((df["x"] + df["width"] / 2).max()) + margin, width)
+    y0 = max(int((df["y"] - df["height"] / 2).min()) - margin, 0)
+    y1 = min(int((df["y"] + df["height"] / 2).max()) + margin, height)
+    return slice(y0, y1), slice(x0, x1)
+
+
+def _same_color_card(cached, gray_img):
+    """Check that the chips of a color card are in the same place in a new image.
+
+    The chip values of the two images have to be strongly correlated (allows for some change of exposure), which
+    fails if a chip is covered or the card moved by a large amount. Small moves (a few pixels) barely change the chip
+    values, so the shift between the card windows of the two images is also measured with phase correlation and may
+    be at most one pixel.
+
+    Inputs:
+    cached   = Color card found in a previous image (find_color_card cache entry)
+    gray_img = Gray-scale new image
+
+    Returns:
+    same     = True if the card is in the same place
+
+    :param cached: dict
+    :param gray_img: numpy.ndarray
+    :return same: bool
+    """
+    signature = cached["signature"]
+    new_signature = _color_card_signature(gray_img, cached["df"])
+    if len(signature) < 2 or np.std(signature) == 0 or np.std(new_signature) == 0:
+        return False
+    if np.corrcoef(signature, new_signature)[0, 1] < 0.95:
+        return False
+    patch = cached["patch"]
+    if min(patch.shape) < 2:
+        return False
+    hanning = cv2.createHanningWindow((patch.shape[1], patch.shape[0]), cv2.CV_32F)
+    (shift_x, shift_y), _ = cv2.phaseCorrelate(patch, gray_img[cached["window"]].astype(np.float32), hanning)
+    return bool(max(abs(shift_x), abs(shift_y)) <= 1)
@@ -1,14 +1,19 @@
-from plantcv.plantcv.visualize.pseudocolor import pseudocolor
-from plantcv.plantcv.visualize.colorize_masks import colorize_masks
-from plantcv.plantcv.visualize.histogram import histogram
-from plantcv.plantcv.visualize.clustered_contours import clustered_contours
-from plantcv.plantcv.visualize.colorspaces import colorspaces
-from plantcv.plantcv.visualize.auto_threshold_methods import auto_threshold_methods
-from plantcv.plantcv.visualize.overlay_two_imgs import overlay_two_imgs
-from plantcv.plantcv.visualize.colorize_label_img import colorize_label_img
-from plantcv.plantcv.visualize.obj_sizes import obj_sizes
-from plantcv.plantcv.visualize.obj_size_ecdf import obj_size_ecdf
-from plantcv.plantcv.visualize.hyper_histogram import hyper_histogram
+from plantcv.plantcv._lazy_loader import _lazy_load
+
+# Functions are imported on first access, public name: (submodule, attribute)
+_lazy_load(__name__, {
+    "pseudocolor": ("pseudocolor", "pseudocolor"),
+    "colorize_masks": ("colorize_masks", "colorize_masks"),
+    "histogram": ("histogram", "histogram"),
+    "clustered_contours": ("clustered_contours", "clustered_contours"),
+    "colorspaces": ("colorspaces", "colorspaces"),
+    "auto_threshold_methods": ("auto_threshold_methods", "auto_threshold_methods"),
+    "overlay_two_imgs": ("overlay_two_imgs", "overlay_two_imgs"),
+    "colorize_label_img": ("colorize_label_img", "colorize_label_img"),
+    "obj_sizes": ("obj_sizes", "obj_sizes"),
+    "obj_size_ecdf": ("obj_size_ecdf", "obj_size_ecdf"),
+    "hyper_histogram": ("hyper_histogram", "hyper_histogram"),
+})
 
 __all__ = ["pseudocolor", "colorize_masks", "histogram", "clustered_contours", "colorspaces", "auto_threshold_methods",
            "overlay_two_imgs", "colorize_label_img", "obj_size_ecdf", "obj_sizes", "hyper_histogram"]
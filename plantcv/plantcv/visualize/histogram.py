@@ -6,6 +6,7 @@ from plantcv.plantcv.threshold import binary as binary_threshold
 from plantcv.plantcv import params
 from plantcv.plantcv import fatal_error
 from plantcv.plantcv._debug import _debug
+from plantcv.plantcv._lazy_figure import LazyFigure
 import pandas as pd
 from plotnine import ggplot, aes, geom_line, labels, scale_color_manual
 
@@ -116,9 +117,8 @@ def histogram(img, mask=None, bins=100, lower_bound=None, upper_bound=None, titl
     if len(img.shape) == 2:
         bin_labels, hist_percent, hist_ = _hist_gray(img, bins=bins, lower_bound=lower_bound, upper_bound=upper_bound,
                                                      mask=mask)
-        hist_df = pd.DataFrame(
-            {'pixel intensity': bin_labels, 'proportion of pixels (%)': hist_percent, 'hist_count': hist_,
-             'color channel': ['0' for _ in range(len(hist_percent))]})
+        hist_columns = {'pixel intensity': bin_labels, 'proportion of pixels (%)': hist_percent, 'hist_count': hist_,
+                        'color channel': ['0' for _ in range(len(hist_percent))]}
     else:
         # Assumption: RGB image
         # Initialize dataframe column arrays
@@ -134,23 +134,45 @@ def histogram(img, mask=None, bins=100, lower_bound=None, upper_bound=None, titl
             prop = np.append(prop, hist_percent)
             hist_count = np.append(hist_count, hist_)
             channel = channel + [b_name for _ in range(len(hist_percent))]
+        hist_columns = {'pixel intensity': px_int, 'proportion of pixels (%)': prop, 'hist_count': hist_count,
+                        'color channel': channel}
+
+    # The figure is only made when it is used
+    fig_hist = LazyFigure(_hist_fig, hist_columns=hist_columns, title=title,
+                          rgb=len(img.shape) > 2 and img.shape[2] == 3)
+
+    # Plot or print the histogram
+    _debug(visual=fig_hist, filename=os.path.join(params.debug_outdir, str(params.device) + '_hist.png'))
+
+    if hist_data is True:
         # Create dataframe
-        hist_df = pd.DataFrame(
-            {'pixel intensity': px_int, 'proportion of pixels (%)': prop, 'hist_count': hist_count,
-             'color channel': channel})
+        return fig_hist, pd.DataFrame(hist_columns)
+    return fig_hist
+
+
+def _hist_fig(hist_columns, title, rgb):
+    """Make the histogram figure.
+
+    Inputs:
+    hist_columns = Dictionary of histogram data columns
+    title        = a custom title for the plot, or None
+    rgb          = True if the histogram is of an RGB image
+
+    Returns:
+    fig_hist     = histogram figure
 
-    fig_hist = (ggplot(data=hist_df,
+    :param hist_columns: dict
+    :param title: str
+    :param rgb: bool
+    :return fig_hist: plotnine.ggplot.ggplot
+    """
+    fig_hist = (ggplot(data=pd.DataFrame(hist_columns),
                        mapping=aes(x='pixel intensity', y='proportion of pixels (%)', color='color channel'))
                 + geom_line())
 
     if title is not None:
         fig_hist = fig_hist + labels.ggtitle(title)
-    if len(img.shape) > 2 and img.shape[2] == 3:
+    if rgb:
         fig_hist = fig_hist + scale_color_manual(['blue', 'green', 'red'])
 
-    # Plot or print the histogram
-    _debug(visual=fig_hist, filename=os.path.join(params.debug_outdir, str(params.device) + '_hist.png'))
-
-    if hist_data is True:
-        return fig_hist, hist_df
     return fig_hist
@@ -3,81 +3,181 @@ import json
 
 
 def json2csv(json_file, csv_file):
-    if os.path.exists(json_file):
-        # If the JSON file exists open it for reading
-        json_data = open(json_file, "r")
-        data = json.load(json_data)
-        # If the data is JSON but it does not have the components we expect from PlantCV raise an error
-        if "variables" not in data or "entities" not in data:
-            raise ValueError("Invalid JSON file: {0}".format(json_file))
-
-        # Split up variables
-        meta_vars = []
-        scalar_vars = []
-        multi_vars = []
-        for key, var in data["variables"].items():
-            if var["category"] == "metadata":
-                meta_vars.append(key)
-            elif var["datatype"] in ["<class 'bool'>", "<class 'int'>", "<class 'float'>", "<class 'str'>",
-                                     "<type 'bool'>", "<type 'int'>", "<type 'float'>", "<type 'str'>"]:
-                scalar_vars.append(key)
-            elif var["datatype"] in ["<class 'list'>", "<type 'list'>"]:
-                multi_vars.append(key)
-
-        # Create a CSV file of single-value traits
-        csv = open(csv_file + "-single-value-traits.csv", "w")
-
-        # Build the single-value variables output table
-        csv.write(",".join(map(str, meta_vars + ["sample"] + scalar_vars)) + "\n")
-        for entity in data["entities"]:
-            row = []
+    """Convert a PlantCV JSON results file into CSV tables of single-value and multi-value traits.
+
+    The JSON file is read incrementally and both tables are written in one pass, one entity at a time, so memory use
+    does not depend on the size of the JSON file.
+
+    Inputs:
+    json_file = PlantCV JSON results file
+    csv_file  = Output CSV filename prefix
+
+    :param json_file: str
+    :param csv_file: str
+    """
+    if not os.path.exists(json_file):
+        # If the file does not exist raise an error
+        raise IOError("File does not exist: {0}".format(json_file))
+
+    # Find the variables, which are stored before the entities in files written by PlantCV
+    variables = None
+    has_entities = False
+    for key, value in _iter_results(json_file):
+        if key == "variables":
+            variables = value
+        elif key == "entities":
+            has_entities = True
+        if variables is not None and has_entities:
+            break
+    # If the data is JSON but it does not have the components we expect from PlantCV raise an error
+    if variables is None or not has_entities:
+        raise ValueError("Invalid JSON file: {0}".format(json_file))
+
+    # Split up variables
+    meta_vars = []
+    scalar_vars = []
+    multi_vars = []
+    for key, var in variables.items():
+        if var["category"] == "metadata":
+            meta_vars.append(key)
+        elif var["datatype"] in ["<class 'bool'>", "<class 'int'>", "<class 'float'>", "<class 'str'>",
+                                 "<type 'bool'>", "<type 'int'>", "<type 'float'>", "<type 'str'>"]:
+            scalar_vars.append(key)
+        elif var["datatype"] in ["<class 'list'>", "<type 'list'>"]:
+            multi_vars.append(key)
+
+    # Create CSV files of single-value and multi-value traits
+    with open(csv_file + "-single-value-traits.csv", "w") as single_csv, \
+            open(csv_file + "-multi-value-traits.csv", "w") as multi_csv:
+        single_csv.write(",".join(map(str, meta_vars + ["sample"] + scalar_vars)) + "\n")
+        multi_csv.write(",".join(map(str, meta_vars + ["sample", "trait", "value", "label"])) + "\n")
+        for key, entity in _iter_results(json_file):
+            if key != "entity":
+                continue
+            meta_row = []
             # Add metadata variables
             for var in meta_vars:
-                obs = entity[data["variables"][var]["category"]]
+                obs = entity[variables[var]["category"]]
                 if var in obs:
-                    row.append(obs[var]["value"])
+                    meta_row.append(obs[var]["value"])
                 else:
-                    row.append("NA")
-            # Add scalar variables
+                    meta_row.append("NA")
             for sample in entity["observations"]:
+                obs = entity["observations"][sample]
+                # Add scalar variables
                 measurements = [sample]
                 for var in scalar_vars:
-                    obs = entity[data["variables"][var]["category"]][sample]
                     if var in obs:
                         measurements.append(obs[var]["value"])
                     else:
                         measurements.append("NA")
-                csv.write(",".join(map(str, row + measurements)) + "\n")
-        # Close the CSV file
-        csv.close()
-
-        # Create a CSV file of multi-value variables
-        csv = open(csv_file + "-multi-value-traits.csv", "w")
-        csv.write(",".join(map(str, meta_vars + ["sample", "trait", "value", "label"])) + "\n")
-        for entity in data["entities"]:
-            meta_row = []
-            # Add metadata variables
-            for var in meta_vars:
-                obs = entity[data["variables"][var]["category"]]
-                if var in obs:
-                    meta_row.append(obs[var]["value"])
-                else:
-                    meta_row.append("NA")
-            # Add multi-value variables
-            for sample in entity["observations"]:
+                single_csv.write(",".join(map(str, meta_row + measurements)) + "\n")
+                # Add multi-value variables
                 for var in multi_vars:
-                    obs = entity[data["variables"][var]["category"]][sample]
                     if var in obs:
                         if obs[var]["label"] != "none":
                             for i in range(0, len(obs[var]["value"])):
                                 row = [sample, var, obs[var]["value"][i], obs[var]["label"][i]]
-                                csv.write(",".join(map(str, meta_row + row)) + "\n")
+                                multi_csv.write(",".join(map(str, meta_row + row)) + "\n")
                     else:
-                        csv.write(",".join(map(str, meta_row + [sample, var, "NA", "NA"])) + "\n")
-        csv.close()
-    else:
-        # If the file does not exist raise an error
-        raise IOError("File does not exist: {0}".format(json_file))
+                        multi_csv.write(",".join(map(str, meta_row + [sample, var, "NA", "NA"])) + "\n")
+
+
+class _JSONReader:
+    """Incremental reader for the values of a JSON document stored in a file."""
+
+    def __init__(self, fp, chunk_size=2 ** 20):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _read(self):
+        """Drop the consumed text and read more of the file into the buffer."""
+        # Read at least as much as is already buffered so that large values are decoded in linear time
+        data = self.fp.read(max(self.chunk_size, len(self.buffer) - self.pos))
+        self.buffer = self.buffer[self.pos:] + data
+        self.pos = 0
+        if len(data) == 0:
+            self.eof = True
+
+    def peek(self):
+        """Skip whitespace and return the next character, or an empty string at the end of the file.
+
+        :return char: str
+        """
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in " \t\n\r":
+                self.pos += 1
+            if self.pos < len(self.buffer) or self.eof:
+                return self.buffer[self.pos:self.pos + 1]
+            self._read()
+
+    def expect(self, chars):
+        """Read the next character, which must be one of chars.
+
+        :param chars: str
+        :return char: str
+        """
+        char = self.peek()
+        if char == "" or char not in chars:
+            raise ValueError("Invalid JSON: expected one of {0} but found {1!r}".format(list(chars), char))
+        self.pos += 1
+        return char
+
+    def value(self):
+        """Decode the next JSON value.
+
+        :return value: object
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # A number at the end of the buffer may continue in the unread part of the file
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._read()
+
+
+def _iter_results(json_file):
+    """Iterate over the top-level values of a PlantCV JSON results file, one entity at a time.
+
+    Yields (key, value) pairs for the top-level keys, except for the entities list. For the entities list an
+    ("entities", None) pair is followed by an ("entity", entity) pair for each entity.
+
+    :param json_file: str
+    :return key: str
+    :return value: object
+    """
+    with open(json_file, "r") as fp:
+        reader = _JSONReader(fp)
+        reader.expect("{")
+        if reader.peek() == "}":
+            return
+        while True:
+            key = reader.value()
+            reader.expect(":")
+            if key == "entities" and reader.peek() == "[":
+                yield "entities", None
+                reader.expect("[")
+                if reader.peek() == "]":
+                    reader.expect("]")
+                else:
+                    while True:
+                        yield "entity", reader.value()
+                        if reader.expect(",]") == "]":
+                            break
+            else:
+                yield key, reader.value()
+            if reader.expect(",}") == "}":
+                return
 
 
 def tabulate_bayes_classes(input_file, output_file):
@@ -1,5 +1,9 @@
+import pytest
 import os
+import numpy as np
+from scipy import stats
 from plantcv.learn import naive_bayes, naive_bayes_multiclass
+from plantcv.learn.naive_bayes import _histogram_pdf
 
 
 def test_naive_bayes(learn_test_data, tmpdir):
@@ -22,3 +26,41 @@ def test_naive_bayes_multiclass(learn_test_data, tmpdir):
     outfile = os.path.join(tmp_dir, "naive_bayes_multiclass_pdfs.txt")
     naive_bayes_multiclass(samples_file=learn_test_data.rgb_values_table, outfile=outfile, mkplots=True)
     assert os.path.exists(outfile)
+
+
+def test_naive_bayes_processes(learn_test_data, tmpdir):
+    """Test for PlantCV."""
+    # Create tmp directory
+    tmp_dir = tmpdir.mkdir("cache")
+    imgdir = os.path.join(learn_test_data.train_data, "images")
+    maskdir = os.path.join(learn_test_data.train_data, "masks")
+    # Run the naive Bayes training module with images read in parallel
+    outfile = os.path.join(str(tmp_dir), "naive_bayes_pdfs.txt")
+    naive_bayes(imgdir=imgdir, maskdir=maskdir, outfile=outfile, processes=2)
+    assert os.path.exists(outfile)
+
+
+def test_histogram_pdf():
+    """Test for PlantCV."""
+    # Gaussian smoothing of the histogram is equivalent to a Gaussian KDE of the observations
+    values = np.array([10, 12, 12, 15, 40, 41, 41, 41, 200], dtype=np.uint8)
+    kde = stats.gaussian_kde(values)(range(0, 256))
+    pdf = _histogram_pdf(np.bincount(values, minlength=256).astype(np.float64))
+    assert np.allclose(pdf, kde)
+
+
+@pytest.mark.parametrize("values", [[], [10], [10, 10, 10]])
+def test_histogram_pdf_one_value(values):
+    """Test for PlantCV."""
+    # The bandwidth would be 0, a PDF can not be calculated
+    with pytest.raises(RuntimeError):
+        _ = _histogram_pdf(np.bincount(np.array(values, dtype=np.uint8), minlength=256).astype(np.float64))
+
+
+def test_histogram_pdf_few_observations():
+    """Test for PlantCV."""
+    # Scaled (background) histograms can have two values but less than two observations
+    hist = np.zeros(256)
+    hist[[10, 20]] = 0.5
+    with pytest.raises(RuntimeError):
+        _ = _histogram_pdf(hist)
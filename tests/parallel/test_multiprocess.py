@@ -1,8 +1,10 @@
 import pytest
 import os
+import json
 import dask
 from dask.distributed import Client
 from plantcv.parallel import create_dask_cluster, multiprocess
+from plantcv.parallel.multiprocess import _process_images_inprocess
 
 
 def test_create_dask_cluster_local(tmpdir):
@@ -50,3 +52,70 @@ def test_plantcv_parallel_multiprocess(parallel_test_data, tmpdir):
     client = Client(n_workers=1)
     multiprocess(jobs, client=client)
     assert os.path.exists(result_file)
+
+
+def test_plantcv_parallel_multiprocess_inprocess(parallel_test_data, tmpdir):
+    """Test for PlantCV."""
+    # Create tmp directory
+    tmp_dir = tmpdir.mkdir("sub")
+    # Set the temp directory for dask
+    dask.config.set(temporary_directory=tmp_dir)
+    image_name = list(parallel_test_data.metadata_snapshot_vis.keys())[0]
+    image_path = os.path.join(parallel_test_data.metadata_snapshot_vis[image_name]['path'], image_name)
+    result_file = os.path.join(tmp_dir, image_name + '.txt')
+    jobs = [['python', parallel_test_data.workflow_script, '--image', image_path, '--outdir', tmp_dir, '--result', result_file,
+             '--writeimg', '--other', 'on']]
+    # Create a dask LocalCluster client
+    client = Client(n_workers=1)
+    multiprocess(jobs, client=client, inprocess=True)
+    assert os.path.exists(result_file)
+
+
+def test_process_images_inprocess_bad_args(parallel_test_data):
+    """Test for PlantCV."""
+    # The workflow requires --image, argparse exits with status 2
+    status = _process_images_inprocess(['python', parallel_test_data.workflow_script])
+    assert status == 2
+
+
+def test_plantcv_parallel_multiprocess_inprocess_threads(tmpdir):
+    """Test for PlantCV."""
+    # Create tmp directory
+    tmp_dir = tmpdir.mkdir("sub")
+    # Set the temp directory for dask
+    dask.config.set(temporary_directory=tmp_dir)
+    # A workflow that fails if another job changes its arguments, params, or outputs while it runs
+    workflow = os.path.join(tmp_dir, "workflow.py")
+    with open(workflow, "w") as fp:
+        fp.write("import sys\n"
+                 "import time\n"
+                 "from plantcv import plantcv as pcv\n\n\n"
+                 "def main():\n"
+                 "    result_file = sys.argv[1]\n"
+                 "    pcv.params.debug_outdir = result_file\n"
+                 "    pcv.outputs.add_observation(sample='default', variable='file', trait='file', method='test',\n"
+                 "                                scale='none', datatype=str, value=result_file, label='none')\n"
+                 "    time.sleep(0.2)\n"
+                 "    if sys.argv[1] == result_file and pcv.params.debug_outdir == result_file and \\\n"
+                 "            len(pcv.outputs.observations['default']) == 1:\n"
+                 "        pcv.outputs.save_results(filename=result_file)\n")
+    result_files = [os.path.join(tmp_dir, f"result{i}.json") for i in range(4)]
+    jobs = [['python', workflow, result_file] for result_file in result_files]
+    # A worker with several threads runs several jobs at the same time
+    client = Client(n_workers=1, threads_per_worker=4)
+    multiprocess(jobs, client=client, inprocess=True)
+    for result_file in result_files:
+        with open(result_file, "r") as fp:
+            assert json.load(fp)["observations"]["default"]["file"]["value"] == result_file
+
+
+def test_create_dask_cluster_local_inprocess(tmpdir):
+    """Test for PlantCV."""
+    # Create tmp directory
+    tmp_dir = tmpdir.mkdir("cache")
+    # Set the temp directory for dask
+    dask.config.set(temporary_directory=tmp_dir)
+    client = create_dask_cluster(cluster="LocalCluster", cluster_config={"n_workers": 2}, inprocess=True)
+    threads = set(client.nthreads().values())
+    client.shutdown()
+    assert threads == {1}
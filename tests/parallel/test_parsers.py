@@ -1,4 +1,5 @@
 import pytest
+import sqlite3
 from plantcv.parallel import check_date_range, convert_datetime_to_unixtime, metadata_parser, WorkflowConfig
 
 
@@ -39,6 +40,25 @@ def test_metadata_parser_snapshots_coimg(parallel_test_data):
     assert meta == parallel_test_data.metadata_snapshot_vis
 
 
+def test_metadata_parser_snapshots_coprocess(parallel_test_data):
+    """Test for PlantCV."""
+    # Create config instance
+    config = WorkflowConfig()
+    config.input_dir = parallel_test_data.snapshot_imgdir
+    config.json = "output.json"
+    config.filename_metadata = ["imgtype", "camera", "frame", "zoom", "lifter", "gain", "exposure", "id"]
+    config.workflow = parallel_test_data.workflow_script
+    config.metadata_filters = {"imgtype": "VIS", "camera": "SV"}
+    config.start_date = "2014-10-21 00:00:00.0"
+    config.end_date = "2014-10-23 00:00:00.0"
+    config.timestampformat = '%Y-%m-%d %H:%M:%S.%f'
+    config.imgformat = "jpg"
+    config.coprocess = "NIR"
+
+    meta = metadata_parser(config=config)
+    assert meta == parallel_test_data.metadata_snapshot_coprocess
+
+
 @pytest.mark.parametrize("subdirs", [True, False])
 def test_metadata_parser_images(parallel_test_data, subdirs):
     """Test for PlantCV."""
@@ -286,3 +306,24 @@ def test_check_date_range_wrongdateformat():
     with pytest.raises(SystemExit, match=r'does not match format'):
         date_format = '%Y%m%d'
         _ = check_date_range(start_date, end_date, img_time, date_format)
+
+
+def test_metadata_parser_images_cache(parallel_test_data, tmpdir):
+    """Test for PlantCV."""
+    # Create config instance
+    config = WorkflowConfig()
+    config.input_dir = parallel_test_data.flat_imgdir
+    config.json = "output.json"
+    config.filename_metadata = ["imgtype", "camera", "frame", "zoom", "lifter", "gain", "exposure", "id"]
+    config.workflow = parallel_test_data.workflow_script
+    config.metadata_filters = {"imgtype": "VIS"}
+    config.imgformat = "jpg"
+    config.metadata_cache = str(tmpdir.join("metadata.db"))
+
+    # Parse the image filenames and create the cache
+    meta = metadata_parser(config=config)
+    # Read the metadata from the cache
+    meta_cached = metadata_parser(config=config)
+    with sqlite3.connect(config.metadata_cache) as conn:
+        cached_images = conn.execute("SELECT COUNT(*) FROM metadata").fetchone()[0]
+    assert meta == parallel_test_data.metadata_flat_vis and meta_cached == meta and cached_images > 0
@@ -1,6 +1,6 @@
 import pytest
 import os
-from plantcv.parallel import process_results
+from plantcv.parallel import process_results, aggregate_results, export_results
 
 
 def test_process_results(parallel_test_data, tmpdir):
@@ -41,3 +41,67 @@ def test_process_results_invalid_json(tmpdir):
     result_file.write("Invalid")
     with pytest.raises(RuntimeError):
         process_results(job_dir=os.path.split(str(result_file))[0], json_file=result_file)
+
+
+def test_aggregate_results(parallel_test_data, tmpdir):
+    """Test for PlantCV."""
+    # Create a test tmp directory and results store
+    tmp_dir = tmpdir.mkdir("sub")
+    store_dir = os.path.join(str(tmp_dir), "store")
+    result_file = os.path.join(str(tmp_dir), "appended_results.json")
+    # Append twice to create appended results
+    aggregate_results(job_dir=parallel_test_data.parallel_results_dir, store_dir=store_dir, partition_by=["camera"])
+    aggregate_results(job_dir=parallel_test_data.parallel_results_dir, store_dir=store_dir, partition_by=["camera"])
+    export_results(store_dir=store_dir, json_file=result_file)
+    # Assert that the exported JSON file matches the expected output JSON file
+    results = parallel_test_data.load_json(json_file=result_file)
+    expected = parallel_test_data.appended_results()
+    assert results == expected
+
+
+def test_aggregate_results_import_json(parallel_test_data, tmpdir):
+    """Test for PlantCV."""
+    tmp_dir = tmpdir.mkdir("sub")
+    store_dir = os.path.join(str(tmp_dir), "store")
+    result_file = os.path.join(str(tmp_dir), "appended_results.json")
+    # Results saved without a store are imported when the store is created
+    process_results(job_dir=parallel_test_data.parallel_results_dir, json_file=result_file)
+    aggregate_results(job_dir=parallel_test_data.parallel_results_dir, store_dir=store_dir, json_file=result_file)
+    export_results(store_dir=store_dir, json_file=result_file)
+    results = parallel_test_data.load_json(json_file=result_file)
+    expected = parallel_test_data.appended_results()
+    assert results == expected
+
+
+def test_aggregate_results_import_invalid_json(parallel_test_data, tmpdir):
+    """Test for PlantCV."""
+    tmp_dir = tmpdir.mkdir("sub")
+    result_file = tmp_dir.join("invalid.json")
+    result_file.write("Invalid")
+    with pytest.raises(RuntimeError):
+        aggregate_results(job_dir=parallel_test_data.parallel_results_dir, store_dir=os.path.join(str(tmp_dir), "store"),
+                          json_file=str(result_file))
+
+
+def test_aggregate_results_invalid_results_file(tmpdir):
+    """Test for PlantCV."""
+    tmp_dir = tmpdir.mkdir("sub")
+    job_dir = tmp_dir.mkdir("job")
+    job_dir.join("invalid.txt").write("Invalid")
+    with pytest.raises(RuntimeError):
+        aggregate_results(job_dir=str(job_dir), store_dir=os.path.join(str(tmp_dir), "store"))
+
+
+def test_aggregate_results_bad_partition(parallel_test_data, tmpdir):
+    """Test for PlantCV."""
+    store_dir = os.path.join(str(tmpdir.mkdir("sub")), "store")
+    aggregate_results(job_dir=parallel_test_data.parallel_results_dir, store_dir=store_dir, partition_by=["camera"])
+    with pytest.raises(RuntimeError):
+        aggregate_results(job_dir=parallel_test_data.parallel_results_dir, store_dir=store_dir, partition_by=["id"])
+
+
+def test_export_results_not_store(tmpdir):
+    """Test for PlantCV."""
+    tmp_dir = tmpdir.mkdir("sub")
+    with pytest.raises(RuntimeError):
+        export_results(store_dir=str(tmp_dir), json_file=os.path.join(str(tmp_dir), "results.json"))
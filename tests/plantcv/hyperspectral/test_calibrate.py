@@ -1,5 +1,7 @@
+import os
+import pytest
 import numpy as np
-from plantcv.plantcv.hyperspectral import calibrate
+from plantcv.plantcv.hyperspectral import calibrate, read_data
 
 
 def test_calibrate(hyperspectral_test_data):
@@ -9,3 +11,32 @@ def test_calibrate(hyperspectral_test_data):
     raw = hyperspectral_test_data.load_hsi(hyperspectral_test_data.hsi_file)
     calibrated = calibrate(raw_data=raw, white_reference=white, dark_reference=dark)
     assert np.shape(calibrated.array_data) == (1, 1600, 978)
+
+
+@pytest.mark.parametrize("dtype", ["float32", "uint16"])
+def test_calibrate_output_file(dtype, hyperspectral_test_data, tmpdir):
+    """Test for PlantCV."""
+    # Create a test tmp directory
+    cache_dir = tmpdir.mkdir("cache")
+    white = hyperspectral_test_data.load_hsi(hyperspectral_test_data.hsi_whiteref_file)
+    dark = hyperspectral_test_data.load_hsi(hyperspectral_test_data.hsi_darkref_file)
+    raw = hyperspectral_test_data.load_hsi(hyperspectral_test_data.hsi_file)
+    # Scale the raw data between the dark and white references
+    raw.array_data = ((dark.array_data.astype(np.float64) + white.array_data + 100) / 2).astype(np.uint16)
+    white.array_data = white.array_data + 100
+    output_file = os.path.join(cache_dir, "calibrated.raw")
+    calibrated = calibrate(raw_data=raw, white_reference=white, dark_reference=dark, dtype=dtype,
+                           output_file=output_file, chunk_size=1)
+    # The calibrated datacube can be read back in
+    saved = read_data(filename=output_file)
+    assert calibrated.array_data.dtype == dtype and np.array_equal(saved.array_data, calibrated.array_data) and \
+        calibrated.max_value == np.amax(calibrated.array_data)
+
+
+def test_calibrate_bad_dtype(hyperspectral_test_data):
+    """Test for PlantCV."""
+    white = hyperspectral_test_data.load_hsi(hyperspectral_test_data.hsi_whiteref_file)
+    dark = hyperspectral_test_data.load_hsi(hyperspectral_test_data.hsi_darkref_file)
+    raw = hyperspectral_test_data.load_hsi(hyperspectral_test_data.hsi_file)
+    with pytest.raises(RuntimeError):
+        _ = calibrate(raw_data=raw, white_reference=white, dark_reference=dark, dtype="int8")
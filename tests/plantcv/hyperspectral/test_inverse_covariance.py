@@ -1,8 +1,20 @@
 import numpy as np
-from plantcv.plantcv.hyperspectral import _inverse_covariance
+from plantcv.plantcv.hyperspectral import _inverse_covariance, _covariance
 
 
 def test_inverse_covariance(hyperspectral_test_data):
     """Test for PlantCV."""
     inv_cov = _inverse_covariance(hyperspectral_test_data.load_hsi(hyperspectral_test_data.hsi_file))
     assert np.shape(inv_cov) == (978, 978)
+
+
+def test_covariance_mask_subsample(hyperspectral_test_data):
+    """Test for PlantCV."""
+    spectral_data = hyperspectral_test_data.load_hsi(hyperspectral_test_data.hsi_file)
+    rng = np.random.default_rng(0)
+    spectral_data.array_data = rng.integers(0, 4096, (21, 30, 4)).astype(np.uint16)
+    mask = rng.integers(0, 2, (21, 30)).astype(np.uint8) * 255
+    # Read two lines at a time
+    cov = _covariance(spectral_data, mask=mask, subsample=2, chunk_size=2 * 15 * 4 * 8)
+    pixels = spectral_data.array_data[::2, ::2][mask[::2, ::2] > 0]
+    assert np.allclose(cov, np.cov(pixels, rowvar=False))
@@ -0,0 +1,55 @@
+import pytest
+import numpy as np
+from plantcv.plantcv.hyperspectral import _masked_stats
+
+
+@pytest.mark.parametrize("dtype,tol", [[np.uint16, 0], [np.float64, 0.05]])
+def test_masked_stats(dtype, tol, hyperspectral_test_data):
+    """Test for PlantCV."""
+    spectral_data = hyperspectral_test_data.load_hsi(hyperspectral_test_data.hsi_file)
+    rng = np.random.default_rng(0)
+    spectral_data.array_data = (rng.random((20, 30, 5)) * 1000).astype(dtype)
+    spectral_data.min_value = None
+    spectral_data.max_value = None
+    mask = np.zeros((20, 30), dtype=np.uint8)
+    mask[3:17, 5:20] = 255
+    masked = spectral_data.array_data[np.where(mask > 0)]
+    # Read one line at a time
+    stats = _masked_stats(spectral_data=spectral_data, mask=mask, chunk_size=1)
+    assert stats["count"] == masked.shape[0] and np.allclose(stats["mean"], masked.mean(axis=0)) and \
+        np.allclose(stats["std"], masked.std(axis=0)) and np.array_equal(stats["max"], masked.max(axis=0)) and \
+        np.array_equal(stats["min"], masked.min(axis=0)) and np.isclose(stats["global_std"], np.std(masked)) and \
+        np.isclose(stats["global_median"], np.median(masked), rtol=0, atol=tol)
+
+
+def test_masked_stats_no_median(hyperspectral_test_data):
+    """Test for PlantCV."""
+    spectral_data = hyperspectral_test_data.load_hsi(hyperspectral_test_data.hsi_file)
+    mask = np.zeros(spectral_data.array_data.shape[:2], dtype=np.uint8)
+    stats = _masked_stats(spectral_data=spectral_data, mask=mask, median=False)
+    assert stats["count"] == 0 and np.isnan(stats["global_median"])
+
+
+def test_masked_stats_median_range(hyperspectral_test_data):
+    """Test for PlantCV."""
+    spectral_data = hyperspectral_test_data.load_hsi(hyperspectral_test_data.hsi_file)
+    rng = np.random.default_rng(0)
+    spectral_data.array_data = rng.random((20, 30, 5)) * 1000
+    # Stale cube-wide min/max values and non-finite values do not change the median of the masked values
+    spectral_data.min_value = 0
+    spectral_data.max_value = 1
+    spectral_data.array_data[0, 0] = [np.nan, np.inf, -np.inf, 5000, -5000]
+    mask = np.zeros((20, 30), dtype=np.uint8)
+    mask[0:17, 0:20] = 255
+    masked = spectral_data.array_data[np.where(mask > 0)]
+    stats = _masked_stats(spectral_data=spectral_data, mask=mask, chunk_size=1)
+    assert np.isclose(stats["global_median"], np.median(masked[np.isfinite(masked)]), rtol=0, atol=0.2)
+
+
+def test_masked_stats_no_finite_values(hyperspectral_test_data):
+    """Test for PlantCV."""
+    spectral_data = hyperspectral_test_data.load_hsi(hyperspectral_test_data.hsi_file)
+    spectral_data.array_data = np.full((4, 5, 3), np.nan)
+    mask = np.full((4, 5), 255, dtype=np.uint8)
+    stats = _masked_stats(spectral_data=spectral_data, mask=mask)
+    assert stats["count"] == 20 and np.isnan(stats["global_median"])
@@ -31,3 +31,24 @@ def test_read_data_bad_filename(hyperspectral_test_data):
     """Test for PlantCV."""
     with pytest.raises(RuntimeError):
         _ = read_data(filename=hyperspectral_test_data.bad_filename)
+
+
+def test_read_data_memmap(hyperspectral_test_data):
+    """Test for PlantCV."""
+    array_data = read_data(filename=hyperspectral_test_data.envi_bil_file)
+    mmap_data = read_data(filename=hyperspectral_test_data.envi_bil_file, memmap=True)
+    # The memory-mapped datacube and its lazily calculated values match the datacube read into memory
+    assert isinstance(mmap_data.array_data, np.memmap) and np.array_equal(mmap_data.array_data, array_data.array_data) \
+        and mmap_data.max_value == array_data.max_value and mmap_data.min_value == array_data.min_value \
+        and np.array_equal(mmap_data.pseudo_rgb, array_data.pseudo_rgb)
+
+
+@pytest.mark.parametrize("line", [0, 19])
+def test_spectral_data_min_max_nan(line, hyperspectral_test_data):
+    """Test for PlantCV."""
+    spectral_data = hyperspectral_test_data.load_hsi(hyperspectral_test_data.hsi_file)
+    spectral_data.array_data = np.arange(20 * 3 * 2, dtype=np.float64).reshape((20, 3, 2))
+    spectral_data.array_data[line, 1, 1] = np.nan
+    # A NaN in the first or a later block gives the same result as the whole array
+    spectral_data._calc_min_max(chunk_size=1)
+    assert np.isnan(spectral_data.max_value) and np.isnan(spectral_data.min_value)
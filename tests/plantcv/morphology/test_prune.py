@@ -1,6 +1,6 @@
 import cv2
 import numpy as np
-from plantcv.plantcv.morphology import prune, _iterative_prune
+from plantcv.plantcv.morphology import prune, _iterative_prune, find_tips
 
 
 def test_prune(morphology_test_data):
@@ -29,3 +29,13 @@ def test_iterative_prune(morphology_test_data):
     skeleton = cv2.imread(morphology_test_data.skel_img, -1)
     pruned_img = _iterative_prune(skel_img=skeleton, size=3)
     assert np.sum(pruned_img) < np.sum(skeleton)
+
+
+def test_iterative_prune_tips(morphology_test_data):
+    """Test for PlantCV."""
+    skeleton = cv2.imread(morphology_test_data.skel_img, -1)
+    # Remove the tips of the skeleton one iteration at a time
+    expected = skeleton.copy()
+    for _ in range(20):
+        expected[find_tips(expected) > 0] = 0
+    assert np.array_equal(_iterative_prune(skel_img=skeleton, size=20), expected)
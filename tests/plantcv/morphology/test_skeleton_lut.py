@@ -0,0 +1,36 @@
+import cv2
+import numpy as np
+from plantcv.plantcv.morphology._skeleton_lut import _find_tips, _find_branch_pts, _segment_tips
+from plantcv.plantcv.morphology._skeleton_lut import _TIP_KERNELS
+
+
+def _hitmiss(skel_img, kernels):
+    img = np.zeros(skel_img.shape, dtype=bool)
+    for kernel in kernels:
+        img |= cv2.morphologyEx(skel_img, op=cv2.MORPH_HITMISS, kernel=kernel, borderType=cv2.BORDER_CONSTANT,
+                                borderValue=0) > 0
+    return img.astype(np.uint8) * 255
+
+
+def test_find_tips_hitmiss():
+    """Test for PlantCV."""
+    # Random pixels, including pixels on the image border
+    rng = np.random.default_rng(0)
+    img = (rng.random((40, 50)) > 0.7).astype(np.uint8) * 255
+    assert np.array_equal(_find_tips(img), _hitmiss(img, _TIP_KERNELS))
+
+
+def test_find_branch_pts(morphology_test_data):
+    """Test for PlantCV."""
+    skeleton = cv2.imread(morphology_test_data.skel_img, -1)
+    assert np.count_nonzero(_find_branch_pts(skeleton)) > 0
+
+
+def test_segment_tips():
+    """Test for PlantCV."""
+    img = np.zeros((10, 10), np.uint8)
+    img[2:7, 4] = 255
+    segment, _ = cv2.findContours(img, cv2.RETR_TREE, cv2.CHAIN_APPROX_NONE)[-2:]
+    tips = _segment_tips(segment[0], img.shape)
+    assert sorted(tuple(t.ravel()) for t in tips) == [(4, 2), (4, 6)]
+
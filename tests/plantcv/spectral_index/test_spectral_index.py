@@ -360,3 +360,20 @@ def test_wi_bad_input(spectral_index_test_data):
     index_array = spectral_index.wi(spectral_index_test_data.load_hsi(), distance=20)
     with pytest.raises(RuntimeError):
         _ = spectral_index.wi(hsi=index_array, distance=20)
+
+
+def test_compute(spectral_index_test_data):
+    """Test for PlantCV."""
+    hsi = spectral_index_test_data.load_hsi()
+    hsi.array_data = hsi.array_data.astype(np.float32)
+    index_arrays = spectral_index.compute(hsi=hsi, indices=["ndvi", "sipi", "mtci"], distance=20, chunk_size=1)
+    ndvi_array = spectral_index.ndvi(hsi=hsi, distance=20)
+    assert index_arrays["ndvi"].array_data.dtype == np.float32 and \
+        np.allclose(index_arrays["ndvi"].array_data, ndvi_array.array_data, rtol=1e-5, equal_nan=True) and \
+        index_arrays["sipi"].array_type == "index_sipi"
+
+
+def test_compute_bad_index(spectral_index_test_data):
+    """Test for PlantCV."""
+    with pytest.raises(RuntimeError):
+        _ = spectral_index.compute(hsi=spectral_index_test_data.load_hsi(), indices=["ndvi", "egi"], distance=20)
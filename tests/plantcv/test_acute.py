@@ -2,6 +2,7 @@ import pytest
 import cv2
 import numpy as np
 from plantcv.plantcv import acute
+from plantcv.plantcv.acute import _window_points
 
 
 @pytest.mark.parametrize("win", [0, 5])
@@ -32,3 +33,27 @@ def test_acute_small_contours(obj, win, thresh, test_data):
     mask = cv2.imread(test_data.small_bin_img, -1)
     homology_pts = acute(obj=obj, win=win, thresh=thresh, mask=mask)
     assert all([i == j] for i, j in zip(np.shape(homology_pts), (29, 1, 2)))
+
+
+@pytest.mark.parametrize("step", [1, -1])
+def test_acute_window_points(step):
+    """Test for PlantCV."""
+    # Contour of a rectangle with a notch
+    mask = np.zeros((60, 60), dtype=np.uint8)
+    mask[10:50, 10:50] = 255
+    mask[10:30, 28:32] = 0
+    cnt, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_NONE)
+    pts = cnt[0].reshape(-1, 2)
+    n = len(pts)
+    # Walk along the contour point by point
+    expected = []
+    for k in range(n):
+        end, end_dist = (k + step) % n, 0
+        for r in range(2, n):
+            dist = np.linalg.norm(pts[(k + step * r) % n] - pts[k])
+            if dist > 10:
+                break
+            if dist > end_dist:
+                end, end_dist = (k + step * r) % n, dist
+        expected.append(end)
+    assert np.array_equal(_window_points(pts, 10, step, block=7), expected)
@@ -0,0 +1,67 @@
+import gc
+import cv2
+import numpy as np
+from plantcv.plantcv import _channel_bundle as channel_bundle
+from plantcv.plantcv._channel_bundle import _channel_bundle
+from plantcv.plantcv import readimage, rgb2gray_hsv, rgb2gray_lab, analyze_color, naive_bayes_classifier, outputs
+from plantcv.plantcv.threshold import custom_range
+
+
+def test_channel_bundle(test_data):
+    """Test for PlantCV."""
+    # Read in test data
+    img = cv2.imread(test_data.small_rgb_img)
+    img.flags.writeable = False
+    hsv = _channel_bundle(img).hsv
+    # The same read-only image reuses the conversions
+    assert _channel_bundle(img).hsv is hsv and not hsv.flags.writeable and \
+        np.array_equal(hsv, cv2.cvtColor(img, cv2.COLOR_BGR2HSV))
+
+
+def test_channel_bundle_writeable_image(test_data):
+    """Test for PlantCV."""
+    # Read in test data
+    img = cv2.imread(test_data.small_rgb_img)
+    lab = _channel_bundle(img).lab
+    # Images that can be changed in place are not cached
+    img[0:10, 0:10] = 255
+    assert _channel_bundle(img).lab is not lab and lab.flags.writeable and \
+        np.array_equal(_channel_bundle(img).lab, cv2.cvtColor(img, cv2.COLOR_BGR2LAB))
+
+
+def test_channel_bundle_writeable_base(test_data):
+    """Test for PlantCV."""
+    # A read-only view of an image that can be changed is not cached
+    img = cv2.imread(test_data.small_rgb_img)
+    view = img[:, :]
+    view.flags.writeable = False
+    assert not _channel_bundle(view).shared
+
+
+def test_channel_bundle_deleted_image(test_data):
+    """Test for PlantCV."""
+    # Read in test data
+    img = cv2.imread(test_data.small_rgb_img)
+    img.flags.writeable = False
+    _ = _channel_bundle(img).gray
+    # The conversions are freed with the image
+    del img
+    gc.collect()
+    assert channel_bundle._cache["ref"] is None and channel_bundle._cache["conversions"] is None
+
+
+def test_channel_bundle_readimage_read_only(test_data):
+    """Test for PlantCV."""
+    # A workflow that reads its image as read-only shares the conversions between functions
+    img, _, _ = readimage(filename=test_data.small_rgb_img, read_only=True)
+    mask, _, _ = readimage(filename=test_data.small_bin_img, mode="gray")
+    s = rgb2gray_hsv(rgb_img=img, channel="s")
+    hsv = channel_bundle._cache["conversions"]["hsv"]
+    _ = custom_range(img=img, lower_thresh=[0, 0, 0], upper_thresh=[100, 255, 255], channel="HSV")
+    _ = naive_bayes_classifier(rgb_img=img, pdf_file=test_data.nb_trained_model)
+    a = rgb2gray_lab(rgb_img=img, channel="a")
+    _ = analyze_color(rgb_img=img, mask=mask)
+    outputs.clear()
+    conversions = channel_bundle._cache["conversions"]
+    assert conversions["hsv"] is hsv and set(conversions) == {"hsv", "lab"} and s.flags.writeable and \
+        a.flags.writeable and np.array_equal(s, cv2.cvtColor(img, cv2.COLOR_BGR2HSV)[:, :, 1])
@@ -1,5 +1,6 @@
 import cv2
-from plantcv.plantcv import cluster_contour_splitimg
+import numpy as np
+from plantcv.plantcv import cluster_contour_splitimg, cluster_contours
 
 
 def test_cluster_contours_splitimg(test_data, tmpdir):
@@ -52,3 +53,18 @@ def test_cluster_contours_splitimg_mismatch(test_data):
     _, imgs, _ = cluster_contour_splitimg(img=img, grouped_contour_indexes=clusters, contours=cnts, hierarchy=cnt_str,
                                           outdir=None, file=None, filenames=cluster_names_too_many)
     assert len(imgs) == 18
+
+
+def test_cluster_contours_splitimg_labels(test_data):
+    """Test for PlantCV."""
+    # Read in test data
+    img = cv2.imread(test_data.multi_rgb_img)
+    cnts, cnt_str = test_data.load_contours(test_data.multi_contours_file)
+    clusters, _, _, labels = cluster_contours(img=img, roi_objects=cnts, roi_obj_hierarchy=cnt_str, nrow=4, ncol=6,
+                                              cluster_labels=True)
+    _, _, masks = cluster_contour_splitimg(img=img, grouped_contour_indexes=clusters, contours=cnts,
+                                           hierarchy=cnt_str, filenames=test_data.cluster_names)
+    _, _, label_masks = cluster_contour_splitimg(img=img, grouped_contour_indexes=clusters, contours=cnts,
+                                                 hierarchy=cnt_str, filenames=test_data.cluster_names,
+                                                 cluster_labels=labels)
+    assert len(masks) == len(label_masks) and all(np.array_equal(a, b) for a, b in zip(masks, label_masks))
@@ -27,3 +27,13 @@ def test_cluster_contours_default_rc(test_data):
     cnts, cnt_str = test_data.load_contours(test_data.multi_contours_file)
     clusters_i, _, _ = cluster_contours(img=img, roi_objects=cnts, roi_obj_hierarchy=cnt_str, show_grid=True)
     assert len(clusters_i) == 1
+
+
+def test_cluster_contours_labels(test_data):
+    """Test for PlantCV."""
+    # Read in test data
+    img = cv2.imread(test_data.multi_rgb_img)
+    cnts, cnt_str = test_data.load_contours(test_data.multi_contours_file)
+    clusters_i, _, _, labels = cluster_contours(img=img, roi_objects=cnts, roi_obj_hierarchy=cnt_str, nrow=4, ncol=6,
+                                                cluster_labels=True)
+    assert labels.shape == img.shape[:2] and labels.max() == len(clusters_i)
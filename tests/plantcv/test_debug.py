@@ -15,3 +15,15 @@ def test_debug(debug, test_data, tmpdir):
     img = cv2.imread(test_data.small_rgb_img)
     _debug(visual=img, filename=output_img)
     assert True
+
+
+def test_debug_format(test_data, tmpdir):
+    """Test for PlantCV."""
+    # Create a test tmp directory
+    cache = tmpdir.mkdir("cache")
+    params.debug = "print"
+    params.debug_format = "jpg"
+    img = cv2.imread(test_data.small_rgb_img)
+    _debug(visual=img, filename=os.path.join(cache, "plantcv_debug.png"))
+    params.debug_format = "png"
+    assert os.path.exists(os.path.join(cache, "plantcv_debug.jpg"))
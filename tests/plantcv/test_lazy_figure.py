@@ -0,0 +1,34 @@
+import os
+import pandas as pd
+from plotnine import ggplot, aes, geom_line, labs
+from plantcv.plantcv._lazy_figure import LazyFigure
+
+
+def _line_fig(values):
+    return ggplot(pd.DataFrame({"x": range(len(values)), "y": values}), aes(x="x", y="y")) + geom_line()
+
+
+def test_lazy_figure_not_made():
+    """Test for PlantCV."""
+    fig = LazyFigure(_line_fig, values=[1, 2, 3])
+    assert isinstance(fig, ggplot) and "_builder" in fig.__dict__
+
+
+def test_lazy_figure_attribute():
+    """Test for PlantCV."""
+    fig = LazyFigure(_line_fig, values=[1, 2, 3])
+    # Using a ggplot attribute makes the figure
+    assert list(fig.data["y"]) == [1, 2, 3]
+    assert type(fig) is ggplot
+
+
+def test_lazy_figure_add(tmpdir):
+    """Test for PlantCV."""
+    cache_dir = tmpdir.mkdir("cache")
+    fig = LazyFigure(_line_fig, values=[1, 2, 3]) + labs(x="pixel")
+    # Adding to the figure does not make it
+    assert isinstance(fig, LazyFigure)
+    filename = os.path.join(cache_dir, "plantcv_lazy_figure.png")
+    # Saving the figure makes it
+    fig.save(filename, verbose=False)
+    assert os.path.exists(filename) and fig.labels.x == "pixel"
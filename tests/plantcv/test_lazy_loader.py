@@ -0,0 +1,34 @@
+import sys
+import subprocess
+import plantcv.plantcv as pcv
+from plantcv.plantcv import __all__ as pcv_all
+
+
+def test_lazy_loader_public_api():
+    """Test for PlantCV."""
+    # Every public name resolves to the function, class, or subpackage it did before lazy loading
+    assert all(hasattr(pcv, name) for name in pcv_all)
+
+
+def test_lazy_loader_submodule_import():
+    """Test for PlantCV."""
+    # Importing a submodule directly does not replace the function with the same name on the package
+    import plantcv.plantcv.rgb2gray_lab
+    assert callable(pcv.rgb2gray_lab)
+
+
+def test_lazy_loader_dir():
+    """Test for PlantCV."""
+    assert "analyze_color" in dir(pcv)
+
+
+def test_lazy_loader_unused_dependencies():
+    """Test for PlantCV."""
+    # A workflow that only reads, converts, and thresholds an image does not import plotting or analysis dependencies
+    code = ("import sys\n"
+            "from plantcv import plantcv as pcv\n"
+            "_ = pcv.readimage, pcv.rgb2gray_hsv, pcv.threshold.binary\n"
+            "print(','.join(m for m in ['matplotlib.pyplot', 'plotnine', 'pandas', 'sklearn', 'skimage'] "
+            "if m in sys.modules))\n")
+    loaded = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout.strip()
+    assert loaded == ""
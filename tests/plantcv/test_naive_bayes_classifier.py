@@ -2,6 +2,7 @@ import pytest
 import cv2
 import numpy as np
 from plantcv.plantcv import naive_bayes_classifier
+from plantcv.plantcv.naive_bayes_classifier import _read_pdf_file
 
 
 def test_naive_bayes_classifier(test_data):
@@ -22,3 +23,10 @@ def test_naive_bayes_classifier_bad_input(test_data):
     img = cv2.imread(test_data.small_rgb_img)
     with pytest.raises(RuntimeError):
         _ = naive_bayes_classifier(rgb_img=img, pdf_file=test_data.nb_bad_model)
+
+
+def test_naive_bayes_classifier_pdf_cache(test_data):
+    """Test for PlantCV."""
+    # The PDF file is only parsed once while it is unchanged
+    pdfs = _read_pdf_file(pdf_file=test_data.nb_trained_model)
+    assert _read_pdf_file(pdf_file=test_data.nb_trained_model) is pdfs
@@ -1,10 +1,22 @@
 import pytest
 import os
+import cv2
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 from plotnine import ggplot
-from plantcv.plantcv import print_image
+from plantcv.plantcv import print_image, flush_images, params
+
+
+@pytest.fixture
+def background_writer():
+    """Restore the debug image writer settings after a test."""
+    threads, compression = params.debug_writer_threads, params.png_compression
+    yield
+    try:
+        flush_images()
+    finally:
+        params.debug_writer_threads, params.png_compression = threads, compression
 
 
 def test_print_image(tmpdir):
@@ -50,3 +62,42 @@ def test_print_image_matplotlib(tmpdir):
     print_image(img=plot, filename=filename)
     # Assert that the file was created
     assert os.path.exists(filename)
+
+
+def test_print_image_background(tmpdir, background_writer):
+    """Test for PlantCV."""
+    # Create a test tmp directory
+    cache_dir = tmpdir.mkdir("cache")
+    params.debug_writer_threads = 2
+    params.png_compression = 1
+    img = np.zeros((10, 10), dtype=np.uint8)
+    filename = os.path.join(cache_dir, 'plantcv_print_image.png')
+    print_image(img=img, filename=filename)
+    # Changing the image after it is queued does not change the written image
+    img[:] = 255
+    flush_images()
+    assert np.count_nonzero(cv2.imread(filename, -1)) == 0
+
+
+def test_print_image_background_bad_file(tmpdir, background_writer):
+    """Test for PlantCV."""
+    # Create a test tmp directory
+    cache_dir = tmpdir.mkdir("cache")
+    params.debug_writer_threads = 1
+    img = np.zeros((10, 10), dtype=np.uint8)
+    # Unknown file extensions are an error
+    print_image(img=img, filename=os.path.join(cache_dir, 'plantcv_print_image.bad'))
+    with pytest.raises(RuntimeError):
+        flush_images()
+
+
+def test_print_image_background_missing_dir(tmpdir, background_writer):
+    """Test for PlantCV."""
+    # Create a test tmp directory
+    cache_dir = tmpdir.mkdir("cache")
+    params.debug_writer_threads = 1
+    img = np.zeros((10, 10), dtype=np.uint8)
+    # cv2.imwrite returns False (does not raise) if the directory does not exist
+    print_image(img=img, filename=os.path.join(cache_dir, 'missing', 'plantcv_print_image.png'))
+    with pytest.raises(RuntimeError):
+        flush_images()
@@ -13,6 +13,13 @@ def test_plantcv_readimage_native(test_data):
     assert [img.shape[2], path, img_name] == expected
 
 
+def test_readimage_read_only(test_data):
+    """Test for PlantCV."""
+    img, _, _ = readimage(filename=test_data.small_rgb_img, read_only=True)
+    with pytest.raises(ValueError):
+        img[0, 0] = 0
+
+
 @pytest.mark.parametrize("mode", ["gray", "grey"])
 def test_readimage_grayscale(mode, test_data):
     """Test for PlantCV."""
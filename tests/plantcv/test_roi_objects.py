@@ -69,3 +69,17 @@ def test_roi_objects_nested():
     _, _, _, area = roi_objects(img=img, roi_contour=roi, roi_hierarchy=roi_str, object_contour=cnt,
                                 obj_hierarchy=cnt_str, roi_type="largest")
     assert area == 580
+
+
+def test_roi_objects_bounding_box_overlap():
+    """Test for PlantCV."""
+    # Create test data, a triangle with a bounding box that overlaps the ROI but does not overlap the ROI itself
+    img = np.zeros((100, 100), dtype=np.uint8)
+    cnt = [np.array([[[10, 10]], [[10, 60]], [[60, 10]]], dtype=np.int32),
+           np.array([[[70, 70]], [[70, 80]], [[80, 80]], [[80, 70]]], dtype=np.int32)]
+    cnt_str = np.array([[[1, -1, -1, -1], [-1, 0, -1, -1]]], dtype=np.int32)
+    roi = [np.array([[[50, 50]], [[50, 90]], [[90, 90]], [[90, 50]]], dtype=np.int32)]
+    roi_str = np.array([[[-1, -1, -1, -1]]], dtype=np.int32)
+    kept_cnt, _, _, area = roi_objects(img=img, roi_contour=roi, roi_hierarchy=roi_str, object_contour=cnt,
+                                       obj_hierarchy=cnt_str, roi_type="partial")
+    assert len(kept_cnt) == 1 and area == 121
@@ -1,4 +1,7 @@
+import pytest
+import numpy as np
 import cv2
+from scipy.ndimage import generic_filter
 from plantcv.plantcv import stdev_filter
 
 
@@ -8,3 +11,13 @@ def test_stdev_filter(test_data):
     img = cv2.imread(test_data.small_gray_img, -1)
     filter_img = stdev_filter(img=img, ksize=11)
     assert img.shape == filter_img.shape
+
+
+@pytest.mark.parametrize("borders", ["reflect", "constant", "nearest", "mirror", "wrap"])
+def test_stdev_filter_generic_filter(borders):
+    """Test for PlantCV."""
+    rng = np.random.default_rng(0)
+    img = rng.integers(0, 255, (20, 25), dtype=np.uint8)
+    expected = np.zeros(img.shape, dtype=img.dtype)
+    generic_filter(img, np.std, size=4, output=expected, mode=borders)
+    assert np.array_equal(stdev_filter(img=img, ksize=4, borders=borders), expected)
@@ -173,6 +173,33 @@ def test_texture(threshold_test_data):
     assert gray_img.shape == binary_img.shape and np.array_equal(np.unique(binary_img), np.array([0, 255]))
 
 
+@pytest.mark.parametrize("method", ["contrast", "dissimilarity", "homogeneity", "ASM", "energy", "correlation"])
+def test_texture_threads(method, threshold_test_data):
+    """Test for PlantCV."""
+    # Read in test data
+    gray_img = cv2.imread(threshold_test_data.small_gray_img, -1)
+    # Subset input data
+    gray_img = gray_img[150:200, 200:250]
+    binary_img = texture(gray_img, ksize=6, threshold=7, offset=3, texture_method=method)
+    threaded_img = texture(gray_img, ksize=6, threshold=7, offset=3, texture_method=method, threads=3)
+    assert np.array_equal(binary_img, threaded_img)
+
+
+def test_texture_dissimilarity():
+    """Test for PlantCV."""
+    # Vertical stripes one pixel wide, every pixel pair with an odd offset differs by 100
+    gray_img = np.zeros((10, 10), dtype=np.uint8)
+    gray_img[:, ::2] = 100
+    binary_img = texture(gray_img, ksize=4, threshold=99, offset=1, texture_method='dissimilarity', borders='wrap')
+    assert np.all(binary_img == 255)
+
+
+def test_texture_bad_method():
+    """Test for PlantCV."""
+    with pytest.raises(RuntimeError):
+        _ = texture(np.zeros((10, 10), dtype=np.uint8), ksize=3, threshold=7, texture_method="entropy")
+
+
 @pytest.mark.parametrize("bad_type", ["native", "nan", "inf"])
 def test_mask_bad(bad_type):
     """Test for PlantCV."""
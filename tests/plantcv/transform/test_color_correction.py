@@ -4,7 +4,8 @@ import cv2
 import numpy as np
 from plantcv.plantcv.transform import (get_color_matrix, get_matrix_m, calc_transformation_matrix, apply_transformation_matrix,
                                        save_matrix, load_matrix, correct_color, create_color_card_mask, quick_color_check,
-                                       find_color_card)
+                                       find_color_card, clear_color_card_cache)
+from plantcv.plantcv.transform.color_correction import _ColorChipStats, _color_card_cache
 from plantcv.plantcv import outputs
 
 
@@ -40,6 +41,48 @@ def test_get_color_matrix_mask(transform_test_data):
         _, _ = get_color_matrix(rgb_img, mask)
 
 
+def test_color_chip_stats():
+    """Test for PlantCV."""
+    rgb_img = np.zeros((10, 10, 3), dtype=np.uint8)
+    rgb_img[:, :5] = (10, 20, 30)
+    rgb_img[0, 9, 2] = 255
+    mask = np.zeros((10, 10), dtype=np.uint8)
+    mask[:4, :5] = 20
+    mask[:4, 6:] = 10
+    stats = _ColorChipStats(rgb_img=rgb_img, mask=mask)
+    assert list(stats.chips) == [10, 20] and list(stats.count) == [16, 20]
+    # Channels are in red, green, blue order
+    assert np.allclose(stats.mean[1], np.array([30, 20, 10]) / 255) and np.allclose(stats.std[1], 0)
+    # Chip 10 has one red pixel at the maximum value
+    assert np.allclose(stats.std[0], [np.std([255] + [0] * 15) / 255, 0, 0])
+    # Only chip 10 has a pixel at the maximum value
+    assert list(stats.saturated) == [True, False]
+
+
+def test_color_chip_stats_float():
+    """Test for PlantCV."""
+    # Float images are saturated at 1.0
+    rgb_img = np.full((4, 4, 3), 0.5)
+    rgb_img[0, 0, 1] = 1.0
+    mask = np.zeros((4, 4), dtype=np.uint8)
+    mask[:2] = 1
+    mask[2:] = 2
+    stats = _ColorChipStats(rgb_img=rgb_img, mask=mask)
+    assert list(stats.saturated) == [True, False] and np.allclose(stats.std[1], 0)
+
+
+def test_get_color_matrix_saturated(capsys):
+    """Test for PlantCV."""
+    rgb_img = np.full((10, 10, 3), 100, dtype=np.uint8)
+    rgb_img[0, 0] = 255
+    mask = np.zeros((10, 10), dtype=np.uint8)
+    mask[:5] = 1
+    mask[5:] = 2
+    _, color_matrix = get_color_matrix(rgb_img=rgb_img, mask=mask)
+    # Saturated chips are reported, the matrix is unchanged
+    assert "color chips 1 have saturated pixels" in capsys.readouterr().err and color_matrix.shape == (2, 4)
+
+
 def test_get_matrix_m(transform_test_data):
     """Test for PlantCV."""
     # load in comparison matrices
@@ -130,6 +173,24 @@ def test_apply_transformation(transform_test_data):
     assert np.array_equal(corrected_img, corrected_compare)
 
 
+@pytest.mark.parametrize("dtype", [np.uint16, np.float32])
+def test_apply_transformation_dtypes(dtype, transform_test_data):
+    """Test for PlantCV."""
+    # load corrected image to compare
+    corrected_compare = cv2.imread(transform_test_data.source_corrected)
+    # read in matrices
+    matrix_t = transform_test_data.load_npz(transform_test_data.transformation_matrix_file)
+    # read in images
+    target_img = cv2.imread(transform_test_data.target_img)
+    source_img = cv2.imread(transform_test_data.source1_img)
+    # Scale the 8-bit source image to the range of the data type (0-1 for floating point images)
+    scale = 257 if dtype == np.uint16 else 1 / 255
+    corrected_img = apply_transformation_matrix((source_img * scale).astype(dtype), target_img, matrix_t)
+    # The corrected values match the 8-bit correction within the rounding of the 8-bit values
+    assert corrected_img.dtype == dtype
+    assert np.max(np.abs(corrected_img / (scale * 255) * 255 - corrected_compare)) <= 1
+
+
 def test_apply_transformation_incorrect_t(transform_test_data):
     """Test for PlantCV."""
     # read in matrices
@@ -248,6 +309,53 @@ def test_find_color_card(transform_test_data):
     assert start == (210, 212) and space == (8, 8)
 
 
+def test_find_color_card_cache(transform_test_data):
+    """Test for PlantCV."""
+    # Load rgb image
+    rgb_img = cv2.imread(transform_test_data.target_img)
+    clear_color_card_cache()
+    df, start, space = find_color_card(rgb_img=rgb_img, cache_key="camera1")
+    assert len(_color_card_cache) == 1
+    # The card is in the same place, the cached card is used
+    cached_df, cached_start, cached_space = find_color_card(rgb_img=rgb_img, cache_key="camera1")
+    assert cached_start == start and cached_space == space and np.array_equal(cached_df["x"], df["x"])
+    # The card moved, it is found again
+    moved_img = np.roll(rgb_img, 40, axis=0)
+    _, moved_start, _ = find_color_card(rgb_img=moved_img, cache_key="camera1")
+    _, detected_start, _ = find_color_card(rgb_img=moved_img)
+    assert moved_start == detected_start and moved_start != start
+    clear_color_card_cache()
+
+
+@pytest.mark.parametrize("shift", [3, 5])
+def test_find_color_card_cache_small_shift(shift, transform_test_data):
+    """Test for PlantCV."""
+    # Load rgb image
+    rgb_img = cv2.imread(transform_test_data.target_img)
+    clear_color_card_cache()
+    _, start, _ = find_color_card(rgb_img=rgb_img, cache_key="camera1")
+    # A card that moved by a few pixels still has nearly the same chip values, but it is found again
+    moved_img = np.roll(rgb_img, shift, axis=1)
+    _, moved_start, _ = find_color_card(rgb_img=moved_img, cache_key="camera1")
+    _, detected_start, _ = find_color_card(rgb_img=moved_img)
+    assert moved_start == detected_start and moved_start != start
+    clear_color_card_cache()
+
+
+def test_clear_color_card_cache(transform_test_data):
+    """Test for PlantCV."""
+    # Load rgb image
+    rgb_img = cv2.imread(transform_test_data.target_img)
+    clear_color_card_cache()
+    _ = find_color_card(rgb_img=rgb_img, cache_key="camera1")
+    _ = find_color_card(rgb_img=rgb_img, cache_key="camera2")
+    # Only the cards of the given camera view are forgotten
+    clear_color_card_cache(cache_key="camera1")
+    assert [key[0] for key in _color_card_cache] == ["camera2"]
+    clear_color_card_cache()
+    assert len(_color_card_cache) == 0
+
+
 def test_find_color_card_optional_parameters(transform_test_data):
     """Test for PlantCV."""
     # Clear previous outputs
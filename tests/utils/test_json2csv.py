@@ -1,5 +1,6 @@
 import pytest
 import os
+import json
 from plantcv.utils import json2csv
 
 
@@ -27,3 +28,32 @@ def test_json2csv_bad_json(utils_test_data, tmpdir):
     tmp_dir = tmpdir.mkdir("cache")
     with pytest.raises(ValueError):
         json2csv(json_file=utils_test_data.invalid_results_file, csv_file=os.path.join(str(tmp_dir), "exports"))
+
+
+def test_json2csv_entities_first(utils_test_data, tmpdir):
+    """Test for PlantCV."""
+    # Create tmp directory
+    tmp_dir = tmpdir.mkdir("cache")
+    # Write a results file with the entities stored before the variables
+    with open(utils_test_data.plantcv_results_file, "r") as fp:
+        data = json.load(fp)
+    json_file = os.path.join(str(tmp_dir), "entities_first.json")
+    with open(json_file, "w") as fp:
+        json.dump({"entities": data["entities"], "variables": data["variables"]}, fp)
+    json2csv(json_file=utils_test_data.plantcv_results_file, csv_file=os.path.join(str(tmp_dir), "expected"))
+    json2csv(json_file=json_file, csv_file=os.path.join(str(tmp_dir), "exports"))
+    for table in ["-single-value-traits.csv", "-multi-value-traits.csv"]:
+        with open(os.path.join(str(tmp_dir), "expected" + table), "r") as expected, \
+                open(os.path.join(str(tmp_dir), "exports" + table), "r") as exports:
+            assert exports.read() == expected.read()
+
+
+def test_json2csv_truncated_json(tmpdir):
+    """Test for PlantCV."""
+    # Create tmp directory
+    tmp_dir = tmpdir.mkdir("cache")
+    json_file = os.path.join(str(tmp_dir), "truncated.json")
+    with open(json_file, "w") as fp:
+        fp.write('{"variables": {}, "entities": [{"metadata": {}')
+    with pytest.raises(ValueError):
+        json2csv(json_file=json_file, csv_file=os.path.join(str(tmp_dir), "exports"))
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+
+import argparse
+import time
+import numpy as np
+from plantcv import plantcv as pcv
+
+
+# Parse command-line arguments
+def options():
+    parser = argparse.ArgumentParser(description="Benchmark the wall time of the PlantCV analysis functions that make "
+                                                 "histogram figures, with debug off. To compare two versions of "
+                                                 "PlantCV, run the script with each version on the PYTHONPATH.")
+    parser.add_argument("-s", "--size", help="Height and width of the test images (pixels).", default=500, type=int)
+    parser.add_argument("-b", "--bands", help="Number of bands of the test hyperspectral datacube.", default=100,
+                        type=int)
+    parser.add_argument("-n", "--repeats", help="Number of times each function is timed.", default=10, type=int)
+    args = parser.parse_args()
+    return args
+
+
+def spectral_data(array_data, wavelengths, array_type):
+    """Make a Spectral_data instance of test data."""
+    return pcv.Spectral_data(array_data=array_data, max_wavelength=max(wavelengths), min_wavelength=min(wavelengths),
+                             max_value=float(np.max(array_data)), min_value=float(np.min(array_data)),
+                             d_type=array_data.dtype, wavelength_dict={w: i for i, w in enumerate(wavelengths)},
+                             samples=array_data.shape[1], lines=array_data.shape[0], interleave="bil",
+                             wavelength_units="nm", array_type=array_type, pseudo_rgb=None, filename="benchmark",
+                             default_bands=None)
+
+
+def benchmarks(size, bands):
+    """Make the test data (random values with a fixed seed) and the function calls to time."""
+    rng = np.random.default_rng(0)
+    rgb_img = rng.integers(0, 256, (size, size, 3), dtype=np.uint8)
+    gray_img = rng.integers(0, 256, (size, size), dtype=np.uint8)
+    mask = np.zeros((size, size), dtype=np.uint8)
+    mask[size // 5:4 * size // 5, size // 5:4 * size // 5] = 255
+    fdark = rng.integers(0, 100, (size, size), dtype=np.uint16)
+    fmin = rng.integers(1000, 2000, (size, size), dtype=np.uint16)
+    fmax = rng.integers(3000, 4000, (size, size), dtype=np.uint16)
+    cube = spectral_data(array_data=rng.random((size, size, bands)).astype(np.float32),
+                         wavelengths=[400.0 + i * 5 for i in range(bands)], array_type="datacube")
+    index = spectral_data(array_data=rng.random((size, size)), wavelengths=[0.0], array_type="index_ndvi")
+    return {
+        "analyze_color": lambda: pcv.analyze_color(rgb_img=rgb_img, mask=mask),
+        "hyperspectral.analyze_spectral": lambda: pcv.hyperspectral.analyze_spectral(array=cube, mask=mask),
+        "photosynthesis.analyze_fvfm": lambda: pcv.photosynthesis.analyze_fvfm(fdark=fdark, fmin=fmin, fmax=fmax,
+                                                                               mask=mask),
+        "hyperspectral.analyze_index": lambda: pcv.hyperspectral.analyze_index(index_array=index, mask=mask),
+        "visualize.histogram": lambda: pcv.visualize.histogram(img=gray_img, mask=mask),
+    }
+
+
+def main():
+    args = options()
+    pcv.params.debug = None
+    for name, function in benchmarks(size=args.size, bands=args.bands).items():
+        # The first call imports the function and its dependencies
+        function()
+        times = []
+        for _ in range(args.repeats):
+            pcv.outputs.clear()
+            start = time.perf_counter()
+            function()
+            times.append(time.perf_counter() - start)
+        print(f"{name}: min {min(times) * 1000:.1f} ms, mean {sum(times) / len(times) * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
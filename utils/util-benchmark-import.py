@@ -0,0 +1,41 @@
+#!/usr/bin/env python
+
+import argparse
+import subprocess
+import sys
+
+
+# Parse command-line arguments
+def options():
+    parser = argparse.ArgumentParser(description="Benchmark the time it takes to import PlantCV.")
+    parser.add_argument("-n", "--repeats", help="Number of times each import is timed.", default=5, type=int)
+    args = parser.parse_args()
+    return args
+
+
+# Each benchmark runs in a fresh interpreter so that nothing is already imported
+BENCHMARKS = {
+    "import plantcv.plantcv": "from plantcv import plantcv as pcv",
+    "readimage, rgb2gray_hsv, threshold.binary": ("from plantcv import plantcv as pcv\n"
+                                                  "_ = pcv.readimage, pcv.rgb2gray_hsv, pcv.threshold.binary"),
+    "all public functions": ("from plantcv import plantcv as pcv\n"
+                             "_ = [getattr(pcv, name) for name in pcv.__all__]"),
+}
+
+
+def time_import(code):
+    """Time an import statement in a new Python process, excluding interpreter startup."""
+    timer = f"import time\nstart = time.perf_counter()\n{code}\nprint(time.perf_counter() - start)"
+    output = subprocess.run([sys.executable, "-c", timer], capture_output=True, text=True, check=True)
+    return float(output.stdout.strip().split("\n")[-1])
+
+
+def main():
+    args = options()
+    for name, code in BENCHMARKS.items():
+        times = [time_import(code) for _ in range(args.repeats)]
+        print(f"{name}: min {min(times):.3f} s, mean {sum(times) / len(times):.3f} s")
+
+
+if __name__ == '__main__':
+    main()